@@ -1,6 +1,7 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
-from database import init_database, test_connection, close_connection
+from database import init_database, init_request_scope, test_connection, close_connection
+from json_provider import FastJSONProvider
 import os
 from dotenv import load_dotenv
 import atexit
@@ -9,6 +10,9 @@ load_dotenv()
 
 app = Flask(__name__)
 
+# JSON yanıtları: orjson (kuruluysa), tarih/Decimal doğrudan serileştirilir
+app.json = FastJSONProvider(app)
+
 # Trailing slash gerektirmeme
 app.url_map.strict_slashes = False
 
@@ -17,8 +21,8 @@ CORS(app, resources={
     r"/api/*": {
         "origins": "*",
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization", "Access-Control-Allow-Origin"],
-        "expose_headers": ["Access-Control-Allow-Origin"],
+        "allow_headers": ["Content-Type", "Authorization", "Access-Control-Allow-Origin", "If-None-Match"],
+        "expose_headers": ["Access-Control-Allow-Origin", "X-Next-Cursor", "X-Total-Count", "ETag"],
         "supports_credentials": False
     }
 })
@@ -36,6 +40,9 @@ except Exception as e:
     print(f"UYARI: Veritabanı bağlantısı başlatılamadı: {str(e)}")
     print("Uygulama çalışmaya devam edecek ancak veritabanı işlemleri başarısız olabilir.")
 
+# Her istek tek bağlantı ve tek transaction kullansın (istek sonunda commit)
+init_request_scope(app)
+
 # Uygulama kapanırken bağlantıyı kapat
 atexit.register(close_connection)
 
@@ -76,6 +83,17 @@ app.register_blueprint(test_oda_bp)
 app.register_blueprint(test_musteri_bp)
 app.register_blueprint(test_rezervasyon_bp)
 
+# Müsaitlik indeksini açılışta kur (başarısız olursa ilk sorguda tekrar denenir)
+from services.musaitlik_service import musaitlik_indeksi
+try:
+    musaitlik_indeksi.rebuild()
+except Exception as e:
+    print(f"UYARI: Müsaitlik indeksi kurulamadı: {str(e)}")
+
+# Müşteri arama indeksi büyük tablolarda uzun sürebilir; hazır olana kadar arama SQL'e düşer
+from services.musteri_arama_service import musteri_arama_indeksi
+musteri_arama_indeksi.arka_planda_kur()
+
 @app.route('/')
 def index():
     return {'message': 'Otel Otomasyonu API', 'status': 'running'}
@@ -1,5 +1,8 @@
 import jwt
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
 from flask import request, jsonify, current_app
@@ -10,6 +13,71 @@ JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-in-producti
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRE_MINUTES', '30')) // 60 or 24
 
+# Doğrulanmış token önbelleği boyutu (0: önbellek kapalı)
+JWT_CACHE_SIZE = int(os.getenv('JWT_CACHE_SIZE', '1024'))
+
+
+class VerifiedTokenCache:
+    """
+    Doğrulanmış token -> (payload, exp) LRU önbelleği.
+
+    Aynı token ile gelen tekrar istekler HMAC doğrulaması yerine sözlük
+    aramasıyla çözülür. Kayıtlar token'ın exp zamanından sonra kullanılmaz.
+    """
+
+    def __init__(self, maxsize: int = JWT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token):
+        """Süresi dolmamış payload'ın kopyasını döndürür; yoksa None"""
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            entry = self._data.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, exp = entry
+            if exp <= time.time():
+                del self._data[token]
+                self.misses += 1
+                return None
+            self._data.move_to_end(token)
+            self.hits += 1
+        # Route'lar current_user'ı değiştirse bile önbellekteki kayıt bozulmasın
+        return dict(payload)
+
+    def put(self, token, payload):
+        """exp claim'i olan payload'ı önbelleğe ekler"""
+        exp = payload.get('exp')
+        if self.maxsize <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._data[token] = (dict(payload), exp)
+            self._data.move_to_end(token)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Önbelleği ve sayaçları sıfırlar"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Hit/miss sayaçları"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._data), 'maxsize': self.maxsize}
+
+
+token_cache = VerifiedTokenCache()
+
 
 def generate_token(personel_id, kullanici_adi, gorev):
     """
@@ -42,15 +110,22 @@ def generate_token(personel_id, kullanici_adi, gorev):
 def verify_token(token):
     """
     JWT token'ı doğrular ve payload'ı döndürür.
-    
+
+    Daha önce doğrulanmış ve süresi dolmamış token'lar önbellekten döner.
+
     Args:
         token: JWT token string
         
     Returns:
         dict: Token payload veya None (geçersizse)
     """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        token_cache.put(token, payload)
         return payload
     except jwt.ExpiredSignatureError:
         return None
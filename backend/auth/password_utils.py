@@ -1,5 +1,22 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+# Bcrypt maliyet faktörü (yeni hash'ler bu değerle üretilir)
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+# Aynı anda çalışan bcrypt işlemi sayısı (0: havuz kapalı, çağıran thread'de çalışır)
+BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', str(os.cpu_count() or 2)))
+# Çalışan + kuyrukta bekleyen en fazla işlem; aşılırsa PasswordHasherBusy
+BCRYPT_MAX_PENDING = int(os.getenv('BCRYPT_MAX_PENDING', str(max(BCRYPT_WORKERS, 1) * 4)))
+# Girişte maliyet faktörü farklı olan hash'leri yeniden hashle (opsiyonel)
+BCRYPT_REHASH_ON_LOGIN = os.getenv('BCRYPT_REHASH_ON_LOGIN', '').lower() in ('1', 'true', 'yes')
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Bcrypt kuyruğu dolu; istek 503 ile hemen reddedilmeli"""
+
 
 def hash_password(password):
     """
@@ -15,7 +32,7 @@ def hash_password(password):
     password_bytes = password.encode('utf-8')
     
     # Bcrypt ile hashle (salt otomatik eklenir)
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
     
     # String'e çevir ve döndür
     return hashed.decode('utf-8')
@@ -44,16 +61,100 @@ def verify_password(password, hashed_password):
         return False
 
 
+def needs_rehash(hashed_password):
+    """
+    Hash'in maliyet faktörü BCRYPT_ROUNDS'tan farklı mı?
 
+    Args:
+        hashed_password: Hashlenmiş şifre ($2b$12$... biçiminde)
 
+    Returns:
+        bool: Yeniden hashlenmesi gerekiyorsa True; hash çözülemezse False
+    """
+    try:
+        return int(hashed_password.split('$')[2]) != BCRYPT_ROUNDS
+    except (AttributeError, IndexError, ValueError):
+        return False
 
 
+class PasswordHasherPool:
+    """
+    Bcrypt işlemleri için sınırlı worker havuzu.
 
+    bcrypt hash/doğrulama sırasında GIL'i bıraktığı için thread havuzu
+    yeterlidir. Aynı anda en fazla `workers` işlem CPU kullanır; toplam
+    `max_pending` işlemi aşan istekler kuyrukta beklemek yerine
+    PasswordHasherBusy ile hemen reddedilir (vardiya değişimindeki giriş
+    yığılmalarında worker'lar dakikalarca bloklanmaz).
+    """
 
-
-
-
-
-
-
-
+    def __init__(self, workers=BCRYPT_WORKERS, max_pending=BCRYPT_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max(max_pending, workers, 1)
+        self._executor = None
+        # Sayaçlar ve executor oluşturma bu kilitle korunur
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                        thread_name_prefix='bcrypt')
+        return self._executor
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    def run(self, func, *args):
+        """
+        func(*args)'ı havuzda çalıştırır ve sonucunu bekler.
+
+        Raises:
+            PasswordHasherBusy: Bekleyen işlem sayısı max_pending'e ulaştıysa
+        """
+        if self.workers <= 0:
+            return func(*args)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy('Şifre doğrulama kuyruğu dolu, lütfen tekrar deneyin')
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future.result()
+
+    def stats(self):
+        """Havuz durumu"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
+
+
+# Global havuz
+password_pool = PasswordHasherPool()
+
+
+def hash_password_pooled(password):
+    """hash_password'ın havuzda çalışan sürümü (PasswordHasherBusy fırlatabilir)"""
+    return password_pool.run(hash_password, password)
+
+
+def verify_password_pooled(password, hashed_password):
+    """verify_password'ın havuzda çalışan sürümü (PasswordHasherBusy fırlatabilir)"""
+    return password_pool.run(verify_password, password, hashed_password)
@@ -2,7 +2,7 @@
 
 from functools import wraps
 from flask import jsonify
-from .permissions import has_permission
+from .permissions import ROLE_MASKS, permission_bit
 
 def permission_required(permission):
     """
@@ -14,6 +14,10 @@ def permission_required(permission):
     Returns:
         function: Decorated function
     """
+    # Resolve the permission bit once, when the route is decorated
+    bit = permission_bit(permission)
+    denied_message = f'Bu işlem için {permission} yetkisi gerekli'
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -33,10 +37,10 @@ def permission_required(permission):
                     'message': 'Kullanıcı rolü tanımlanmamış'
                 }), 403
 
-            if not has_permission(user_role, permission):
+            if not ROLE_MASKS.get(user_role, 0) & bit:
                 return jsonify({
                     'error': 'Yetkisiz erişim',
-                    'message': f'Bu işlem için {permission} yetkisi gerekli'
+                    'message': denied_message
                 }), 403
 
             return f(*args, **kwargs)
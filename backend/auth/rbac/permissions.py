@@ -68,6 +68,29 @@ PERMISSIONS = {
     'dashboard_read': [ADMIN, RECEPTION, OPERATIONS],
 }
 
+# Compiled at import time: one bit per permission, one mask per role.
+# A permission check is then a single AND instead of list scans.
+PERMISSION_BITS = {permission: 1 << index for index, permission in enumerate(PERMISSIONS)}
+
+ROLE_MASKS = {}
+for _permission, _roles in PERMISSIONS.items():
+    for _role in _roles:
+        ROLE_MASKS[_role] = ROLE_MASKS.get(_role, 0) | PERMISSION_BITS[_permission]
+del _permission, _roles, _role
+
+
+def permission_bit(permission):
+    """
+    Get the bit for a permission.
+
+    Args:
+        permission (str): Permission name
+
+    Returns:
+        int: Permission bit, 0 for unknown permissions (never granted)
+    """
+    return PERMISSION_BITS.get(permission, 0)
+
 def has_permission(user_role, permission):
     """
     Check if user role has specific permission.
@@ -79,8 +102,7 @@ def has_permission(user_role, permission):
     Returns:
         bool: True if user has permission
     """
-    allowed_roles = PERMISSIONS.get(permission, [])
-    return user_role in allowed_roles
+    return bool(ROLE_MASKS.get(user_role, 0) & PERMISSION_BITS.get(permission, 0))
 
 def get_user_permissions(user_role):
     """
@@ -92,7 +114,8 @@ def get_user_permissions(user_role):
     Returns:
         list: List of permissions user has
     """
-    return [perm for perm, roles in PERMISSIONS.items() if user_role in roles]
+    mask = ROLE_MASKS.get(user_role, 0)
+    return [perm for perm, bit in PERMISSION_BITS.items() if mask & bit]
 
 def check_resource_access(user_role, resource, action):
     """
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON serileştirme benchmark'ı
+
+10.000 rezervasyonluk liste yanıtının üretim maliyetini ölçer:
+  - Eski yol: from_dict(row).to_dict() (tarihler Python'da isoformat) +
+    Flask'ın varsayılan JSON provider'ı
+  - Yeni yol: Rezervasyon.row_to_dict (ham tarih/Decimal) + FastJSONProvider
+    (orjson kuruluysa orjson, değilse standart json)
+
+İki yolun ürettiği JSON'un aynı veriyi taşıdığını da doğrular. Veritabanı
+gerektirmez.
+
+Kullanım:
+    python benchmark_json.py [rezervasyon_sayisi]
+"""
+
+import sys
+import os
+import json
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import json_provider
+from json_provider import FastJSONProvider
+from models import Rezervasyon
+
+ADET = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+TEKRAR = 5
+
+
+def rezervasyon_satirlari(n):
+    """Veritabanı satırı biçiminde rezervasyonlar"""
+    return [{
+        'rezervasyon_id': i,
+        'musteri_id': i % 500,
+        'oda_id': i % 80,
+        'giris_tarihi': date(2024, 1, 1) + timedelta(days=i % 365),
+        'cikis_tarihi': date(2024, 1, 3) + timedelta(days=i % 365),
+        'yetiskin_sayisi': 2,
+        'cocuk_sayisi': i % 3,
+        'toplam_ucret': Decimal('1250.50') + i,
+        'rezervasyon_durumu': ('Aktif', 'Bekliyor', 'tamamlandi')[i % 3],
+        'olusturulma_tarihi': datetime(2024, 1, 1, 9, 15) + timedelta(minutes=i),
+    } for i in range(n)]
+
+
+def olc(fonksiyon):
+    """En iyi süre (saniye)"""
+    en_iyi = float('inf')
+    for _ in range(TEKRAR):
+        baslangic = time.perf_counter()
+        fonksiyon()
+        en_iyi = min(en_iyi, time.perf_counter() - baslangic)
+    return en_iyi
+
+
+def main():
+    app = Flask(__name__)
+    eski_provider = DefaultJSONProvider(app)
+    yeni_provider = FastJSONProvider(app)
+    rows = rezervasyon_satirlari(ADET)
+
+    def eski():
+        # jsonify'ın kullandığı kompakt ayırıcılarla
+        return eski_provider.dumps([Rezervasyon.from_dict(r).to_dict() for r in rows], separators=(',', ':'))
+
+    def yeni():
+        return yeni_provider.dumps([Rezervasyon.row_to_dict(r) for r in rows])
+
+    print("=== JSON Serileştirme Benchmark ===")
+    print(f"Rezervasyon: {ADET}, orjson: {'var' if json_provider.orjson else 'yok (standart json)'}")
+
+    if json.loads(eski()) != json.loads(yeni()):
+        print("❌ Eski ve yeni yolun JSON çıktısı farklı")
+        return 1
+    print("✅ Eski ve yeni yolun JSON çıktısı aynı")
+
+    eski_sure = olc(eski)
+    yeni_sure = olc(yeni)
+
+    # orjson kurulu değilken de fallback yolunu ölç
+    orjson = json_provider.orjson
+    json_provider.orjson = None
+    try:
+        fallback_sure = olc(yeni)
+    finally:
+        json_provider.orjson = orjson
+
+    print(f"Eski (to_dict + varsayılan provider): {eski_sure * 1e3:8.1f} ms")
+    print(f"Yeni (row_to_dict + standart json):   {fallback_sure * 1e3:8.1f} ms "
+          f"({eski_sure / fallback_sure:.2f}x)")
+    if orjson:
+        print(f"Yeni (row_to_dict + orjson):          {yeni_sure * 1e3:8.1f} ms "
+              f"({eski_sure / yeni_sure:.2f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Model serileştirme benchmark'ı
+
+Liste endpoint'lerinin satır başına maliyetini ölçer:
+  - from_dict(row).to_dict() (ara nesne) ile row_to_dict(row) (doğrudan)
+  - __slots__'lu model nesnesi ile __dict__'li eşdeğerinin bellek kullanımı
+
+Ayrıca row_to_dict çıktısının JSON'a çevrildiğinde from_dict(row).to_dict()
+ile aynı olduğunu doğrular. Veritabanı gerektirmez.
+
+Kullanım:
+    python benchmark_models.py [satir_sayisi]
+"""
+
+import gc
+import sys
+import os
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from json_provider import FastJSONProvider
+from models import Oda, Rezervasyon, Musteri, Odeme, DepoStok, EkstraHizmet, Personel
+
+SATIR = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+SIMDI = datetime(2024, 5, 1, 12, 30)
+
+
+def satirlar(n):
+    """Her model için veritabanı satırı biçiminde örnek veri üretir"""
+    return {
+        Oda: [{'oda_id': i, 'oda_numarasi': str(100 + i), 'oda_tipi': 'Deluxe', 'manzara': 'Deniz',
+               'ucret_gecelik': Decimal('1250.00'), 'durum': 'Boş', 'olusturulma_tarihi': SIMDI}
+              for i in range(n)],
+        Rezervasyon: [{'rezervasyon_id': i, 'musteri_id': i % 500, 'oda_id': i % 80,
+                       'giris_tarihi': date(2024, 5, 1) + timedelta(days=i % 30),
+                       'cikis_tarihi': date(2024, 5, 3) + timedelta(days=i % 30),
+                       'yetiskin_sayisi': 2, 'cocuk_sayisi': 0, 'toplam_ucret': Decimal('2500.00'),
+                       'rezervasyon_durumu': ('aktif', 'Bekliyor', 'tamamlandi')[i % 3],
+                       'olusturulma_tarihi': SIMDI}
+                      for i in range(n)],
+        Musteri: [{'musteri_id': i, 'ad': 'Ayşe', 'soyad': 'Yılmaz', 'tc_kimlik_no': '12345678901',
+                   'telefon': '05551234567', 'email': None, 'cinsiyet': 'Kadın', 'adres': 'İzmir',
+                   'ozel_notlar': None, 'kayit_tarihi': SIMDI}
+                  for i in range(n)],
+        Odeme: [{'odeme_id': i, 'rezervasyon_id': i, 'odenen_tutar': Decimal('500.00'),
+                 'odeme_turu': 'Nakit', 'odeme_tarihi': SIMDI}
+                for i in range(n)],
+        DepoStok: [{'urun_id': i, 'hizmet_id': 1, 'urun_adi': 'Havlu', 'stok_adedi': 40,
+                    'son_guncelleme': SIMDI}
+                   for i in range(n)],
+        EkstraHizmet: [{'hizmet_id': i, 'hizmet_adi': 'Spa', 'birim_fiyat': Decimal('300.00'),
+                        'kategori': 'Bakım'}
+                       for i in range(n)],
+        Personel: [{'personel_id': i, 'kullanici_adi': f'user{i}', 'ad_soyad': 'Ali Kaya',
+                    'gorev': 'Resepsiyon', 'aktiflik': 1, 'olusturulma_tarihi': SIMDI}
+                   for i in range(n)],
+    }
+
+
+def dogrula(veri):
+    """row_to_dict'in JSON çıktısı from_dict().to_dict() ile aynı mı?"""
+    provider = FastJSONProvider(Flask(__name__))
+    success = True
+    for model, rows in veri.items():
+        for row in rows[:50]:
+            if provider.dumps(model.row_to_dict(row)) != provider.dumps(model.from_dict(row).to_dict()):
+                print(f"❌ {model.__name__}: çıktı farklı ({row})")
+                success = False
+                break
+    if success:
+        print("✅ row_to_dict çıktıları from_dict().to_dict() ile aynı")
+    return success
+
+
+def sure(fonksiyon, rows, tekrar=5):
+    """Satır başına en iyi süre (GC kapalıyken, tekrar sayısı kadar deneme)"""
+    en_iyi = float('inf')
+    gc.disable()
+    try:
+        for _ in range(tekrar):
+            baslangic = time.perf_counter()
+            fonksiyon(rows)
+            en_iyi = min(en_iyi, time.perf_counter() - baslangic)
+    finally:
+        gc.enable()
+    return en_iyi / len(rows)
+
+
+def bellek(fabrika, rows):
+    """rows için oluşturulan nesnelerin toplam bellek kullanımı (bayt/nesne)"""
+    tracemalloc.start()
+    nesneler = [fabrika(row) for row in rows]
+    kullanilan, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del nesneler
+    return kullanilan / len(rows)
+
+
+def main():
+    print("=== Model Serileştirme Benchmark ===")
+    print(f"Satır: {SATIR}")
+    veri = satirlar(SATIR)
+    if not dogrula(veri):
+        return 1
+
+    print()
+    print(f"{'Model':<14} {'nesne (µs)':>11} {'doğrudan (µs)':>14} {'hızlanma':>9} "
+          f"{'__dict__ (B)':>13} {'__slots__ (B)':>14}")
+    for model, rows in veri.items():
+        # __slots__ öncesi hali: aynı __init__ ile __dict__ kullanan sınıf
+        eski_model = type(f'Eski{model.__name__}', (), {'__init__': model.__init__})
+
+        nesne = sure(lambda rs: [model.from_dict(r).to_dict() for r in rs], rows)
+        dogrudan = sure(lambda rs: [model.row_to_dict(r) for r in rs], rows)
+
+        ornek = model.from_dict(rows[0])
+        alanlar = {name: getattr(ornek, name) for name in model.__slots__}
+        dict_bellek = bellek(lambda r: eski_model(**alanlar), rows)
+        slot_bellek = bellek(lambda r: model(**alanlar), rows)
+
+        print(f"{model.__name__:<14} {nesne * 1e6:11.2f} {dogrudan * 1e6:14.2f} {nesne / dogrudan:8.2f}x "
+              f"{dict_bellek:13.0f} {slot_bellek:14.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
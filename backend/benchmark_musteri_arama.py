@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Müşteri arama benchmark'ı
+
+Sentetik müşteri profilleriyle (varsayılan 500.000) MusteriAramaIndeksi'ni
+kurar ve resepsiyonda tipik aramaların (ad ön eki, ad + soyad, Türkçe
+karakterli/karaktersiz yazım, telefonun son haneleri, email, TC ön eki,
+sonuçsuz çok terimli aramalar)
+gecikmesini ölçer. Her sorgunun sonucu tüm profillerin kaba kuvvetle
+taranmasıyla elde edilen sonuçla karşılaştırılır. Veritabanı gerektirmez.
+
+Hedef: sorgu başına 10 ms'nin altı.
+
+Kullanım:
+    python benchmark_musteri_arama.py [musteri_sayisi]
+"""
+
+import sys
+import os
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.musteri_arama_service import MusteriAramaIndeksi, belge, terimler, _eslesir
+
+ADET = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+LIMIT = 20
+HEDEF_MS = 10.0
+
+ADLAR = ['Ayşe', 'Fatma', 'Emine', 'Hatice', 'Zeynep', 'Elif', 'Şükran', 'Gül', 'Özlem', 'Çiğdem',
+         'Mehmet', 'Mustafa', 'Ahmet', 'Ali', 'Hüseyin', 'Hasan', 'İbrahim', 'İsmail', 'Ömer', 'Uğur',
+         'Işıl', 'Ilgın', 'Doğan', 'Şahin', 'Gökhan', 'Çağrı', 'Barış', 'Büşra', 'Tuğba', 'Yiğit']
+SOYADLAR = ['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Yıldırım', 'Öztürk', 'Aydın',
+            'Özdemir', 'Arslan', 'Doğan', 'Kılıç', 'Aslan', 'Çetin', 'Kara', 'Koç', 'Kurt', 'Özkan',
+            'Şimşek', 'Işık', 'Güneş', 'Erdoğan', 'Akgül', 'Bulut', 'Tekin', 'Ünal', 'Gündoğdu']
+
+SORGULAR = [
+    'ayse', 'AYŞE', 'mehmet yilmaz', 'Işık', 'ISIK', 'isik', 'şahin çelik', 'sahin celik',
+    'ib', 'i', 'öz', 'gündoğdu tuğba', 'ugur', 'çiğdem kılıç', 'yigit ozkan',
+    # Sonuçsuz çok terimli aramalar (aday listelerinin tamamı taranır)
+    'mehmet ayse', 'yilmaz kaya', 'fatma hasan ozturk',
+]
+
+
+def profiller(n):
+    """Sentetik müşteri satırları"""
+    rnd = random.Random(42)
+    rows = []
+    for i in range(1, n + 1):
+        ad, soyad = rnd.choice(ADLAR), rnd.choice(SOYADLAR)
+        rows.append({
+            'musteri_id': i,
+            'ad': ad,
+            'soyad': soyad,
+            'telefon': f"05{rnd.randint(30, 59)} {rnd.randint(100, 999)} {rnd.randint(10, 99)} {rnd.randint(10, 99)}",
+            'email': f"{ad.lower()}.{soyad.lower()}{i}@ornek.com" if i % 3 else None,
+            'tc_kimlik_no': str(10000000000 + rnd.randint(0, 89999999999)),
+        })
+    return rows
+
+
+def kaba_kuvvet(belgeler, sorgu, limit):
+    """Tüm belgeleri sondan başa tarayarak beklenen sonucu üretir"""
+    aranan = terimler(sorgu)
+    sonuc = []
+    for musteri_id in sorted(belgeler, reverse=True):
+        if all(_eslesir(belgeler[musteri_id], terim) for terim in aranan):
+            sonuc.append(musteri_id)
+            if len(sonuc) >= limit:
+                break
+    return sonuc
+
+
+def main():
+    print("=== Müşteri Arama Benchmark ===")
+    rows = profiller(ADET)
+    ornekler = [rows[len(rows) // 3], rows[len(rows) // 2], rows[-7]]
+    sorgular = list(SORGULAR)
+    for row in ornekler:
+        telefon = row['telefon'].replace(' ', '')
+        sorgular += [telefon[-4:], row['telefon'][-5:], row['tc_kimlik_no'][:6],
+                     f"{row['ad']} {telefon[-3:]}"]
+        if row['email']:
+            sorgular.append(row['email'].split('@')[0][-8:])
+
+    indeks = MusteriAramaIndeksi(max_age=0)
+    baslangic = time.perf_counter()
+    indeks.yukle(rows)
+    kurulum = time.perf_counter() - baslangic
+    print(f"Müşteri: {ADET}, kurulum: {kurulum:.1f} sn, gram: {indeks.stats()['gram_sayisi']}")
+
+    belgeler = {row['musteri_id']: belge(row) for row in rows}
+    success = True
+    sureler = []
+    for sorgu in sorgular:
+        en_iyi = float('inf')
+        for _ in range(3):
+            baslangic = time.perf_counter()
+            sonuc = indeks.ara(sorgu, LIMIT)
+            en_iyi = min(en_iyi, time.perf_counter() - baslangic)
+        sureler.append(en_iyi * 1e3)
+
+        beklenen = kaba_kuvvet(belgeler, sorgu, LIMIT)
+        if sonuc != beklenen:
+            success = False
+            print(f"❌ '{sorgu}': indeks {sonuc[:5]}... != beklenen {beklenen[:5]}...")
+        else:
+            print(f"  {sorgu!r:<28} {len(sonuc):3} sonuç  {en_iyi * 1e3:7.3f} ms")
+
+    sureler.sort()
+    medyan = sureler[len(sureler) // 2]
+    print()
+    print(f"Medyan: {medyan:.3f} ms, en kötü: {sureler[-1]:.3f} ms (hedef < {HEDEF_MS:.0f} ms)")
+    if success:
+        print("✅ Tüm sonuçlar kaba kuvvet taramasıyla aynı")
+    if sureler[-1] >= HEDEF_MS:
+        print("❌ Hedef süre aşıldı")
+        success = False
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
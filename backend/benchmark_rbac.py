@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RBAC decorator benchmark'ı
+
+read_required decorator'ının istek başına maliyetini, önceki liste tabanlı
+kontrol (her çağrıda f-string ile izin adı + rol listesinde arama) ile
+karşılaştırır ve bitmask sonuçlarının eski kontrolle birebir aynı olduğunu
+doğrular. Veritabanı gerektirmez.
+
+Kullanım:
+    python benchmark_rbac.py [tekrar_sayisi]
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from auth.rbac.permissions import PERMISSIONS, has_permission
+from auth.rbac.decorators import read_required
+
+TEKRAR = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+ROLLER = ['ADMIN', 'RECEPTION', 'OPERATIONS', 'BILINMEYEN']
+
+
+def eski_read_required(resource):
+    """Önceki davranış: izin adı ve liste araması her çağrıda"""
+    def decorator(f):
+        def decorated_function(*args, **kwargs):
+            current_user = kwargs.get('current_user')
+            permission = f"{resource}_read"
+            if current_user.get('role') not in PERMISSIONS.get(permission, []):
+                return None
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def route(current_user):
+    return True
+
+
+def olc(fonksiyon, current_user, tekrar):
+    baslangic = time.perf_counter()
+    for _ in range(tekrar):
+        fonksiyon(current_user=current_user)
+    return (time.perf_counter() - baslangic) / tekrar
+
+
+def dogrula():
+    """Bitmask kontrolü tüm rol/izin çiftlerinde liste kontrolüyle aynı mı?"""
+    for role in ROLLER:
+        for permission in list(PERMISSIONS) + ['olmayan_izin']:
+            if has_permission(role, permission) != (role in PERMISSIONS.get(permission, [])):
+                print(f"❌ Uyuşmazlık: {role} / {permission}")
+                return False
+    print("✅ Bitmask sonuçları liste tabanlı kontrolle aynı")
+    return True
+
+
+def main():
+    print("=== RBAC Decorator Benchmark ===")
+    if not dogrula():
+        return 1
+
+    print(f"Tekrar: {TEKRAR}")
+    # Ön büroya açık tipik bir okuma endpoint'i
+    current_user = {'personel_id': 1, 'role': 'RECEPTION'}
+    yeni = read_required('dashboard')(route)
+    eski = eski_read_required('dashboard')(route)
+
+    yeni(current_user=current_user)
+    eski(current_user=current_user)
+    eski_sure = olc(eski, current_user, TEKRAR)
+    yeni_sure = olc(yeni, current_user, TEKRAR)
+
+    print(f"Liste tabanlı (eski): {eski_sure * 1e9:8.0f} ns/istek")
+    print(f"Bitmask (yeni):       {yeni_sure * 1e9:8.0f} ns/istek")
+    print(f"Hızlanma:             {eski_sure / yeni_sure:8.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
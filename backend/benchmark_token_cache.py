@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+token_required benchmark'ı
+
+Aynı Bearer token ile korumalı bir route'un decorator maliyetini önbellekli
+ve önbelleksiz (JWT_CACHE_SIZE=0 ile aynı) olarak ölçer. Veritabanı
+gerektirmez.
+
+Kullanım:
+    python benchmark_token_cache.py [tekrar_sayisi]
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from auth.jwt_utils import generate_token, token_required, token_cache
+
+TEKRAR = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+
+@token_required
+def korumali(current_user):
+    return current_user['personel_id']
+
+
+def olc(app, headers, tekrar):
+    """Decorator'lı fonksiyonu tek request context içinde tekrar tekrar çağırır"""
+    with app.test_request_context('/', headers=headers):
+        korumali()  # ısınma
+        baslangic = time.perf_counter()
+        for _ in range(tekrar):
+            korumali()
+        return (time.perf_counter() - baslangic) / tekrar
+
+
+def main():
+    app = Flask(__name__)
+    headers = {'Authorization': 'Bearer ' + generate_token(1, 'benchmark', 'Genel Müdür')}
+
+    print("=== token_required Benchmark ===")
+    print(f"Tekrar: {TEKRAR}")
+
+    eski_boyut = token_cache.maxsize
+    try:
+        token_cache.maxsize = 0
+        token_cache.clear()
+        onbelleksiz = olc(app, headers, TEKRAR)
+
+        token_cache.maxsize = eski_boyut or 1024
+        token_cache.clear()
+        onbellekli = olc(app, headers, TEKRAR)
+    finally:
+        token_cache.maxsize = eski_boyut
+
+    print(f"Önbelleksiz (jwt.decode): {onbelleksiz * 1e6:8.2f} µs/istek")
+    print(f"Önbellekli (LRU):         {onbellekli * 1e6:8.2f} µs/istek")
+    print(f"Hızlanma:                 {onbelleksiz / onbellekli:8.1f}x")
+    print(f"Önbellek: {token_cache.stats()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Süreç içi TTL önbellek ve HTTP koşullu GET (ETag) desteği
+
+Sık okunan ve birkaç saniyelik bayatlığa izin veren sonuçlar (dashboard
+istatistikleri vb.) için kullanılır. Her kayıt bağlı olduğu tablolarla
+etiketlenir; bu tablolara yazan kod invalidate_tables() çağırdığında ilgili
+kayıtlar transaction commit edildikten sonra silinir.
+
+invalidate_tables() aynı zamanda tablo sürümlerini artırır; conditional_get
+ile işaretlenen endpoint'ler ETag'i bu sürümlerden üretir ve If-None-Match
+eşleşirse veritabanına gitmeden 304 döner. Tablo verisini bellekte tutan
+servisler on_tables_changed() ile aynı bildirime abone olabilir.
+"""
+
+import os
+import threading
+import time
+import uuid
+import zlib
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import make_response, request
+
+from database import on_commit
+
+# Dashboard istatistiklerinin önbellekte kalma süresi (saniye)
+DASHBOARD_CACHE_TTL = float(os.getenv('DASHBOARD_CACHE_TTL', '5'))
+
+# ETag'lerin en uzun geçerlilik süresi (saniye). Sürümler süreç içinde
+# tutulduğu için uygulama dışından (script, başka süreç) yapılan değişiklikler
+# en geç bu süre sonunda yeni ETag üretir.
+ETAG_MAX_AGE = int(os.getenv('ETAG_MAX_AGE', '300'))
+
+
+class TTLCache:
+    """Thread-safe, tablo etiketli TTL önbellek"""
+
+    def __init__(self, default_ttl: float = 5.0):
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._data: Dict[str, Tuple[float, Any, frozenset]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Süresi dolmamış değeri döndürür; yoksa default"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None,
+            tables: Iterable[str] = ()):
+        """Değeri önbelleğe yazar"""
+        expires = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value, frozenset(tables))
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None,
+                    tables: Iterable[str] = ()) -> Any:
+        """
+        Önbellekteki değeri döndürür, yoksa loader() ile yükleyip saklar.
+
+        Args:
+            key: Önbellek anahtarı
+            loader: Değeri üreten argümansız fonksiyon
+            ttl: Saniye cinsinden süre (varsayılan: default_ttl)
+            tables: Değerin bağlı olduğu tablolar (invalidate_tables için)
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = loader()
+            self.set(key, value, ttl=ttl, tables=tables)
+        return value
+
+    def invalidate(self, key: Optional[str] = None):
+        """Tek anahtarı ya da (key verilmezse) tüm önbelleği siler"""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+            self.invalidations += 1
+
+    def invalidate_tables(self, tables: Iterable[str]):
+        """Verilen tablolardan herhangi birine bağlı kayıtları siler"""
+        tables = set(tables)
+        with self._lock:
+            for key in [k for k, entry in self._data.items() if entry[2] & tables]:
+                del self._data[key]
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss sayaçları"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'invalidations': self.invalidations,
+                'size': len(self._data),
+                'default_ttl': self.default_ttl,
+            }
+
+
+class TableVersions:
+    """
+    Tablo başına değişiklik sayacı.
+
+    Sayaçlar süreç başladığında sıfırdan başlar; ETag'e süreç kimliği de
+    eklendiği için yeniden başlatma sonrası eski ETag'ler eşleşmez.
+    """
+
+    def __init__(self, max_age: int = ETAG_MAX_AGE):
+        self.max_age = max_age
+        self.boot_id = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+
+    def bump(self, tables: Iterable[str]):
+        """Tabloların sürümünü artırır"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def etag(self, tables: Iterable[str], scope: str = '') -> str:
+        """Tabloların mevcut sürümlerinden (ve scope'tan, ör. URL) ETag değeri üretir"""
+        versions = '.'.join(str(self._versions.get(table, 0)) for table in tables)
+        epoch = int(time.time() // self.max_age) if self.max_age > 0 else 0
+        return f"{self.boot_id}-{epoch}-{versions}-{zlib.crc32(scope.encode('utf-8')):08x}"
+
+
+# Uygulama genelinde önbellek
+app_cache = TTLCache(default_ttl=DASHBOARD_CACHE_TTL)
+table_versions = TableVersions()
+
+# Tablo adı -> commit sonrası çağrılacak dinleyiciler
+_table_listeners: Dict[str, List[Callable[[], None]]] = {}
+
+
+def on_tables_changed(table: str, callback: Callable[[], None]):
+    """
+    Tabloya yazan bir transaction commit edildiğinde (invalidate_tables
+    bildirimiyle) callback'i çağırır. Bellek içi kopya tutan servisler
+    kendilerini geçersiz kılmak için kullanır.
+    """
+    _table_listeners.setdefault(table, []).append(callback)
+
+
+def _tables_changed(tables: Tuple[str, ...]):
+    app_cache.invalidate_tables(tables)
+    table_versions.bump(tables)
+    for table in tables:
+        for callback in _table_listeners.get(table, ()):
+            callback()
+
+
+def invalidate_tables(*tables: str):
+    """
+    Tablolara yazıldığını bildirir; ilgili önbellek kayıtları mevcut
+    transaction commit edilince silinir ve tablo sürümleri artırılır
+    (rollback olursa dokunulmaz).
+    """
+    on_commit(lambda: _tables_changed(tables))
+
+
+def conditional_get(*tables: str):
+    """
+    GET endpoint'ine ETag / If-None-Match desteği ekler.
+
+    ETag, verilen tabloların sürümlerinden ve istek URL'inden (yol + query
+    string) üretilir. İstemcinin gönderdiği ETag güncelse endpoint hiç
+    çalışmaz; gövdesiz 304 döner. Yanıtlar
+    "Cache-Control: private, no-cache" ile işaretlenir; tarayıcı saklar ama
+    her kullanımda yeniden doğrular.
+
+    token_required'dan sonra (altına) yazılmalıdır; yetkisiz istekler 304
+    alamaz.
+
+    Args:
+        tables: Yanıtın okuduğu tablolar (yazan route'lar invalidate_tables
+            ile bu tabloları bildirmelidir)
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Sürüm, endpoint veriyi okumadan önce alınır; okuma sırasında
+            # gelen bir yazma sonraki istekte farklı ETag üretir
+            etag = table_versions.etag(tables, request.full_path)
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
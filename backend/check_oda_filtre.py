@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Oda filtre motoru kontrolü
+
+Bellek içi OdaFiltreMotoru'nun sonuçlarını OdaService.get_filtered_odalar'ın
+SQL yoluyla karşılaştırır: mevcut odalardan türetilen durum, tip, manzara,
+fiyat aralığı ve arama kombinasyonlarının (büyük/küçük harf, aksansız ve
+noktasız ı'lı yazılışlar, '%'/'_' içeren aramalar dahil) her biri için iki yolun döndürdüğü listeler ve faset
+sayıları aynı olmalıdır. İki yolun sorgu başına süresi de yazdırılır.
+
+NOT: Çalışan bir MySQL veritabanı gerektirir.
+
+Kullanım:
+    python check_oda_filtre.py
+"""
+
+import sys
+import os
+import time
+from collections import Counter
+from itertools import product
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import init_database, execute_query, close_connection
+from models.sqlalchemy_base import db_session
+from services.oda_service import OdaService
+from services.oda_filtre_motoru import OdaFiltreMotoru, katla
+
+
+def yazilislar(deger):
+    """Değerin SQL collation'ında eşit sayılan farklı yazılışları"""
+    deger = str(deger)
+    return list(dict.fromkeys([deger, deger.lower(), deger.upper(), katla(deger)]))
+
+
+def kombinasyonlar(rows):
+    """Mevcut verilerden türetilen filtre kombinasyonları"""
+    tipler = sorted({r['oda_tipi'] for r in rows if r['oda_tipi']})
+    durum_degerleri = sorted({r['durum'] for r in rows if r['durum']})
+    manzaralar = sorted({r['manzara'] for r in rows if r['manzara']})
+    fiyatlar = sorted(float(r['ucret_gecelik']) for r in rows)
+    orta = fiyatlar[len(fiyatlar) // 2]
+
+    cases = [{}]
+    cases += [{'durum': d} for v in durum_degerleri for d in yazilislar(v)]
+    cases += [{'oda_tipi': t} for v in tipler for t in yazilislar(v)]
+    cases += [{'manzara': m} for v in manzaralar for m in yazilislar(v)]
+    cases += [{'min_fiyat': orta}, {'max_fiyat': orta}, {'min_fiyat': fiyatlar[0], 'max_fiyat': orta},
+              {'min_fiyat': fiyatlar[-1] + 1}]
+
+    aramalar = set()
+    for r in rows[:20]:
+        numara = str(r['oda_numarasi'])
+        aramalar.update(numara[:n] for n in (1, 2, 3))
+    for v in tipler + manzaralar:
+        aramalar.update(yazilislar(v[:4]))
+        aramalar.add(v[1:4].lower())
+    aramalar.update(['zzz', 'x'])
+    # LIKE jokerleri düz karakter olmalı ('1_1' 101'i bulmamalı)
+    numara = str(rows[0]['oda_numarasi'])
+    aramalar.update(['%', '_', numara[:1] + '_' + numara[2:], numara[:1] + '%'])
+    # Noktasız ı: 'Şehir' -> 'şehır', 'Suit' -> 'SUıT'
+    for v in tipler + manzaralar:
+        if 'i' in v.lower():
+            aramalar.add(v.lower().replace('i', 'ı'))
+            aramalar.add(v.upper().replace('I', 'ı'))
+    cases += [{'arama': a} for a in sorted(aramalar) if a]
+
+    for tip, durum, fiyat in product(tipler[:3], durum_degerleri[:3], (None, orta)):
+        cases.append({'oda_tipi': tip, 'durum': durum, 'min_fiyat': fiyat})
+        cases.append({'oda_tipi': katla(tip), 'durum': durum, 'max_fiyat': fiyat, 'arama': str(rows[0]['oda_numarasi'])[:1]})
+    return cases
+
+
+def sql_fasetler(db, case):
+    """Faset sayılarını SQL yoluyla hesaplar (anahtarlar katlanmış)"""
+    def say(alan):
+        diger = {k: v for k, v in case.items() if k != alan}
+        return dict(Counter(katla(o[alan]) for o in OdaService.get_filtered_odalar(db, **diger)))
+    return {
+        'toplam': len(OdaService.get_filtered_odalar(db, **case)),
+        'oda_tipi': say('oda_tipi'),
+        'durum': say('durum'),
+    }
+
+
+def motor_fasetler(motor, case):
+    fasetler = motor.fasetler(**case)
+    return {
+        'toplam': fasetler['toplam'],
+        'oda_tipi': {katla(k): v for k, v in fasetler['oda_tipi'].items()},
+        'durum': {katla(k): v for k, v in fasetler['durum'].items()},
+    }
+
+
+def main():
+    """SQL ve bellek içi yolları karşılaştır"""
+    init_database()
+    db = db_session()
+    try:
+        rows = execute_query("""
+            SELECT oda_id, oda_numarasi, oda_tipi, manzara, metrekare, ucret_gecelik, durum
+            FROM odalar
+            ORDER BY oda_numarasi, oda_id
+        """, fetch=True) or []
+        if not rows:
+            print("❌ odalar tablosu boş, karşılaştırılacak veri yok")
+            return 1
+
+        motor = OdaFiltreMotoru(rows)
+        cases = kombinasyonlar(rows)
+        print(f"Oda: {len(rows)}, kombinasyon: {len(cases)}")
+
+        success = True
+        sql_sure = motor_sure = 0.0
+        for case in cases:
+            baslangic = time.perf_counter()
+            beklenen = OdaService.get_filtered_odalar(db, **case)
+            sql_sure += time.perf_counter() - baslangic
+
+            baslangic = time.perf_counter()
+            sonuc = motor.filtrele(**case)
+            motor_sure += time.perf_counter() - baslangic
+
+            if sonuc != beklenen:
+                success = False
+                print(f"❌ {case}: SQL {[o['oda_id'] for o in beklenen]} != motor {[o['oda_id'] for o in sonuc]}")
+                continue
+            if motor_fasetler(motor, case) != sql_fasetler(db, case):
+                success = False
+                print(f"❌ {case}: faset sayıları farklı "
+                      f"(SQL {sql_fasetler(db, case)}, motor {motor_fasetler(motor, case)})")
+
+        print(f"SQL yolu:   {sql_sure / len(cases) * 1e6:10.1f} µs/sorgu")
+        print(f"Motor:      {motor_sure / len(cases) * 1e6:10.1f} µs/sorgu")
+    finally:
+        db.close()
+        close_connection()
+
+    print()
+    print("🎉 MOTOR SQL YOLUYLA AYNI SONUÇLARI VERİYOR" if success else "❌ FARKLI SONUÇLAR VAR")
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sorgu planı kontrolü
+
+Rezervasyon sorgularını EXPLAIN ile çalıştırır ve create_rezervasyon_indexes.py
+ile eklenen indekslerin kullanıldığını doğrular. Tablo çok küçükse MySQL tam
+tarama (type=ALL) seçebilir; bu durumda uyarı verilir.
+
+NOT: Çalışan bir MySQL veritabanı gerektirir.
+"""
+
+import sys
+import os
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import init_database, get_db_connection, close_connection
+from create_rezervasyon_indexes import mevcut_indeksler
+
+BUGUN = date.today()
+YARIN = BUGUN + timedelta(days=1)
+
+# (açıklama, sorgu, parametreler, indeksin başlaması gereken sütunlar)
+CHECKS = [
+    (
+        "Müsaitlik/çakışma kontrolü",
+        """
+        SELECT rezervasyon_id FROM rezervasyonlar
+        WHERE oda_id = %s
+          AND rezervasyon_durumu IN ('aktif', 'bekliyor')
+          AND cikis_tarihi > %s
+          AND giris_tarihi < %s
+        """,
+        (1, BUGUN, BUGUN + timedelta(days=3)),
+        ('oda_id', 'rezervasyon_durumu'),
+    ),
+    (
+        "Bugün giriş yapacaklar",
+        """
+        SELECT rezervasyon_id FROM rezervasyonlar
+        WHERE giris_tarihi >= %s AND giris_tarihi < %s AND rezervasyon_durumu = 'Aktif'
+        """,
+        (BUGUN, YARIN),
+        ('giris_tarihi',),
+    ),
+    (
+        "Bugün çıkış yapacaklar",
+        """
+        SELECT rezervasyon_id FROM rezervasyonlar
+        WHERE cikis_tarihi >= %s AND cikis_tarihi < %s AND rezervasyon_durumu = 'Aktif'
+        """,
+        (BUGUN, YARIN),
+        ('cikis_tarihi',),
+    ),
+    (
+        "Müşterinin rezervasyonları",
+        "SELECT rezervasyon_id FROM rezervasyonlar WHERE musteri_id = %s",
+        (1,),
+        ('musteri_id',),
+    ),
+]
+
+
+def explain(query, params):
+    """EXPLAIN çıktısının rezervasyonlar satırını döndürür"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("EXPLAIN " + query, params)
+            rows = cursor.fetchall()
+    return next((r for r in rows if r.get('table') == 'rezervasyonlar'), rows[0])
+
+
+def main():
+    """Tüm planları kontrol et"""
+    init_database()
+    try:
+        mevcut = mevcut_indeksler()
+        print(f"rezervasyonlar indeksleri: {', '.join(sorted(mevcut)) or '-'}")
+        print()
+
+        success = True
+        for aciklama, query, params, prefix in CHECKS:
+            uygun = {name for name, cols in mevcut.items() if cols[:len(prefix)] == prefix}
+            plan = explain(query, params)
+            key = plan.get('key')
+            ok = key in uygun
+            success = success and ok
+
+            print(f"{'✅' if ok else '❌'} {aciklama}: key={key}, type={plan.get('type')}, rows={plan.get('rows')}")
+            if not uygun:
+                print(f"   ⚠️ ({', '.join(prefix)}) ile başlayan indeks yok, create_rezervasyon_indexes.py çalıştırın")
+            elif not ok and plan.get('type') == 'ALL':
+                print("   ⚠️ Tam tarama seçildi; tablo çok küçükse MySQL indeksi kullanmayabilir")
+    finally:
+        close_connection()
+
+    print()
+    print("🎉 TÜM PLANLAR İNDEKS KULLANIYOR" if success else "❌ BAZI PLANLAR İNDEKS KULLANMIYOR")
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
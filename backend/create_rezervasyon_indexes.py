@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Rezervasyonlar tablosuna sorgu indekslerini ekle
+
+- idx_rez_oda_durum_tarih: müsaitlik/çakışma kontrolü
+  (oda_id, rezervasyon_durumu, giris_tarihi, cikis_tarihi)
+- idx_rez_giris_tarihi / idx_rez_cikis_tarihi: dashboard günlük giriş/çıkış
+- idx_rez_musteri_olusturulma: müşteri bazlı rezervasyon sorguları ve
+  müşterinin rezervasyon listesi (sıralı, sayfalı)
+
+Var olan indeksler atlanır; betik tekrar çalıştırılabilir.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import execute_query, init_database
+
+# (indeks adı, sütunlar)
+indexes = [
+    ('idx_rez_oda_durum_tarih', ('oda_id', 'rezervasyon_durumu', 'giris_tarihi', 'cikis_tarihi')),
+    ('idx_rez_giris_tarihi', ('giris_tarihi',)),
+    ('idx_rez_cikis_tarihi', ('cikis_tarihi',)),
+    ('idx_rez_musteri_olusturulma', ('musteri_id', 'olusturulma_tarihi')),
+]
+
+
+def mevcut_indeksler():
+    """rezervasyonlar tablosundaki indeksleri {ad: (sütunlar)} olarak döndürür"""
+    rows = execute_query("""
+        SELECT INDEX_NAME, COLUMN_NAME
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'rezervasyonlar'
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+    """, fetch=True)
+    result = {}
+    for row in rows:
+        result.setdefault(row['INDEX_NAME'], []).append(row['COLUMN_NAME'])
+    return {name: tuple(cols) for name, cols in result.items()}
+
+
+if __name__ == '__main__':
+    # Veritabanı bağlantısını başlat
+    init_database()
+
+    try:
+        existing = mevcut_indeksler()
+
+        for name, columns in indexes:
+            if name in existing:
+                print(f'⏭️ {name} zaten var')
+                continue
+            # Aynı sütunlarla başlayan bir indeks (ör. foreign key indeksi) yeterli
+            ayni = [n for n, cols in existing.items() if cols[:len(columns)] == columns]
+            if ayni:
+                print(f'⏭️ {name} atlandı, {ayni[0]} aynı sütunları kapsıyor')
+                continue
+
+            execute_query(
+                f"CREATE INDEX {name} ON rezervasyonlar ({', '.join(columns)})",
+                fetch=False
+            )
+            print(f"✅ {name} ({', '.join(columns)}) oluşturuldu")
+
+        print('✅ Rezervasyon indeksleri hazır')
+
+    except Exception as e:
+        print(f'❌ İşlem hatası: {e}')
@@ -2,15 +2,29 @@ import pymysql
 import pymysql.cursors
 import os
 from dotenv import load_dotenv
+from flask import g, has_request_context, jsonify
 import logging
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
 load_dotenv()
 
 # Global connection pool
 connection_pool = None
 
+# İstek dışı transaction'lar için commit sonrası callback yığını (thread başına)
+_tx_local = threading.local()
+
+# Havuz ayarları (environment variable ile değiştirilebilir)
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+DB_POOL_MAX_IDLE_SECONDS = float(os.getenv('DB_POOL_MAX_IDLE_SECONDS', '300'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+DB_POOL_PING_INTERVAL = float(os.getenv('DB_POOL_PING_INTERVAL', '10'))
+
 class DatabaseConnection:
     """PyMySQL tabanlı veritabanı bağlantı yöneticisi"""
 
@@ -67,6 +81,213 @@ class DatabaseConnection:
         self.disconnect()
 
 
+class PoolTimeoutError(Exception):
+    """Havuzdan belirtilen süre içinde bağlantı alınamadığında fırlatılır"""
+
+
+class PoolClosedError(Exception):
+    """Kapatılmış havuzdan bağlantı istendiğinde fırlatılır"""
+
+
+class ConnectionPool:
+    """
+    Thread-safe, sınırlı boyutlu PyMySQL bağlantı havuzu.
+
+    - En az ``min_size`` bağlantı açık tutulur, en fazla ``max_size`` bağlantı açılır.
+    - ``max_idle_seconds`` süresinden uzun boşta kalan fazla bağlantılar kapatılır.
+    - ``ping_interval`` süresinden uzun boşta kalan bağlantı verilmeden önce ping'lenir;
+      cevap vermeyen bağlantı atılır ve yenisi açılır.
+    - Havuz doluysa ``acquire`` en fazla ``timeout`` saniye bekler, sonra
+      ``PoolTimeoutError`` fırlatır.
+    """
+
+    def __init__(self, connection_config: Dict[str, Any], min_size: int = DB_POOL_MIN_SIZE,
+                 max_size: int = DB_POOL_MAX_SIZE, max_idle_seconds: float = DB_POOL_MAX_IDLE_SECONDS,
+                 timeout: float = DB_POOL_TIMEOUT, ping_interval: float = DB_POOL_PING_INTERVAL):
+        if max_size < 1:
+            raise ValueError("Havuz boyutu en az 1 olmalıdır")
+
+        self.config = dict(connection_config)
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+
+        # Boştaki bağlantılar: (connection, son_kullanim_zamani); en eskisi solda
+        self._idle = deque()
+        # Açık bağlantı sayısı (boşta + kullanımda)
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        self._fill_min_size()
+
+    def _connect(self):
+        """Yeni fiziksel bağlantı açar"""
+        return DatabaseConnection(**self.config).connect()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _fill_min_size(self):
+        """Havuzu min_size kadar bağlantı ile doldurur (başarısızlık uygulamayı durdurmaz)"""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception as e:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                logging.warning(f"Havuz ön doldurma başarısız: {str(e)}")
+                return
+            with self._cond:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    def _evict_idle_locked(self) -> List[Any]:
+        """Süresi dolan boştaki bağlantıları havuzdan çıkarır (lock altında çağrılır)"""
+        expired = []
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size:
+            conn, last_used = self._idle[0]
+            if now - last_used < self.max_idle_seconds:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            expired.append(conn)
+        return expired
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Havuzdan bir bağlantı alır.
+
+        Args:
+            timeout: Beklenecek en uzun süre (saniye). None ise havuz varsayılanı.
+
+        Returns:
+            pymysql.connections.Connection
+
+        Raises:
+            PoolTimeoutError: Süre içinde bağlantı alınamazsa
+            PoolClosedError: Havuz kapatılmışsa
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            conn = None
+            last_used = None
+            expired = []
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError("Bağlantı havuzu kapatılmış")
+
+                    evicted = self._evict_idle_locked()
+                    if evicted:
+                        expired.extend(evicted)
+                        self._cond.notify(len(evicted))
+
+                    if self._idle:
+                        # En son kullanılan bağlantıyı al (LIFO) - sıcak kalır
+                        conn, last_used = self._idle.pop()
+                        break
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"{timeout} saniye içinde veritabanı bağlantısı alınamadı "
+                            f"(havuz boyutu: {self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+
+            for old in expired:
+                self._close_quietly(old)
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+
+            if time.monotonic() - last_used < self.ping_interval:
+                return conn
+
+            # Uzun süre boşta kalan bağlantı hâlâ canlı mı?
+            try:
+                conn.ping(reconnect=False)
+                return conn
+            except Exception as e:
+                logging.warning(f"Ölü bağlantı havuzdan atıldı: {str(e)}")
+                self._close_quietly(conn)
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+
+    def release(self, conn, discard: bool = False):
+        """
+        Bağlantıyı havuza geri verir.
+
+        Args:
+            conn: acquire() ile alınan bağlantı
+            discard: True ise bağlantı kapatılır (ör. bağlantı hatası sonrası)
+        """
+        with self._cond:
+            if discard or self._closed or not conn.open:
+                self._size -= 1
+                keep = False
+            else:
+                self._idle.append((conn, time.monotonic()))
+                keep = True
+            expired = self._evict_idle_locked()
+            self._cond.notify(1 + len(expired))
+
+        if not keep:
+            self._close_quietly(conn)
+        for old in expired:
+            self._close_quietly(old)
+
+    def close(self):
+        """Havuzu kapatır; boştaki bağlantılar hemen, kullanımdakiler iade edilince kapanır"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Havuz durumunu döndürür (izleme amaçlı)"""
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'closed': self._closed
+            }
+
+
 def init_database(app=None):
     """
     Veritabanı bağlantı havuzunu başlatır.
@@ -132,8 +353,12 @@ def init_database(app=None):
             except:
                 raise ValueError("Geçersiz DATABASE_URI formatı. Beklenen: user:password@host:port/database")
         
-        # Bağlantı havuzu oluştur (şimdilik tek bağlantı)
-        connection_pool = connection_config
+        # Önceki havuz varsa kapat
+        if connection_pool is not None:
+            connection_pool.close()
+
+        # Bağlantı havuzu oluştur
+        connection_pool = ConnectionPool(connection_config)
 
         logging.info("Veritabanı bağlantı havuzu başarıyla oluşturuldu")
 
@@ -142,27 +367,182 @@ def init_database(app=None):
         raise
 
 
+@contextmanager
+def _pooled_connection():
+    """
+    Havuzdan bağlantı alıp tek başına bir transaction olarak kullanır.
+
+    Blok hatasız biterse commit, hata olursa rollback yapılır ve bağlantı
+    havuza iade edilir.
+    """
+    if connection_pool is None:
+        raise Exception("Veritabanı bağlantısı başlatılmamış. init_database() çağrılmalı.")
+
+    conn = connection_pool.acquire()
+    discard = False
+    callbacks = []
+    stack = getattr(_tx_local, 'stack', None)
+    if stack is None:
+        stack = _tx_local.stack = []
+    stack.append(callbacks)
+    try:
+        yield conn
+        conn.commit()
+        stack.pop()
+        _run_commit_callbacks(callbacks)
+    except Exception as e:
+        if stack and stack[-1] is callbacks:
+            stack.pop()
+        try:
+            conn.rollback()
+        except Exception:
+            discard = True
+        if isinstance(e, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+            discard = True
+        logging.error(f"Veritabanı bağlantı hatası: {str(e)}")
+        raise
+    finally:
+        connection_pool.release(conn, discard=discard)
+
+
+def _run_commit_callbacks(callbacks):
+    """Commit sonrası callback'leri çalıştırır; hatalar loglanır, yayılmaz"""
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            logging.error(f"Commit sonrası callback hatası: {str(e)}")
+
+
+def on_commit(callback):
+    """
+    Callback'i mevcut transaction başarıyla commit edildikten sonra çalıştırır.
+
+    İstek içinde istek sonundaki commit'i, istek dışında içinde bulunulan
+    get_db_connection() bloğunun commit'ini bekler. Rollback olursa callback
+    atılır. Açık transaction yoksa hemen çalıştırılır.
+
+    Args:
+        callback: Argümansız çağrılabilir nesne
+    """
+    if _in_request_scope() and g.get('_db_conn') is not None:
+        g.setdefault('_db_on_commit', []).append(callback)
+        return
+
+    stack = getattr(_tx_local, 'stack', None)
+    if stack:
+        stack[-1].append(callback)
+        return
+
+    _run_commit_callbacks([callback])
+
+
+def _in_request_scope() -> bool:
+    """İstek kapsamlı unit of work aktif mi?"""
+    return has_request_context() and g.get('_db_request_scope', False)
+
+
 @contextmanager
 def get_db_connection():
     """
     Veritabanı bağlantısı sağlayan context manager.
 
+    Flask isteği içinde (init_request_scope ile etkinleştirildiyse) isteğe
+    bağlı tek bağlantı kullanılır; commit/rollback istek sonunda bir kez
+    yapılır. İstek dışında her blok kendi transaction'ı olarak çalışır.
+
     Yields:
-        DatabaseConnection: Veritabanı bağlantısı
+        pymysql.connections.Connection: Veritabanı bağlantısı
 
     Raises:
         Exception: Bağlantı hatası durumunda
     """
-    if connection_pool is None:
-        raise Exception("Veritabanı bağlantısı başlatılmamış. init_database() çağrılmalı.")
-        
-    db_conn = DatabaseConnection(**connection_pool)
+    if _in_request_scope():
+        conn = g.get('_db_conn')
+        if conn is None:
+            if connection_pool is None:
+                raise Exception("Veritabanı bağlantısı başlatılmamış. init_database() çağrılmalı.")
+            conn = connection_pool.acquire()
+            g._db_conn = conn
+        yield conn
+        return
+
+    with _pooled_connection() as conn:
+        yield conn
+
+
+def _begin_request_unit():
+    """İstek başında unit of work'ü etkinleştirir (bağlantı ilk sorguda alınır)"""
+    g._db_request_scope = True
+
+
+def _finish_request_unit(response):
+    """Yanıt hazırlanınca isteğin transaction'ını tek seferde commit/rollback eder"""
+    conn = g.get('_db_conn')
+    if conn is None or g.get('_db_finished'):
+        return response
+
+    g._db_finished = True
+    callbacks = g.pop('_db_on_commit', [])
+    if response.status_code >= 400:
+        try:
+            conn.rollback()
+        except Exception as e:
+            g._db_discard = True
+            logging.error(f"İstek rollback hatası: {str(e)}")
+        return response
+
     try:
-        with db_conn as conn:
-            yield conn
+        conn.commit()
     except Exception as e:
-        logging.error(f"Veritabanı bağlantı hatası: {str(e)}")
-        raise
+        g._db_discard = True
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        logging.error(f"İstek commit hatası: {str(e)}")
+        error_response = jsonify({'error': f'Veritabanı commit hatası: {str(e)}'})
+        error_response.status_code = 500
+        return error_response
+
+    _run_commit_callbacks(callbacks)
+    return response
+
+
+def _teardown_request_unit(exc=None):
+    """İstek sonunda bağlantıyı havuza iade eder; bitmemiş transaction'ı geri alır"""
+    conn = g.pop('_db_conn', None)
+    if conn is None:
+        return
+
+    discard = g.pop('_db_discard', False)
+    g.pop('_db_on_commit', None)
+    if not g.pop('_db_finished', False):
+        try:
+            conn.rollback()
+        except Exception:
+            discard = True
+
+    if connection_pool is not None:
+        connection_pool.release(conn, discard=discard)
+    else:
+        ConnectionPool._close_quietly(conn)
+
+
+def init_request_scope(app):
+    """
+    Flask uygulamasında istek kapsamlı bağlantı/transaction'ı etkinleştirir.
+
+    Bir istek içindeki tüm execute_query/execute_many çağrıları aynı bağlantıyı
+    kullanır. Yanıt durumu 400'den küçükse istek sonunda tek commit, değilse
+    rollback yapılır.
+
+    Args:
+        app: Flask uygulama instance'ı
+    """
+    app.before_request(_begin_request_unit)
+    app.after_request(_finish_request_unit)
+    app.teardown_request(_teardown_request_unit)
 
 
 def execute_query(query: str, params: Optional[Tuple] = None, fetch: bool = True) -> Optional[List[Dict[str, Any]]]:
@@ -192,7 +572,33 @@ def execute_query(query: str, params: Optional[Tuple] = None, fetch: bool = True
                 else:
                     return None
         except Exception as e:
-            conn.rollback()
+            logging.error(f"Sorgu çalıştırma hatası: {str(e)} - Query: {query}")
+            raise
+
+
+def execute_insert(query: str, params: Optional[Tuple] = None) -> int:
+    """
+    INSERT sorgusu çalıştırır ve eklenen satırın ID'sini döndürür.
+
+    ID aynı cursor üzerinden (cursor.lastrowid) alınır; ayrı bir
+    SELECT LAST_INSERT_ID() sorgusuna gerek kalmaz.
+
+    Args:
+        query: INSERT sorgusu
+        params: Sorgu parametreleri (tuple)
+
+    Returns:
+        int: AUTO_INCREMENT ile üretilen ID
+
+    Raises:
+        Exception: Sorgu hatası durumunda
+    """
+    with get_db_connection() as conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params or ())
+                return cursor.lastrowid
+        except Exception as e:
             logging.error(f"Sorgu çalıştırma hatası: {str(e)} - Query: {query}")
             raise
 
@@ -217,11 +623,109 @@ def execute_many(query: str, params_list: List[Tuple]) -> int:
                 cursor.executemany(query, params_list)
                 return cursor.rowcount
         except Exception as e:
-            conn.rollback()
             logging.error(f"Çoklu sorgu çalıştırma hatası: {str(e)}")
             raise
 
 
+def stream_query(query: str, params: Optional[Tuple] = None,
+                 batch_size: int = 1000) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """
+    SELECT sorgusunu sunucu taraflı cursor (SSDictCursor) ile çalıştırır.
+
+    Satırlar bellekte toplanmadan batch_size'lık parçalar halinde okunur;
+    büyük raporlar sabit bellekle akıtılabilir. Sorgu hemen çalıştırılır
+    (hatalar çağıranda oluşur), satırlar dönen iterator tüketildikçe gelir.
+
+    İstek bağlantısından bağımsız ayrı bir havuz bağlantısı kullanılır; yanıt
+    gövdesi istek bittikten sonra üretildiği için bu gereklidir. Bağlantı
+    iterator bitince havuza iade edilir; yarıda bırakılırsa (ör. istemci
+    bağlantıyı kesti) kalan satırları okumamak için kapatılır.
+
+    Args:
+        query: SQL sorgusu
+        params: Sorgu parametreleri (tuple)
+        batch_size: Tek seferde okunacak satır sayısı
+
+    Returns:
+        tuple: (sütun adları, satır iterator'ı)
+
+    Raises:
+        Exception: Bağlantı/sorgu hatası durumunda
+    """
+    if connection_pool is None:
+        raise Exception("Veritabanı bağlantısı başlatılmamış. init_database() çağrılmalı.")
+
+    pool = connection_pool
+    conn = pool.acquire()
+    try:
+        cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+        cursor.execute(query, params or ())
+        columns = [col[0] for col in cursor.description or ()]
+    except Exception as e:
+        logging.error(f"Sorgu çalıştırma hatası: {str(e)} - Query: {query}")
+        pool.release(conn, discard=True)
+        raise
+
+    return columns, _StreamedRows(pool, conn, cursor, batch_size)
+
+
+class _StreamedRows:
+    """
+    stream_query satır iterator'ı.
+
+    close() hiç iterasyon başlamadan da çağrılabildiği için (WSGI yanıtı
+    kapatılırken) generator yerine sınıf kullanılır; bağlantı her durumda
+    bir kez iade edilir.
+    """
+
+    def __init__(self, pool, conn, cursor, batch_size: int):
+        self._pool = pool
+        self._conn = conn
+        self._cursor = cursor
+        self._batch_size = batch_size
+        self._batch: List[Dict[str, Any]] = []
+        self._index = 0
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self._index >= len(self._batch):
+            if self._closed:
+                raise StopIteration
+            try:
+                self._batch = self._cursor.fetchmany(self._batch_size)
+            except Exception:
+                self._release(discard=True)
+                raise
+            self._index = 0
+            if not self._batch:
+                self._finish()
+                raise StopIteration
+        row = self._batch[self._index]
+        self._index += 1
+        return row
+
+    def _finish(self):
+        """Tüm satırlar okundu: cursor'ı kapat, bağlantıyı havuza iade et"""
+        try:
+            self._cursor.close()
+            self._conn.rollback()
+            self._release(discard=False)
+        except Exception:
+            self._release(discard=True)
+
+    def _release(self, discard: bool):
+        if not self._closed:
+            self._closed = True
+            self._pool.release(self._conn, discard=discard)
+
+    def close(self):
+        """Yarıda bırakılan akışı sonlandırır (okunmamış satırlar varsa bağlantı kapatılır)"""
+        self._release(discard=True)
+
+
 def test_connection() -> Tuple[bool, str]:
     """
     Veritabanı bağlantısını test eder.
@@ -254,6 +758,8 @@ def close_connection():
     global connection_pool
     
     try:
+        if connection_pool is not None:
+            connection_pool.close()
         connection_pool = None
         logging.info("Veritabanı bağlantısı kapatıldı")
         
@@ -0,0 +1,81 @@
+"""
+Flask JSON provider'ı
+
+orjson kuruluysa yanıtlar onunla (C ile) serileştirilir, değilse standart
+json modülüne düşülür. Her iki yolda da veritabanından gelen değerler
+doğrudan serileştirilebilir; model/route'ların satır başına ön biçimlendirme
+yapması gerekmez:
+
+    date / datetime -> ISO 8601 metin ('2024-05-01', '2024-05-01T12:30:00')
+    Decimal         -> sayı (float)
+
+Flask'ın varsayılan provider'ı tarihleri HTTP tarih biçiminde
+('Wed, 01 May 2024 ...') ve Decimal'ı metin olarak yazar; to_dict
+metotlarının ürettiği biçimle tutarlı olması için ikisi de değiştirilmiştir.
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    orjson = None
+
+
+# Sık görülen tipler için isinstance zinciri yerine tek sözlük araması
+_CONVERTERS = {
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    Decimal: float,
+}
+
+
+def _default(o: Any) -> Any:
+    """JSON'un doğrudan desteklemediği tipler"""
+    converter = _CONVERTERS.get(type(o))
+    if converter is not None:
+        return converter(o)
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, Decimal):
+        return float(o)
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson destekli, tarih/Decimal'ı doğrudan yazan JSON provider"""
+
+    default = staticmethod(_default)
+
+    def _orjson_dumps(self, obj: Any) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Ek json.dumps argümanı (ör. indent) yoksa orjson kullan
+        if orjson is not None and not kwargs:
+            return self._orjson_dumps(obj).decode('utf-8')
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """jsonify yanıtı; debug modundaki girintili çıktı standart json ile üretilir"""
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is None or pretty:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._orjson_dumps(obj) + b"\n", mimetype=self.mimetype)
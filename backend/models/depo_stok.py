@@ -4,6 +4,8 @@ from typing import Optional, Dict, Any
 class DepoStok:
     """Depo Stok modeli - PyMySQL tabanli"""
 
+    __slots__ = ('urun_id', 'hizmet_id', 'urun_adi', 'stok_adedi', 'son_guncelleme')
+
     def __init__(self, urun_id: Optional[int] = None, hizmet_id: Optional[int] = None,
                  urun_adi: str = "", stok_adedi: int = 0,
                  son_guncelleme: Optional[datetime] = None):
@@ -34,6 +36,22 @@ class DepoStok:
             'son_guncelleme': self.son_guncelleme.isoformat() if self.son_guncelleme else None
         }
 
+    @staticmethod
+    def row_to_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Veritabanı satırını ara nesne oluşturmadan JSON sözlüğüne cevirir.
+
+        Tarihler ham değer olarak bırakılır (JSON provider ISO metne çevirir);
+        JSON çıktısı from_dict(row).to_dict() ile aynıdır.
+        """
+        return {
+            'urun_id': row.get('urun_id'),
+            'hizmet_id': row.get('hizmet_id'),
+            'urun_adi': row.get('urun_adi', ''),
+            'stok_adedi': row.get('stok_adedi', 0),
+            'son_guncelleme': row.get('son_guncelleme') or datetime.utcnow()
+        }
+
     def can_decrease(self, miktar: int) -> bool:
         """Stok azaltilabilir mi kontrol eder"""
         return self.stok_adedi >= miktar
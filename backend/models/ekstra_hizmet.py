@@ -3,6 +3,8 @@ from typing import Optional, Dict, Any
 class EkstraHizmet:
     """Ekstra Hizmet modeli - PyMySQL tabanli"""
 
+    __slots__ = ('hizmet_id', 'hizmet_adi', 'birim_fiyat', 'kategori')
+
     def __init__(self, hizmet_id: Optional[int] = None, hizmet_adi: str = "",
                  birim_fiyat: float = 0.0, kategori: Optional[str] = None):
         self.hizmet_id = hizmet_id
@@ -29,3 +31,16 @@ class EkstraHizmet:
             'kategori': self.kategori
         }
 
+    @staticmethod
+    def row_to_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Veritabanı satırını ara nesne oluşturmadan JSON sözlüğüne cevirir.
+
+        Çıktı from_dict(row).to_dict() ile aynıdır.
+        """
+        return {
+            'hizmet_id': row.get('hizmet_id'),
+            'hizmet_adi': row.get('hizmet_adi', ''),
+            'birim_fiyat': float(row.get('birim_fiyat', 0.0)),
+            'kategori': row.get('kategori')
+        }
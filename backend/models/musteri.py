@@ -10,6 +10,9 @@ class Musteri:
 
     CINSIYET_CHOICES = [CINSIYET_ERKEK, CINSIYET_KADIN, CINSIYET_BELIRTILMEMIS]
 
+    __slots__ = ('musteri_id', 'ad', 'soyad', 'tc_kimlik_no', 'telefon', 'email',
+                 'cinsiyet', 'adres', 'ozel_notlar', 'kayit_tarihi')
+
     def __init__(self, musteri_id: Optional[int] = None, ad: str = "",
                  soyad: str = "", tc_kimlik_no: str = "", telefon: str = "",
                  email: Optional[str] = None, cinsiyet: str = CINSIYET_BELIRTILMEMIS,
@@ -57,6 +60,27 @@ class Musteri:
             'kayit_tarihi': self.kayit_tarihi.isoformat() if self.kayit_tarihi else None
         }
 
+    @staticmethod
+    def row_to_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Veritabanı satırını ara nesne oluşturmadan JSON sözlüğüne çevirir.
+
+        Tarihler ham değer olarak bırakılır (JSON provider ISO metne çevirir);
+        JSON çıktısı from_dict(row).to_dict() ile aynıdır.
+        """
+        return {
+            'musteri_id': row.get('musteri_id'),
+            'ad': row.get('ad', ''),
+            'soyad': row.get('soyad', ''),
+            'tc_kimlik_no': row.get('tc_kimlik_no', ''),
+            'telefon': row.get('telefon', ''),
+            'email': row.get('email'),
+            'cinsiyet': row.get('cinsiyet', Musteri.CINSIYET_BELIRTILMEMIS),
+            'adres': row.get('adres'),
+            'ozel_notlar': row.get('ozel_notlar'),
+            'kayit_tarihi': row.get('kayit_tarihi') or datetime.utcnow()
+        }
+
     def to_db_dict(self) -> Dict[str, Any]:
         """Veritabanı için dictionary formatı"""
         data = self.to_dict()
@@ -3,6 +3,8 @@ from typing import Optional, Dict, Any
 class MusteriDegerlendirme:
     """Musteri Degerlendirme modeli - PyMySQL tabanli"""
 
+    __slots__ = ('degerlendirme_id', 'rezervasyon_id', 'puan', 'yorum')
+
     def __init__(self, degerlendirme_id: Optional[int] = None, rezervasyon_id: Optional[int] = None,
                  puan: Optional[int] = None, yorum: Optional[str] = None):
         self.degerlendirme_id = degerlendirme_id
@@ -4,6 +4,8 @@ from typing import Optional, Dict, Any
 class MusteriHarcama:
     """Musteri Harcama modeli - PyMySQL tabanli"""
 
+    __slots__ = ('harcama_id', 'rezervasyon_id', 'hizmet_id', 'adet', 'toplam_fiyat', 'islem_tarihi')
+
     def __init__(self, harcama_id: Optional[int] = None, rezervasyon_id: int = 0,
                  hizmet_id: int = 0, adet: int = 1, toplam_fiyat: float = 0.0,
                  islem_tarihi: Optional[datetime] = None):
@@ -27,6 +27,9 @@ class Oda:
     TIPO_KRAL_DAIRESI = 'Kral Dairesi'
     TIPO_CHOICES = [TIPO_STANDART, TIPO_DELUXE, TIPO_SUITE, TIPO_VIPUITE, TIPO_ENGELLI_ODASI, TIPO_SINGLE_ECONOMY, TIPO_AILE, TIPO_CONNECTION_ROOM, TIPO_CORNER_SUIT, TIPO_BALAYI_SUITI, TIPO_PENTHOUSE, TIPO_KRAL_DAIRESI]
 
+    __slots__ = ('oda_id', 'oda_numarasi', 'oda_tipi', 'ucret_gecelik', 'durum',
+                 'manzara', 'metrekare', 'olusturulma_tarihi')
+
     def __init__(self, oda_id: Optional[int] = None, oda_numarasi: str = "",
                  oda_tipi: str = "", ucret_gecelik: float = 0.0, durum: str = DURUM_BOS,
                  manzara: str = "", metrekare: Optional[int] = None,
@@ -114,6 +117,42 @@ class Oda:
             'olusturulma_tarihi': self.olusturulma_tarihi.isoformat() if self.olusturulma_tarihi else None
         }
 
+    @staticmethod
+    def row_to_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Veritabanı satırını ara nesne oluşturmadan JSON sözlüğüne çevirir.
+
+        Tarihler ham değer olarak bırakılır ve JSON provider (json_provider.py)
+        tarafından ISO metne çevrilir; JSON çıktısı from_dict(row).to_dict() ile
+        aynıdır. Liste endpoint'lerinde satır başına nesne maliyetini ortadan
+        kaldırır.
+        """
+        oda_numarasi = row.get('oda_no') or row.get('oda_numarasi', '')
+        oda_tipi = row.get('tip') or row.get('oda_tipi', '')
+        fiyat = row.get('fiyat') or row.get('ucret_gecelik', 0.0)
+        try:
+            fiyat = float(fiyat) if fiyat else 0.0
+        except (ValueError, TypeError):
+            fiyat = 0.0
+        metrekare = row.get('metrekare')
+        try:
+            metrekare = int(metrekare) if metrekare is not None else None
+        except (ValueError, TypeError):
+            metrekare = None
+        return {
+            'oda_id': row.get('oda_id'),
+            'oda_numarasi': oda_numarasi,
+            'oda_tipi': oda_tipi,
+            'manzara': row.get('manzara', ''),
+            'metrekare': metrekare,
+            'ucret_gecelik': fiyat,
+            'durum': row.get('durum', Oda.DURUM_BOS),
+            'oda_no': oda_numarasi,
+            'tip': oda_tipi,
+            'fiyat': fiyat,
+            'olusturulma_tarihi': row.get('olusturulma_tarihi') or datetime.utcnow()
+        }
+
     def to_db_dict(self) -> Dict[str, Any]:
         """Veritabanı için dictionary formatı"""
         data = self.to_dict()
@@ -11,6 +11,8 @@ class Odeme:
 
     ODEME_TURU_CHOICES = [ODEME_NAKIT, ODEME_KREDI_KARTI, ODEME_HAVALE, ODEME_SANAL_POS]
 
+    __slots__ = ('odeme_id', 'rezervasyon_id', 'odenen_tutar', 'odeme_turu', 'odeme_tarihi')
+
     def __init__(self, odeme_id: Optional[int] = None, rezervasyon_id: int = 0,
                  odenen_tutar: float = 0.0, odeme_turu: str = ODEME_NAKIT,
                  odeme_tarihi: Optional[datetime] = None):
@@ -41,6 +43,22 @@ class Odeme:
             'odeme_tarihi': self.odeme_tarihi.isoformat() if self.odeme_tarihi else None
         }
 
+    @staticmethod
+    def row_to_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Veritabanı satırını ara nesne oluşturmadan JSON sözlüğüne cevirir.
+
+        Tarihler ham değer olarak bırakılır (JSON provider ISO metne çevirir);
+        JSON çıktısı from_dict(row).to_dict() ile aynıdır.
+        """
+        return {
+            'odeme_id': row.get('odeme_id'),
+            'rezervasyon_id': row.get('rezervasyon_id', 0),
+            'odenen_tutar': float(row.get('odenen_tutar', 0.0)),
+            'odeme_turu': row.get('odeme_turu', Odeme.ODEME_NAKIT),
+            'odeme_tarihi': row.get('odeme_tarihi') or datetime.utcnow()
+        }
+
     def validate_odeme_turu(self, odeme_turu: str) -> bool:
         """Odeme turu degerinin gecerli olup olmadigini kontrol eder"""
         return odeme_turu in self.ODEME_TURU_CHOICES
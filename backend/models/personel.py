@@ -4,6 +4,9 @@ from typing import Optional, Dict, Any
 class Personel:
     """Personel modeli - PyMySQL tabanlı"""
 
+    __slots__ = ('personel_id', 'kullanici_adi', 'sifre', 'ad_soyad', 'gorev',
+                 'aktiflik', 'olusturulma_tarihi')
+
     def __init__(self, personel_id: Optional[int] = None, kullanici_adi: str = "",
                  sifre: str = "", ad_soyad: str = "", gorev: str = "Personel",
                  aktiflik: bool = True, olusturulma_tarihi: Optional[datetime] = None):
@@ -39,6 +42,23 @@ class Personel:
             'olusturulma_tarihi': self.olusturulma_tarihi.isoformat() if self.olusturulma_tarihi else None
         }
 
+    @staticmethod
+    def row_to_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Veritabanı satırını ara nesne oluşturmadan JSON sözlüğüne çevirir.
+
+        Tarihler ham değer olarak bırakılır (JSON provider ISO metne çevirir);
+        JSON çıktısı from_dict(row).to_dict() ile aynıdır (şifre dahil edilmez).
+        """
+        return {
+            'personel_id': row.get('personel_id'),
+            'kullanici_adi': row.get('kullanici_adi', ''),
+            'ad_soyad': row.get('ad_soyad', ''),
+            'gorev': row.get('gorev', 'Personel'),
+            'aktiflik': row.get('aktiflik', True),
+            'olusturulma_tarihi': row.get('olusturulma_tarihi') or datetime.utcnow()
+        }
+
     def to_db_dict(self) -> Dict[str, Any]:
         """Veritabanı için dictionary formatı"""
         data = self.to_dict()
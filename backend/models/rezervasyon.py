@@ -2,6 +2,11 @@ from datetime import datetime, date
 from typing import Optional, Dict, Any
 
 
+def _tarih(value):
+    """date/datetime ise ISO metni, değilse değerin kendisi"""
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
 class Rezervasyon:
     """Rezervasyon modeli - PyMySQL tabanli"""
 
@@ -12,6 +17,18 @@ class Rezervasyon:
 
     DURUM_CHOICES = [DURUM_BEKLIYOR, DURUM_AKTIF, DURUM_TAMAMLANDI, DURUM_IPTAL]
 
+    # Veritabanındaki küçük harfli eski durum değerlerinin gösterim karşılıkları
+    DURUM_ETIKETLERI = {
+        'bekliyor': 'Bekliyor',
+        'aktif': 'Aktif',
+        'tamamlandi': 'Tamamlandı',
+        'iptal': 'İptal'
+    }
+
+    __slots__ = ('rezervasyon_id', 'musteri_id', 'oda_id', 'giris_tarihi', 'cikis_tarihi',
+                 'yetiskin_sayisi', 'cocuk_sayisi', 'toplam_ucret', 'rezervasyon_durumu',
+                 'olusturulma_tarihi')
+
     def __init__(
         self,
         rezervasyon_id: Optional[int] = None,
@@ -58,20 +75,38 @@ class Rezervasyon:
             'rezervasyon_id': self.rezervasyon_id,
             'musteri_id': self.musteri_id,
             'oda_id': self.oda_id,
-            'giris_tarihi': self.giris_tarihi.isoformat() if isinstance(self.giris_tarihi, (datetime, date)) else self.giris_tarihi,
-            'cikis_tarihi': self.cikis_tarihi.isoformat() if isinstance(self.cikis_tarihi, (datetime, date)) else self.cikis_tarihi,
+            'giris_tarihi': _tarih(self.giris_tarihi),
+            'cikis_tarihi': _tarih(self.cikis_tarihi),
             'yetiskin_sayisi': self.yetiskin_sayisi,
             'cocuk_sayisi': self.cocuk_sayisi,
             'toplam_ucret': self.toplam_ucret,
-            'rezervasyon_durumu': {
-                'bekliyor': 'Bekliyor',
-                'aktif': 'Aktif',
-                'tamamlandi': 'Tamamlandı',
-                'iptal': 'İptal'
-            }.get(self.rezervasyon_durumu, self.rezervasyon_durumu),
+            'rezervasyon_durumu': self.DURUM_ETIKETLERI.get(self.rezervasyon_durumu, self.rezervasyon_durumu),
             'olusturulma_tarihi': self.olusturulma_tarihi.isoformat() if self.olusturulma_tarihi else None
         }
 
+    @staticmethod
+    def row_to_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Veritabanı satırını ara nesne oluşturmadan JSON sözlüğüne çevirir.
+
+        Tarihler ham değer olarak bırakılır (JSON provider ISO metne çevirir);
+        JSON çıktısı from_dict(row).to_dict() ile aynıdır.
+        """
+        toplam_ucret = row.get('toplam_ucret')
+        durum = row.get('rezervasyon_durumu', Rezervasyon.DURUM_AKTIF)
+        return {
+            'rezervasyon_id': row.get('rezervasyon_id'),
+            'musteri_id': row.get('musteri_id', 0),
+            'oda_id': row.get('oda_id', 0),
+            'giris_tarihi': row.get('giris_tarihi'),
+            'cikis_tarihi': row.get('cikis_tarihi'),
+            'yetiskin_sayisi': row.get('yetiskin_sayisi', 1),
+            'cocuk_sayisi': row.get('cocuk_sayisi', 0),
+            'toplam_ucret': float(toplam_ucret) if toplam_ucret is not None else 0.0,
+            'rezervasyon_durumu': Rezervasyon.DURUM_ETIKETLERI.get(durum, durum),
+            'olusturulma_tarihi': row.get('olusturulma_tarihi') or datetime.utcnow()
+        }
+
     def validate_status(self, status: str) -> bool:
         """Durum degerinin gecerli olup olmadigini kontrol eder"""
         return status in self.DURUM_CHOICES
@@ -5,6 +5,8 @@ from typing import Optional, Dict, Any
 class SilinenRezervasyonLog:
     """Silinen rezervasyon log modeli - PyMySQL tabanli"""
 
+    __slots__ = ('log_id', 'rezervasyon_id', 'musteri_id', 'silinme_tarihi', 'sebep')
+
     def __init__(
         self,
         log_id: Optional[int] = None,
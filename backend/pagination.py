@@ -0,0 +1,192 @@
+"""
+Keyset (cursor tabanlı) sayfalama yardımcıları
+
+Liste endpoint'leri OFFSET yerine son satırın sıralama anahtarından devam
+eder; sayfa ne kadar ileride olursa olsun sorgu indeks üzerinden aynı
+maliyetle çalışır.
+
+İstek parametreleri:
+    limit: Sayfa boyutu (varsayılan LIST_DEFAULT_LIMIT, en fazla LIST_MAX_LIMIT)
+    after: Önceki yanıtın X-Next-Cursor header'ındaki cursor
+    include_total: 1 ise toplam kayıt sayısı X-Total-Count header'ında döner
+
+Yanıt gövdesi önceki gibi JSON dizi olarak kalır; sonraki sayfanın cursor'ı
+X-Next-Cursor header'ında döner (son sayfada header yoktur).
+"""
+
+import base64
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import jsonify, request
+
+from database import execute_query
+
+# Sayfa boyutu sınırları (environment variable ile değiştirilebilir)
+LIST_DEFAULT_LIMIT = int(os.getenv('LIST_DEFAULT_LIMIT', '100'))
+LIST_MAX_LIMIT = int(os.getenv('LIST_MAX_LIMIT', '500'))
+
+
+class PaginationError(ValueError):
+    """Geçersiz limit/after parametresi"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+    return value
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """Sıralama değeri ve satır ID'sinden opak cursor üretir"""
+    payload = json.dumps([_encode_value(sort_value), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    """encode_cursor ile üretilen cursor'ı çözer"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return _decode_value(sort_value), row_id
+    except Exception:
+        raise PaginationError('Gecersiz cursor (after) degeri')
+
+
+def _column_key(column: str) -> str:
+    """'o.odeme_tarihi' -> 'odeme_tarihi' (satır sözlüğündeki anahtar)"""
+    return column.rsplit('.', 1)[-1]
+
+
+def _keyset_condition(order_column: str, id_column: str, descending: bool,
+                      sort_value: Any, row_id: Any) -> Tuple[str, List[Any]]:
+    """
+    Cursor'dan sonraki satırlar için WHERE koşulu.
+
+    MySQL NULL'ları ASC sıralamada başa, DESC sıralamada sona koyar; koşul
+    bu sırayı korur.
+    """
+    op = '<' if descending else '>'
+    if sort_value is None:
+        if descending:
+            return f"({order_column} IS NULL AND {id_column} {op} %s)", [row_id]
+        return f"(({order_column} IS NULL AND {id_column} {op} %s) OR {order_column} IS NOT NULL)", [row_id]
+
+    condition = f"{order_column} {op} %s OR ({order_column} = %s AND {id_column} {op} %s)"
+    if descending:
+        condition += f" OR {order_column} IS NULL"
+    return f"({condition})", [sort_value, sort_value, row_id]
+
+
+def get_page_args() -> Tuple[int, Optional[str], bool]:
+    """İstekten (limit, after, include_total) okur ve doğrular"""
+    raw_limit = request.args.get('limit')
+    if raw_limit in (None, ''):
+        limit = LIST_DEFAULT_LIMIT
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise PaginationError('limit bir tam sayi olmalidir')
+        if limit < 1:
+            raise PaginationError('limit 1 veya daha buyuk olmalidir')
+    limit = min(limit, LIST_MAX_LIMIT)
+
+    after = request.args.get('after') or None
+    include_total = request.args.get('include_total', '').lower() in ('1', 'true', 'yes')
+    return limit, after, include_total
+
+
+class Page:
+    """Tek sayfalık sonuç"""
+
+    def __init__(self, rows: List[Dict[str, Any]], next_cursor: Optional[str],
+                 total: Optional[int]):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.total = total
+
+    def jsonify(self, items: List[Any]):
+        """Dizi gövdeli JSON yanıt üretir, cursor ve toplamı header'a yazar"""
+        response = jsonify(items)
+        if self.next_cursor:
+            response.headers['X-Next-Cursor'] = self.next_cursor
+        if self.total is not None:
+            response.headers['X-Total-Count'] = str(self.total)
+        return response
+
+
+def keyset_page(base_query: str, order_column: str, id_column: str,
+                descending: bool = False, where: Optional[str] = None,
+                params: Tuple = (), count_query: Optional[str] = None) -> Page:
+    """
+    Keyset sayfalama ile tek sayfa getirir.
+
+    Args:
+        base_query: WHERE/ORDER BY/LIMIT içermeyen SELECT ... FROM ... sorgusu
+        order_column: Sıralama sütunu (ör. 'r.olusturulma_tarihi')
+        id_column: Benzersiz eşitlik bozucu sütun (ör. 'r.rezervasyon_id')
+        descending: Azalan sıralama
+        where: Ek WHERE koşulu (parametreleri params içinde)
+        params: where koşulunun parametreleri
+        count_query: include_total istenirse çalıştırılacak COUNT sorgusu
+            ('cnt' sütunu döndürmeli, where parametrelerini almalı)
+
+    Returns:
+        Page: Satırlar, sonraki cursor ve (istendiyse) toplam
+
+    Raises:
+        PaginationError: Geçersiz limit/after
+    """
+    limit, after, include_total = get_page_args()
+
+    conditions = []
+    query_params: List[Any] = list(params)
+    if where:
+        conditions.append(f"({where})")
+    if after:
+        sort_value, row_id = decode_cursor(after)
+        condition, condition_params = _keyset_condition(
+            order_column, id_column, descending, sort_value, row_id)
+        conditions.append(condition)
+        query_params.extend(condition_params)
+
+    direction = 'DESC' if descending else 'ASC'
+    query = base_query
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY {order_column} {direction}, {id_column} {direction} LIMIT %s"
+    query_params.append(limit + 1)
+
+    rows = execute_query(query, params=tuple(query_params), fetch=True) or []
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last[_column_key(order_column)], last[_column_key(id_column)])
+
+    total = None
+    if include_total and count_query:
+        result = execute_query(count_query, params=tuple(params), fetch=True)
+        total = result[0]['cnt'] if result else 0
+
+    return Page(rows, next_cursor, total)
@@ -1,13 +1,38 @@
+import logging
 from flask import Blueprint, request, jsonify
 from database import execute_query
 from models.personel import Personel
 from auth.jwt_utils import generate_token
-from auth.password_utils import verify_password
+from auth.password_utils import (
+    verify_password_pooled, hash_password_pooled, needs_rehash,
+    PasswordHasherBusy, BCRYPT_REHASH_ON_LOGIN
+)
 from auth.rbac.roles import normalize_role
 
 bp = Blueprint('auth', __name__, url_prefix='/api')
 
 
+def _rehash_password(personel_data, password):
+    """
+    Başarılı girişten sonra şifreyi BCRYPT_ROUNDS ile yeniden hashler.
+
+    Hata veya havuz doluluğu girişi engellemez; bir sonraki girişte tekrar
+    denenir. UPDATE eski hash'i koşul olarak kullanır, arada değiştirilen
+    şifrenin üzerine yazılmaz.
+    """
+    try:
+        new_hash = hash_password_pooled(password)
+        execute_query(
+            "UPDATE personel SET sifre = %s WHERE personel_id = %s AND sifre = %s",
+            params=(new_hash, personel_data.get('personel_id'), personel_data.get('sifre')),
+            fetch=False
+        )
+    except PasswordHasherBusy:
+        pass
+    except Exception as e:
+        logging.warning(f"Şifre yeniden hashlenemedi (personel_id={personel_data.get('personel_id')}): {e}")
+
+
 @bp.route('/login', methods=['POST', 'OPTIONS'])
 def login():
     """
@@ -68,13 +93,17 @@ def login():
                 'message': 'Hesabınız aktif değil. Lütfen yöneticinizle iletişime geçin.'
             }), 401
         
-        # Şifre kontrolü
-        if not verify_password(password, personel_data.get('sifre')):
+        # Şifre kontrolü (bcrypt havuzunda)
+        if not verify_password_pooled(password, personel_data.get('sifre')):
             return jsonify({
                 'error': 'Giriş başarısız',
                 'message': 'Email veya şifre hatalı'
             }), 401
         
+        # Maliyet faktörü değiştiyse şifreyi yeni faktörle yeniden hashle
+        if BCRYPT_REHASH_ON_LOGIN and needs_rehash(personel_data.get('sifre')):
+            _rehash_password(personel_data, password)
+        
         # Token üret
         token = generate_token(
             personel_id=personel_data.get('personel_id'),
@@ -96,6 +125,13 @@ def login():
             }
         }), 200
         
+    except PasswordHasherBusy as e:
+        response = jsonify({
+            'error': 'Sunucu meşgul',
+            'message': str(e)
+        })
+        response.headers['Retry-After'] = '1'
+        return response, 503
     except Exception as e:
         return jsonify({
             'error': 'Sunucu hatası',
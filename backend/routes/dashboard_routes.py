@@ -1,10 +1,62 @@
+import datetime
 from flask import Blueprint, jsonify
 from database import execute_query
+from cache import app_cache
+from services.oda_katalogu_service import oda_katalogu
+from services.musteri_arama_service import musteri_arama_indeksi
 from auth.jwt_utils import token_required
 from auth.rbac.decorators import read_required
 
 bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
 
+# Dashboard istatistiklerinin bağlı olduğu tablolar (önbellek geçersizleme)
+DASHBOARD_STATS_TABLES = ('rezervasyonlar', 'odalar', 'musteriler')
+
+
+def _load_dashboard_stats(today: datetime.date) -> dict:
+    """Dashboard istatistiklerini tek aggregate sorgu ile hesaplar"""
+    query = """
+        SELECT
+            (SELECT COUNT(*) FROM rezervasyonlar) AS total_reservations,
+            (SELECT COUNT(*)
+             FROM rezervasyonlar
+             WHERE giris_tarihi >= %s AND giris_tarihi < %s
+               AND rezervasyon_durumu IN ('Aktif', 'Bekliyor')) AS todays_checkins,
+            (SELECT COUNT(*) FROM musteriler) AS total_customers,
+            o.total_rooms,
+            o.occupied_rooms,
+            o.available_rooms
+        FROM (
+            SELECT
+                COUNT(*) AS total_rooms,
+                COALESCE(SUM(durum = 'Dolu'), 0) AS occupied_rooms,
+                COALESCE(SUM(durum = 'Boş'), 0) AS available_rooms
+            FROM odalar
+        ) o
+    """
+    tomorrow = today + datetime.timedelta(days=1)
+    result = execute_query(query, params=(today.isoformat(), tomorrow.isoformat()), fetch=True)
+    row = result[0] if result else {}
+
+    total_rooms = int(row.get('total_rooms') or 0)
+    occupied_rooms = int(row.get('occupied_rooms') or 0)
+
+    # Doluluk oranı hesaplama
+    occupancy_rate = 0
+    if total_rooms > 0:
+        occupancy_rate = round((occupied_rooms / total_rooms) * 100, 1)
+
+    return {
+        'total_reservations': int(row.get('total_reservations') or 0),
+        'occupied_rooms': occupied_rooms,
+        'available_rooms': int(row.get('available_rooms') or 0),
+        'todays_checkins': int(row.get('todays_checkins') or 0),
+        'total_customers': int(row.get('total_customers') or 0),
+        'occupancy_rate': occupancy_rate,
+        'total_rooms': total_rooms
+    }
+
+
 @bp.route('/stats', methods=['GET'])
 @token_required
 @read_required('dashboard')
@@ -23,55 +75,13 @@ def get_dashboard_stats(current_user):
         JSON: Dashboard istatistikleri
     """
     try:
-        # Toplam rezervasyon sayısı
-        total_reservations_query = "SELECT COUNT(*) as count FROM rezervasyonlar"
-        total_reservations_result = execute_query(total_reservations_query, fetch=True)
-        total_reservations = total_reservations_result[0]['count'] if total_reservations_result else 0
-
-        # Dolu oda sayısı (durum = 'Dolu')
-        occupied_rooms_query = "SELECT COUNT(*) as count FROM odalar WHERE durum = 'Dolu'"
-        occupied_rooms_result = execute_query(occupied_rooms_query, fetch=True)
-        occupied_rooms = occupied_rooms_result[0]['count'] if occupied_rooms_result else 0
-
-        # Müsait oda sayısı (durum = 'Boş')
-        available_rooms_query = "SELECT COUNT(*) as count FROM odalar WHERE durum = 'Boş'"
-        available_rooms_result = execute_query(available_rooms_query, fetch=True)
-        available_rooms = available_rooms_result[0]['count'] if available_rooms_result else 0
-
-        # Bugün giriş yapacak müşteri sayısı (bugün tarihli girişler)
-        import datetime
-        today = datetime.date.today().isoformat()
-        todays_checkins_query = """
-            SELECT COUNT(*) as count
-            FROM rezervasyonlar
-            WHERE DATE(giris_tarihi) = %s AND rezervasyon_durumu IN ('Aktif', 'Bekliyor')
-        """
-        todays_checkins_result = execute_query(todays_checkins_query, params=(today,), fetch=True)
-        todays_checkins = todays_checkins_result[0]['count'] if todays_checkins_result else 0
-
-        # Toplam müşteri sayısı
-        total_customers_query = "SELECT COUNT(*) as count FROM musteriler"
-        total_customers_result = execute_query(total_customers_query, fetch=True)
-        total_customers = total_customers_result[0]['count'] if total_customers_result else 0
-
-        # Doluluk oranı hesaplama
-        total_rooms_query = "SELECT COUNT(*) as count FROM odalar"
-        total_rooms_result = execute_query(total_rooms_query, fetch=True)
-        total_rooms = total_rooms_result[0]['count'] if total_rooms_result else 0
-
-        occupancy_rate = 0
-        if total_rooms > 0:
-            occupancy_rate = round((occupied_rooms / total_rooms) * 100, 1)
-
-        stats = {
-            'total_reservations': total_reservations,
-            'occupied_rooms': occupied_rooms,
-            'available_rooms': available_rooms,
-            'todays_checkins': todays_checkins,
-            'total_customers': total_customers,
-            'occupancy_rate': occupancy_rate,
-            'total_rooms': total_rooms
-        }
+        # Tek sorgu, birkaç saniyelik süreç içi önbellek (yazmalar geçersiz kılar)
+        today = datetime.date.today()
+        stats = app_cache.get_or_load(
+            f'dashboard_stats:{today.isoformat()}',
+            lambda: _load_dashboard_stats(today),
+            tables=DASHBOARD_STATS_TABLES
+        )
 
         return jsonify({
             'success': True,
@@ -84,6 +94,23 @@ def get_dashboard_stats(current_user):
             'error': f'Dashboard istatistikleri alınırken hata oluştu: {str(e)}'
         }), 500
 
+@bp.route('/cache-stats', methods=['GET'])
+@token_required
+@read_required('dashboard')
+def get_cache_stats(current_user):
+    """
+    Süreç içi önbelleğin, oda kataloğunun ve müşteri arama indeksinin
+    sayaçlarını döndüren endpoint.
+
+    Returns:
+        JSON: Önbellek istatistikleri
+    """
+    return jsonify({
+        'success': True,
+        'data': dict(app_cache.stats(), oda_katalogu=oda_katalogu.stats(),
+                     musteri_arama=musteri_arama_indeksi.stats())
+    }), 200
+
 @bp.route('/active-reservations', methods=['GET'])
 @token_required
 @read_required('dashboard')
@@ -148,8 +175,9 @@ def get_todays_events(current_user):
         JSON: Bugünkü olaylar listesi
     """
     try:
-        import datetime
-        today = datetime.date.today().isoformat()
+        # Yarı açık aralık [bugün, yarın): sütun fonksiyona sarılmadığı için indeks kullanılabilir
+        today = datetime.date.today()
+        tomorrow = today + datetime.timedelta(days=1)
 
         # Bugün giriş yapacaklar
         checkins_query = """
@@ -161,7 +189,7 @@ def get_todays_events(current_user):
             FROM rezervasyonlar r
             JOIN musteriler m ON r.musteri_id = m.musteri_id
             JOIN odalar o ON r.oda_id = o.oda_id
-            WHERE DATE(r.giris_tarihi) = %s AND r.rezervasyon_durumu = 'Aktif'
+            WHERE r.giris_tarihi >= %s AND r.giris_tarihi < %s AND r.rezervasyon_durumu = 'Aktif'
             ORDER BY r.giris_tarihi ASC
         """
 
@@ -175,12 +203,12 @@ def get_todays_events(current_user):
             FROM rezervasyonlar r
             JOIN musteriler m ON r.musteri_id = m.musteri_id
             JOIN odalar o ON r.oda_id = o.oda_id
-            WHERE DATE(r.cikis_tarihi) = %s AND r.rezervasyon_durumu = 'Aktif'
+            WHERE r.cikis_tarihi >= %s AND r.cikis_tarihi < %s AND r.rezervasyon_durumu = 'Aktif'
             ORDER BY r.cikis_tarihi ASC
         """
 
-        checkins = execute_query(checkins_query, params=(today,), fetch=True)
-        checkouts = execute_query(checkouts_query, params=(today,), fetch=True)
+        checkins = execute_query(checkins_query, params=(today.isoformat(), tomorrow.isoformat()), fetch=True)
+        checkouts = execute_query(checkouts_query, params=(today.isoformat(), tomorrow.isoformat()), fetch=True)
 
         events = []
 
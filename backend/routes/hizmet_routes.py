@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
-from database import execute_query
+from database import execute_query, execute_insert
+from pagination import keyset_page, PaginationError
+from cache import invalidate_tables, conditional_get
 from models.ekstra_hizmet import EkstraHizmet
 from auth.jwt_utils import token_required
 from auth.rbac.decorators import read_required, write_required, delete_required, permission_required
@@ -9,22 +11,21 @@ bp = Blueprint('hizmet', __name__, url_prefix='/api/services')
 @bp.route('/', methods=['GET'])
 @token_required
 @read_required('ekstra_hizmetler')
+@conditional_get('ekstra_hizmetler')
 def get_services(current_user):
-    """Tum ekstra hizmetleri listele (Korumali)"""
+    """Tum ekstra hizmetleri listele (Korumali, sayfali: limit/after)"""
     try:
-        query = """
-        SELECT hizmet_id, hizmet_adi, birim_fiyat, kategori 
-        FROM ekstra_hizmetler 
-        ORDER BY hizmet_adi
-        """
-        result = execute_query(query, fetch=True)
+        page = keyset_page(
+            "SELECT hizmet_id, hizmet_adi, birim_fiyat, kategori FROM ekstra_hizmetler",
+            order_column='hizmet_adi', id_column='hizmet_id',
+            count_query="SELECT COUNT(*) as cnt FROM ekstra_hizmetler"
+        )
 
-        services = []
-        for row in result:
-            service = EkstraHizmet.from_dict(row)
-            services.append(service.to_dict())
+        services = [EkstraHizmet.row_to_dict(row) for row in page.rows]
 
-        return jsonify(services), 200
+        return page.jsonify(services), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -82,14 +83,10 @@ def create_service(current_user):
         INSERT INTO ekstra_hizmetler (hizmet_adi, birim_fiyat, kategori)
         VALUES (%s, %s, %s)
         """
-        execute_query(insert_query, params=(
+        service.hizmet_id = execute_insert(insert_query, params=(
             service.hizmet_adi, service.birim_fiyat, service.kategori
-        ), fetch=False)
-
-        # Eklenen hizmetin ID'sini al
-        last_id_query = "SELECT LAST_INSERT_ID() as id"
-        id_result = execute_query(last_id_query, fetch=True)
-        service.hizmet_id = id_result[0]['id']
+        ))
+        invalidate_tables('ekstra_hizmetler')
 
         return jsonify(service.to_dict()), 201
     except Exception as e:
@@ -142,6 +139,7 @@ def update_service(service_id, current_user):
         update_values.append(service_id)
 
         execute_query(update_query, params=tuple(update_values), fetch=False)
+        invalidate_tables('ekstra_hizmetler')
 
         # Guncellenmis hizmeti getir
         select_query = """
@@ -183,6 +181,7 @@ def delete_service(service_id, current_user):
         # Silme islemi
         delete_query = "DELETE FROM ekstra_hizmetler WHERE hizmet_id = %s"
         execute_query(delete_query, params=(service_id,), fetch=False)
+        invalidate_tables('ekstra_hizmetler')
 
         return jsonify({'message': 'Hizmet silindi'}), 200
     except Exception as e:
@@ -214,6 +213,7 @@ def update_service_status(service_id, current_user):
         WHERE hizmet_id = %s
         """
         execute_query(update_query, params=(aktif, service_id), fetch=False)
+        invalidate_tables('ekstra_hizmetler')
 
         # Guncellenmis hizmeti getir
         select_query = """
@@ -1,8 +1,15 @@
 from flask import Blueprint, request, jsonify
-from database import execute_query
+from database import execute_query, execute_insert
+from cache import invalidate_tables
+from pagination import keyset_page, PaginationError
 from models.musteri import Musteri
 from models.musteri_harcama import MusteriHarcama
 from models.musteri_degerlendirme import MusteriDegerlendirme
+from models.rezervasyon import Rezervasyon
+from services.rezervasyon_sorgu_service import RezervasyonSorguService, RezervasyonFiltreError
+from services.musteri_arama_service import (
+    MusteriAramaService, musteri_arama_indeksi, MUSTERI_ARAMA_DEFAULT_LIMIT, MUSTERI_ARAMA_MAX_LIMIT
+)
 from auth.jwt_utils import token_required
 from auth.rbac.decorators import read_required, write_required, delete_required
 
@@ -12,22 +19,53 @@ bp = Blueprint('musteri', __name__, url_prefix='/api/customers')
 @token_required
 @read_required('musteriler')
 def get_customers(current_user):
-    """Tum musterileri listele (Korumali)"""
+    """Tum musterileri listele (Korumali, sayfali: limit/after)"""
     try:
-        query = """
-        SELECT musteri_id, ad, soyad, tc_kimlik_no, telefon, email, 
-               cinsiyet, adres, ozel_notlar, kayit_tarihi 
-        FROM musteriler 
-        ORDER BY kayit_tarihi DESC
-        """
-        result = execute_query(query, fetch=True)
+        page = keyset_page(
+            """
+            SELECT musteri_id, ad, soyad, tc_kimlik_no, telefon, email,
+                   cinsiyet, adres, ozel_notlar, kayit_tarihi
+            FROM musteriler
+            """,
+            order_column='kayit_tarihi', id_column='musteri_id', descending=True,
+            count_query="SELECT COUNT(*) as cnt FROM musteriler"
+        )
 
-        customers = []
-        for row in result:
-            customer = Musteri.from_dict(row)
-            customers.append(customer.to_dict())
+        customers = [Musteri.row_to_dict(row) for row in page.rows]
 
-        return jsonify(customers), 200
+        return page.jsonify(customers), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/search', methods=['GET'])
+@token_required
+@read_required('musteriler')
+def search_customers(current_user):
+    """
+    Musteri ara (Korumali)
+
+    q: Bosluklu terimler; her terim ad, soyad, email, telefon veya TC'de
+       gecmelidir (1-2 karakterlik terimler kelime basi olarak aranir).
+       Turkce karakter ve buyuk/kucuk harf duyarsizdir.
+    limit: Sonuc sayisi (varsayilan 20, en fazla 100)
+    """
+    try:
+        q = request.args.get('q', '').strip()
+        try:
+            limit = int(request.args.get('limit') or MUSTERI_ARAMA_DEFAULT_LIMIT)
+        except ValueError:
+            return jsonify({'error': 'limit bir tam sayi olmalidir'}), 400
+        if limit < 1:
+            return jsonify({'error': 'limit 1 veya daha buyuk olmalidir'}), 400
+        limit = min(limit, MUSTERI_ARAMA_MAX_LIMIT)
+
+        if not q:
+            return jsonify([]), 200
+
+        rows = MusteriAramaService.ara(q, limit)
+        return jsonify([Musteri.row_to_dict(row) for row in rows]), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -102,15 +140,15 @@ def create_customer(current_user):
         INSERT INTO musteriler (ad, soyad, tc_kimlik_no, telefon, email, cinsiyet, adres, ozel_notlar, kayit_tarihi)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
         """
-        execute_query(insert_query, params=(
+        customer.musteri_id = execute_insert(insert_query, params=(
             customer.ad, customer.soyad, customer.tc_kimlik_no, customer.telefon,
             customer.email, customer.cinsiyet, customer.adres, customer.ozel_notlar
-        ), fetch=False)
-
-        # Eklenen musterinin ID'sini al
-        last_id_query = "SELECT LAST_INSERT_ID() as id"
-        id_result = execute_query(last_id_query, fetch=True)
-        customer.musteri_id = id_result[0]['id']
+        ))
+        invalidate_tables('musteriler')
+        musteri_arama_indeksi.commit_sonrasi_kaydet({
+            'musteri_id': customer.musteri_id, 'ad': customer.ad, 'soyad': customer.soyad,
+            'email': customer.email, 'telefon': customer.telefon, 'tc_kimlik_no': customer.tc_kimlik_no
+        })
 
         return jsonify(customer.to_dict()), 201
     except Exception as e:
@@ -188,6 +226,7 @@ def update_customer(customer_id, current_user):
         update_values.append(customer_id)
 
         execute_query(update_query, params=tuple(update_values), fetch=False)
+        invalidate_tables('musteriler')
 
         # Guncellenmis musteriyi getir
         select_query = """
@@ -197,6 +236,7 @@ def update_customer(customer_id, current_user):
         WHERE musteri_id = %s
         """
         result = execute_query(select_query, params=(customer_id,), fetch=True)
+        musteri_arama_indeksi.commit_sonrasi_kaydet(result[0])
         customer = Musteri.from_dict(result[0])
 
         return jsonify(customer.to_dict()), 200
@@ -228,11 +268,37 @@ def delete_customer(customer_id, current_user):
         # Silme islemi
         delete_query = "DELETE FROM musteriler WHERE musteri_id = %s"
         execute_query(delete_query, params=(customer_id,), fetch=False)
+        invalidate_tables('musteriler')
+        musteri_arama_indeksi.commit_sonrasi_sil(customer_id)
 
         return jsonify({'message': 'Musteri silindi'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@bp.route('/<int:customer_id>/reservations', methods=['GET'])
+@token_required
+def get_customer_reservations(customer_id, current_user):
+    """
+    Musterinin rezervasyonlarini getir (Korumali, sayfali: limit/after)
+
+    /api/reservations ile ayni filtre ve siralama parametrelerini alir;
+    musteri_id yoldan gelir.
+    """
+    try:
+        # Once musteri var mi kontrol et
+        check_query = "SELECT musteri_id FROM musteriler WHERE musteri_id = %s"
+        existing = execute_query(check_query, params=(customer_id,), fetch=True)
+        if not existing:
+            return jsonify({'error': 'Musteri bulunamadi'}), 404
+
+        page = RezervasyonSorguService.sayfa(request.args, musteri_id=customer_id)
+        reservations = [Rezervasyon.row_to_dict(row) for row in page.rows]
+        return page.jsonify(reservations), 200
+    except (PaginationError, RezervasyonFiltreError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @bp.route('/<int:customer_id>/harcamalar', methods=['GET'])
 @token_required
 def get_customer_expenses(customer_id, current_user):
@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify
-from database import execute_query
+from database import execute_query, execute_insert
+from cache import invalidate_tables, conditional_get
+from pagination import keyset_page, PaginationError
 from models.oda import Oda
 from auth.jwt_utils import token_required
-from services.oda_service import OdaService
-from models.sqlalchemy_base import db_session
+from services.musaitlik_service import musaitlik_indeksi
+from services.oda_detay_service import OdaDetayService, ODA_DETAY_MAX_IDS
+from services.oda_katalogu_service import oda_katalogu
 
 bp = Blueprint('rooms', __name__, url_prefix='/api/rooms')
 
@@ -12,6 +15,7 @@ bp_odalar = Blueprint('odalar', __name__, url_prefix='/api/odalar')
 
 @bp.route('/options', methods=['GET'])
 @token_required
+@conditional_get()
 def get_room_options(current_user):
     """Oda tipi seçeneklerini döndür"""
     try:
@@ -24,29 +28,30 @@ def get_room_options(current_user):
 
 @bp.route('/', methods=['GET'])
 @token_required
+@conditional_get('odalar')
 def get_rooms(current_user):
-    """Tüm odaları listele (Korumalı)"""
+    """Tüm odaları listele (Korumalı, sayfalı: limit/after)"""
     try:
-        query = "SELECT oda_id, oda_numarasi, oda_tipi, manzara, ucret_gecelik, durum FROM odalar ORDER BY oda_numarasi"
-        results = execute_query(query, fetch=True)
+        def get_page():
+            return keyset_page(
+                "SELECT oda_id, oda_numarasi, oda_tipi, manzara, ucret_gecelik, durum FROM odalar",
+                order_column='oda_numarasi', id_column='oda_id',
+                count_query="SELECT COUNT(*) as cnt FROM odalar"
+            )
 
-        odalar = []
-        for row in results:
-            oda = Oda.from_dict(row)
-            odalar.append(oda.to_dict())
+        page = get_page()
 
         # Eğer hiç oda yoksa test verileri ekle
-        if len(odalar) == 0:
+        if not page.rows and not request.args.get('after'):
             print("Veritabanında oda bulunamadı, test verileri ekleniyor...")
             add_test_rooms()
             # Tekrar odaları getir
-            results = execute_query(query, fetch=True)
-            odalar = []
-            for row in results:
-                oda = Oda.from_dict(row)
-                odalar.append(oda.to_dict())
+            page = get_page()
 
-        return jsonify(odalar), 200
+        odalar = [Oda.row_to_dict(row) for row in page.rows]
+        return page.jsonify(odalar), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -71,6 +76,7 @@ def add_test_rooms():
                 INSERT INTO odalar (oda_numarasi, oda_tipi, manzara, ucret_gecelik, durum)
                 VALUES (%s, %s, %s, %s, %s)
             ''', (room_no, tip, manzara, fiyat, durum))
+            invalidate_tables('odalar')
             print(f"Oda {room_no} eklendi")
         except Exception as e:
             print(f"Oda {room_no} eklenirken hata: {e}")
@@ -80,14 +86,8 @@ def add_test_rooms():
 def get_available_rooms(current_user):
     """Sadece boş odaları listele (Korumalı)"""
     try:
-        query = "SELECT oda_id, oda_numarasi, oda_tipi, manzara, ucret_gecelik, durum FROM odalar WHERE durum = %s ORDER BY oda_numarasi"
-        results = execute_query(query, params=(Oda.DURUM_BOS,), fetch=True)
-
-        odalar = []
-        for row in results:
-            oda = Oda.from_dict(row)
-            odalar.append(oda.to_dict())
-
+        # Bellek içi katalogdan (durum indeksi)
+        odalar = [Oda.row_to_dict(oda) for oda in oda_katalogu.filtrele(durum=Oda.DURUM_BOS)]
         return jsonify(odalar), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -149,14 +149,10 @@ def create_room(current_user):
             INSERT INTO odalar (oda_numarasi, oda_tipi, ucret_gecelik, durum, manzara)
             VALUES (%s, %s, %s, %s, %s)
         """
-        result = execute_query(insert_query,
-                              params=(oda.oda_numarasi, oda.oda_tipi, oda.ucret_gecelik, oda.durum, oda.manzara),
-                              fetch=False)
-
-        # Son eklenen ID'yi al
-        id_query = "SELECT LAST_INSERT_ID() as id"
-        id_result = execute_query(id_query, fetch=True)
-        oda.oda_id = id_result[0]['id']
+        oda.oda_id = execute_insert(insert_query,
+                                    params=(oda.oda_numarasi, oda.oda_tipi, oda.ucret_gecelik, oda.durum, oda.manzara))
+        musaitlik_indeksi.commit_sonrasi_oda_ekle(oda.oda_id)
+        invalidate_tables('odalar')
 
         return jsonify(oda.to_dict()), 201
     except Exception as e:
@@ -215,6 +211,7 @@ def update_room(room_id, current_user):
         update_query = f"UPDATE odalar SET {', '.join(update_fields)} WHERE oda_id = %s"
 
         execute_query(update_query, params=params, fetch=False)
+        invalidate_tables('odalar')
 
         # Güncellenmiş odayı getir
         select_query = "SELECT oda_id, oda_numarasi, oda_tipi, manzara, metrekare, ucret_gecelik, durum FROM odalar WHERE oda_id = %s"
@@ -250,6 +247,7 @@ def update_room_status(room_id, current_user):
         # Durumu güncelle
         update_query = "UPDATE odalar SET durum = %s WHERE oda_id = %s"
         execute_query(update_query, params=(yeni_durum, room_id), fetch=False)
+        invalidate_tables('odalar')
 
         # Güncellenmiş odayı getir
         select_query = "SELECT oda_id, oda_numarasi, oda_tipi, manzara, metrekare, ucret_gecelik, durum FROM odalar WHERE oda_id = %s"
@@ -283,71 +281,73 @@ def delete_room(room_id, current_user):
         # Odayı sil
         delete_query = "DELETE FROM odalar WHERE oda_id = %s"
         execute_query(delete_query, params=(room_id,), fetch=False)
+        musaitlik_indeksi.commit_sonrasi_oda_sil(room_id)
+        invalidate_tables('odalar')
 
         return jsonify({'message': 'Oda başarıyla silindi'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+def _oda_filtreleri():
+    """/api/odalar filtre parametrelerini okur (fiyat geçersizse ValueError)"""
+    min_fiyat_str = request.args.get('minFiyat')
+    max_fiyat_str = request.args.get('maxFiyat')
+    return {
+        'durum': request.args.get('durum'),
+        'oda_tipi': request.args.get('oda_tipi'),
+        'min_fiyat': float(min_fiyat_str) if min_fiyat_str else None,
+        'max_fiyat': float(max_fiyat_str) if max_fiyat_str else None,
+        'arama': request.args.get('arama'),
+    }
+
 @bp_odalar.route('/', methods=['GET'])
 @token_required
+@conditional_get('odalar')
 def get_odalar(current_user):
     """Filtre parametreleri ile odaları getir (Frontend uyumluluğu için)"""
     try:
-        # Query parametreleri
-        durum = request.args.get('durum')
-        oda_tipi = request.args.get('oda_tipi')
-        min_fiyat_str = request.args.get('minFiyat')
-        max_fiyat_str = request.args.get('maxFiyat')
-        arama = request.args.get('arama')
-
-        # Fiyat dönüşümleri
-        min_fiyat = None
-        max_fiyat = None
-
         try:
-            if min_fiyat_str:
-                min_fiyat = float(min_fiyat_str)
-            if max_fiyat_str:
-                max_fiyat = float(max_fiyat_str)
+            filtreler = _oda_filtreleri()
         except ValueError:
             return jsonify({'error': 'Fiyat parametreleri geçerli sayı olmalıdır'}), 400
 
-        db = db_session()
+        # Filtreler bellek içi oda kataloğundan uygulanır
+        odalar = oda_katalogu.filtrele(**filtreler)
 
-        try:
-            odalar = OdaService.get_filtered_odalar(
-                db=db,
-                durum=durum,
-                oda_tipi=oda_tipi,
-                min_fiyat=min_fiyat,
-                max_fiyat=max_fiyat,
-                arama=arama
-            )
+        # SADECE filtre yoksa ve oda yoksa test verisi ekle
+        if len(odalar) == 0 and not any(filtreler.values()):
+            print("Veritabanında oda bulunamadı, test verileri ekleniyor...")
+            add_test_rooms()
 
-            # SADECE filtre yoksa ve oda yoksa test verisi ekle
-            if len(odalar) == 0 and not any([durum, oda_tipi, min_fiyat, max_fiyat, arama]):
-                print("Veritabanında oda bulunamadı, test verileri ekleniyor...")
-                add_test_rooms()
+            # Test verisi sonrası tekrar çek (invalidate commit'i beklediği için katalog burada tazelenir)
+            oda_katalogu.invalidate()
+            odalar = oda_katalogu.filtrele()
 
-                # Test verisi sonrası tekrar çek
-                odalar = OdaService.get_filtered_odalar(
-                    db=db,
-                    durum=durum,
-                    oda_tipi=oda_tipi,
-                    min_fiyat=min_fiyat,
-                    max_fiyat=max_fiyat,
-                    arama=arama
-                )
+        return jsonify(odalar), 200
 
-            return jsonify(odalar), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        finally:
-            db.close()
 
+@bp_odalar.route('/fasetler', methods=['GET'])
+@token_required
+@conditional_get('odalar')
+def get_oda_fasetleri(current_user):
+    """
+    /api/odalar/ ile aynı filtreler için oda tipi ve durum faset sayılarını getir.
+
+    Her faset kendi filtresi hariç diğer filtrelerle sayılır.
+    Örnek yanıt: {"toplam": 3, "oda_tipi": {"Çift": 3, "Tek": 2}, "durum": {"Boş": 3}}
+    """
+    try:
+        try:
+            filtreler = _oda_filtreleri()
+        except ValueError:
+            return jsonify({'error': 'Fiyat parametreleri geçerli sayı olmalıdır'}), 400
+        return jsonify(oda_katalogu.fasetler(**filtreler)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-
 @bp_odalar.route('/<int:oda_id>', methods=['GET'])
 @token_required
 def get_oda_by_id(oda_id, current_user):
@@ -394,14 +394,16 @@ def create_oda(current_user):
         INSERT INTO odalar (oda_numarasi, oda_tipi, manzara, metrekare, ucret_gecelik, durum)
         VALUES (%s, %s, %s, %s, %s, %s)
         """
-        execute_query(query, params=(
+        oda_id = execute_insert(query, params=(
             data['oda_no'],
             data['tip'],
             data.get('manzara', 'Yok'),
             data.get('metrekare', None),
             float(data['fiyat']),
             data['durum']
-        ), fetch=False)
+        ))
+        musaitlik_indeksi.commit_sonrasi_oda_ekle(oda_id)
+        invalidate_tables('odalar')
 
         return jsonify({'message': 'Oda başarıyla oluşturuldu'}), 201
     except Exception as e:
@@ -434,14 +436,46 @@ def update_oda(oda_id, current_user):
             data['durum'],
             oda_id
         ), fetch=False)
+        invalidate_tables('odalar')
 
         return jsonify({'message': 'Oda başarıyla güncellendi'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@bp_odalar.route('/detaylar', methods=['GET'])
+@token_required
+@conditional_get('odalar', 'oda_ozellikleri', 'oda_ozellik_baglanti', 'oda_resimleri')
+def get_oda_detaylari(current_user):
+    """
+    Birden fazla odayı özellikleri ve resimleriyle birlikte getir.
+
+    Query Parameters:
+        ids: Virgülle ayrılmış oda ID'leri (ör. ?ids=1,2,3)
+
+    Returns:
+        JSON: Oda listesi; her odada 'ozellikler' ve 'resimler' alanları
+    """
+    try:
+        raw_ids = request.args.get('ids', '')
+        try:
+            oda_ids = [int(part) for part in raw_ids.split(',') if part.strip()]
+        except ValueError:
+            return jsonify({'error': 'ids virgülle ayrılmış tam sayılardan oluşmalıdır'}), 400
+
+        if not oda_ids:
+            return jsonify({'error': 'ids parametresi zorunludur'}), 400
+        if len(oda_ids) > ODA_DETAY_MAX_IDS:
+            return jsonify({'error': f'Tek istekte en fazla {ODA_DETAY_MAX_IDS} oda istenebilir'}), 400
+
+        return jsonify(OdaDetayService.get_detaylar(oda_ids)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @bp_odalar.route('/<int:oda_id>/ozellikler', methods=['GET'])
 @token_required
+@conditional_get('oda_ozellikleri', 'oda_ozellik_baglanti')
 def get_oda_ozellikler(oda_id, current_user):
     """Bir odanın özelliklerini getir"""
     try:
@@ -462,6 +496,7 @@ def get_oda_ozellikler(oda_id, current_user):
 
 @bp_odalar.route('/<int:oda_id>/resimler', methods=['GET'])
 @token_required
+@conditional_get('odalar', 'oda_resimleri')
 def get_oda_resimleri(oda_id, current_user):
     """Bir odanın resimlerini getir"""
     try:
@@ -1,6 +1,10 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify
-from database import execute_query
+from database import execute_query, execute_insert
+from pagination import keyset_page, PaginationError
 from models.odeme import Odeme
+from services.folyo_service import FolyoService
+from services.gelir_ozeti_service import GelirOzetiService
 from auth.jwt_utils import token_required
 from auth.rbac.decorators import read_required, write_required, delete_required
 
@@ -10,31 +14,63 @@ bp = Blueprint('odeme', __name__, url_prefix='/api/payments')
 @token_required
 @read_required('odemeler')
 def get_payments(current_user):
-    """Tum odemeleri listele (Korumali)"""
+    """Tum odemeleri listele (Korumali, sayfali: limit/after)"""
     try:
-        query = """
-        SELECT 
-            o.odeme_id,
-            o.rezervasyon_id,
-            o.odenen_tutar,
-            o.odeme_turu,
-            o.odeme_tarihi,
-            r.musteri_id
-        FROM odemeler o
-        INNER JOIN rezervasyonlar r ON o.rezervasyon_id = r.rezervasyon_id
-        ORDER BY o.odeme_tarihi DESC
-        """
-        result = execute_query(query, fetch=True)
+        page = keyset_page(
+            """
+            SELECT
+                o.odeme_id,
+                o.rezervasyon_id,
+                o.odenen_tutar,
+                o.odeme_turu,
+                o.odeme_tarihi,
+                r.musteri_id
+            FROM odemeler o
+            INNER JOIN rezervasyonlar r ON o.rezervasyon_id = r.rezervasyon_id
+            """,
+            order_column='o.odeme_tarihi', id_column='o.odeme_id', descending=True,
+            count_query="""
+            SELECT COUNT(*) as cnt
+            FROM odemeler o
+            INNER JOIN rezervasyonlar r ON o.rezervasyon_id = r.rezervasyon_id
+            """
+        )
 
         payments = []
-        for row in result:
-            payment = Odeme.from_dict(row)
-            payment_dict = payment.to_dict()
+        for row in page.rows:
+            payment_dict = Odeme.row_to_dict(row)
             # Musteri bilgisini ekle
             payment_dict['musteri_id'] = row.get('musteri_id')
             payments.append(payment_dict)
 
-        return jsonify(payments), 200
+        return page.jsonify(payments), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/outstanding', methods=['GET'])
+@token_required
+@read_required('odemeler')
+def get_outstanding_balances(current_user):
+    """
+    Acik bakiyeli rezervasyonlar (Korumali, sayfali: limit/after)
+
+    Check-out ve gece denetimi icin; cikis tarihine gore siralidir.
+    cikis_tarihi (YYYY-MM-DD) verilirse o gun veya oncesinde cikisi olanlar doner.
+    """
+    try:
+        cikis_tarihi = request.args.get('cikis_tarihi')
+        if cikis_tarihi:
+            try:
+                cikis_tarihi = datetime.strptime(cikis_tarihi, '%Y-%m-%d').date()
+            except ValueError:
+                return jsonify({'error': 'cikis_tarihi formati YYYY-MM-DD olmalidir'}), 400
+
+        page = FolyoService.acik_bakiyeler(cikis_tarihi or None)
+        return page.jsonify([FolyoService.row_to_dict(row) for row in page.rows]), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -111,14 +147,12 @@ def create_payment(current_user):
         INSERT INTO odemeler (rezervasyon_id, odenen_tutar, odeme_turu, odeme_tarihi)
         VALUES (%s, %s, %s, NOW())
         """
-        execute_query(insert_query, params=(
+        payment.odeme_id = execute_insert(insert_query, params=(
             payment.rezervasyon_id, payment.odenen_tutar, payment.odeme_turu
-        ), fetch=False)
-
-        # Eklenen odemenin ID'sini al
-        last_id_query = "SELECT LAST_INSERT_ID() as id"
-        id_result = execute_query(last_id_query, fetch=True)
-        payment.odeme_id = id_result[0]['id']
+        ))
+        # Aylık gelir özetini ve folyoyu aynı transaction'da güncelle
+        GelirOzetiService.odeme_eklendi(payment.odeme_id)
+        FolyoService.yenile(payment.rezervasyon_id)
 
         # Musteri bilgisini ekle
         payment_dict = payment.to_dict()
@@ -208,24 +242,29 @@ def get_payments_by_reservation(reservation_id, current_user):
         ORDER BY o.odeme_tarihi DESC
         """
         result = execute_query(query, params=(reservation_id,), fetch=True)
-
-        payments = []
-        toplam_odenen = 0.0
-        for row in result:
-            payment = Odeme.from_dict(row)
-            payments.append(payment.to_dict())
-            toplam_odenen += payment.odenen_tutar
+        payments = [Odeme.from_dict(row).to_dict() for row in result]
 
         rezervasyon_bilgisi = existing_rez[0]
         toplam_ucret = float(rezervasyon_bilgisi.get('toplam_ucret', 0)) if rezervasyon_bilgisi.get('toplam_ucret') else 0
-        kalan_tutar = max(0, toplam_ucret - toplam_odenen)
+
+        # Toplamlar folyodan okunur; folyo henuz yoksa odemelerden hesaplanir
+        folyo = FolyoService.get(reservation_id)
+        if folyo:
+            toplam_odenen = folyo['odenen_toplam']
+            ekstra_toplam = folyo['ekstra_toplam']
+            bakiye = folyo['bakiye']
+        else:
+            toplam_odenen = sum(p['odenen_tutar'] for p in payments)
+            ekstra_toplam = 0.0
+            bakiye = toplam_ucret - toplam_odenen
 
         return jsonify({
             'rezervasyon_id': reservation_id,
             'musteri_id': rezervasyon_bilgisi.get('musteri_id'),
             'toplam_ucret': toplam_ucret,
+            'ekstra_toplam': round(ekstra_toplam, 2),
             'toplam_odenen': round(toplam_odenen, 2),
-            'kalan_tutar': round(kalan_tutar, 2),
+            'kalan_tutar': round(max(0, bakiye), 2),
             'odemeler': payments,
             'odeme_sayisi': len(payments)
         }), 200
@@ -239,7 +278,7 @@ def update_payment(payment_id, current_user):
     """Odeme bilgilerini guncelle (Korumali)"""
     try:
         # Once odeme var mi kontrol et
-        check_query = "SELECT odeme_id FROM odemeler WHERE odeme_id = %s"
+        check_query = "SELECT odeme_id, rezervasyon_id FROM odemeler WHERE odeme_id = %s"
         existing = execute_query(check_query, params=(payment_id,), fetch=True)
         if not existing:
             return jsonify({'error': 'Odeme bulunamadi'}), 404
@@ -282,7 +321,13 @@ def update_payment(payment_id, current_user):
         update_query = f"UPDATE odemeler SET {', '.join(update_fields)} WHERE odeme_id = %s"
         update_values.append(payment_id)
 
+        # Eski tutari ozetten cikar, guncel tutari ekle (ayni transaction)
+        GelirOzetiService.odeme_cikarilacak(payment_id)
         execute_query(update_query, params=tuple(update_values), fetch=False)
+        GelirOzetiService.odeme_eklendi(payment_id)
+        # Odeme baska rezervasyona tasindiysa iki folyo da guncellenir
+        for rezervasyon_id in {existing[0]['rezervasyon_id'], data.get('rezervasyon_id', existing[0]['rezervasyon_id'])}:
+            FolyoService.yenile(rezervasyon_id)
 
         # Guncellenmis odemeyi getir
         select_query = """
@@ -313,14 +358,16 @@ def delete_payment(payment_id, current_user):
     """Odeme sil (Korumali)"""
     try:
         # Once odeme var mi kontrol et
-        check_query = "SELECT odeme_id FROM odemeler WHERE odeme_id = %s"
+        check_query = "SELECT odeme_id, rezervasyon_id FROM odemeler WHERE odeme_id = %s"
         existing = execute_query(check_query, params=(payment_id,), fetch=True)
         if not existing:
             return jsonify({'error': 'Odeme bulunamadi'}), 404
 
-        # Silme islemi
+        # Silme islemi (once aylik gelir ozetinden cikar)
+        GelirOzetiService.odeme_cikarilacak(payment_id)
         delete_query = "DELETE FROM odemeler WHERE odeme_id = %s"
         execute_query(delete_query, params=(payment_id,), fetch=False)
+        FolyoService.yenile(existing[0]['rezervasyon_id'])
 
         return jsonify({'message': 'Odeme silindi'}), 200
     except Exception as e:
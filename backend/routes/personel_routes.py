@@ -1,8 +1,9 @@
 from flask import Blueprint, request, jsonify
-from database import execute_query
+from database import execute_query, execute_insert
+from pagination import keyset_page, PaginationError
 from models.personel import Personel
 from auth.jwt_utils import token_required
-from auth.password_utils import hash_password
+from auth.password_utils import hash_password_pooled, PasswordHasherBusy
 from auth.rbac.decorators import read_required, write_required, delete_required
 
 bp = Blueprint('personel', __name__, url_prefix='/api/personel')
@@ -11,17 +12,19 @@ bp = Blueprint('personel', __name__, url_prefix='/api/personel')
 @token_required
 @read_required('personel')
 def get_personel(current_user):
-    """Tüm personeli listele (Korumalı)"""
+    """Tüm personeli listele (Korumalı, sayfalı: limit/after)"""
     try:
-        query = "SELECT personel_id, kullanici_adi, ad_soyad, gorev, aktiflik FROM personel ORDER BY ad_soyad"
-        results = execute_query(query, fetch=True)
-        
-        personel_list = []
-        for row in results:
-            personel = Personel.from_dict(row)
-            personel_list.append(personel.to_dict())
-        
-        return jsonify(personel_list), 200
+        page = keyset_page(
+            "SELECT personel_id, kullanici_adi, ad_soyad, gorev, aktiflik FROM personel",
+            order_column='ad_soyad', id_column='personel_id',
+            count_query="SELECT COUNT(*) as cnt FROM personel"
+        )
+
+        personel_list = [Personel.row_to_dict(row) for row in page.rows]
+
+        return page.jsonify(personel_list), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -56,27 +59,25 @@ def create_personel(current_user):
         if not data.get('sifre'):
             return jsonify({'error': 'Şifre zorunludur'}), 400
         
-        hashed_password = hash_password(data['sifre'])
+        hashed_password = hash_password_pooled(data['sifre'])
         
         insert_query = """
             INSERT INTO personel (kullanici_adi, ad_soyad, sifre, gorev, aktiflik)
             VALUES (%s, %s, %s, %s, %s)
         """
-        execute_query(insert_query, 
-                     params=(data['kullanici_adi'], data['ad_soyad'], hashed_password, 
-                            data.get('gorev', 'staff'), data.get('aktiflik', True)),
-                     fetch=False)
-        
-        id_query = "SELECT LAST_INSERT_ID() as id"
-        id_result = execute_query(id_query, fetch=True)
+        personel_id = execute_insert(insert_query,
+                                     params=(data['kullanici_adi'], data['ad_soyad'], hashed_password, 
+                                             data.get('gorev', 'staff'), data.get('aktiflik', True)))
         
         return jsonify({
-            'personel_id': id_result[0]['id'],
+            'personel_id': personel_id,
             'kullanici_adi': data['kullanici_adi'],
             'ad_soyad': data['ad_soyad'],
             'gorev': data.get('gorev', 'staff'),
             'aktiflik': data.get('aktiflik', True)
         }), 201
+    except PasswordHasherBusy as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
@@ -99,13 +100,13 @@ def update_personel(personel_id, current_user):
             if key in data:
                 update_fields.append(f"{key} = %s")
                 if key == 'sifre':
-                    params.append(hash_password(data[key]))
+                    params.append(hash_password_pooled(data[key]))
                 else:
                     params.append(data[key])
         
         if 'sifre' in data and data['sifre']:
             update_fields.append("sifre = %s")
-            params.append(hash_password(data['sifre']))
+            params.append(hash_password_pooled(data['sifre']))
         
         if not update_fields:
             return jsonify({'error': 'Güncellenecek alan bulunamadı'}), 400
@@ -119,6 +120,8 @@ def update_personel(personel_id, current_user):
         personel = Personel.from_dict(results[0])
         
         return jsonify(personel.to_dict()), 200
+    except PasswordHasherBusy as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
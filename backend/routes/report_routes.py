@@ -1,19 +1,135 @@
-from flask import Blueprint, jsonify
-from database import execute_query
+import csv
+import io
+from flask import Blueprint, Response, current_app, jsonify, request
+from database import execute_query, stream_query
 from auth.jwt_utils import token_required
 from auth.rbac.decorators import read_required
 
 bp = Blueprint('reports', __name__, url_prefix='/api/reports')
 
+# Akış formatları: format parametresi -> mimetype
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+    'csv': 'text/csv',
+}
+
+# Aylık kazanç raporu: ödeme yazmalarıyla artımlı güncellenen özet tablo
+MONTHLY_SUMMARY_QUERY = """
+    SELECT donem AS Donem, odeme_turu, toplam_kazanc AS Toplam_Kazanc, islem_sayisi AS Islem_Sayisi
+    FROM monthly_revenue_summary
+    ORDER BY donem DESC, odeme_turu
+"""
+
+# monthly_revenue_summary tablosu var mı (None: henüz kontrol edilmedi)
+_summary_table_exists = None
+
+# Tek seferde sunucudan okunan / istemciye yazılan satır sayısı
+EXPORT_BATCH_SIZE = 500
+
+
+def _ndjson_chunks(rows, dumps):
+    """Her satır ayrı bir JSON satırı"""
+    batch = []
+    for row in rows:
+        batch.append(dumps(row))
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield '\n'.join(batch) + '\n'
+            batch = []
+    if batch:
+        yield '\n'.join(batch) + '\n'
+
+
+def _json_array_chunks(rows, dumps):
+    """Parça parça yazılan tek JSON dizisi"""
+    yield '['
+    first = True
+    batch = []
+    for row in rows:
+        batch.append(dumps(row) if first else ',' + dumps(row))
+        first = False
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield ''.join(batch)
+            batch = []
+    yield ''.join(batch) + ']'
+
+
+def _csv_chunks(rows, columns):
+    """Başlık satırı + satırlar (CSV)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(['' if row[col] is None else row[col] for col in columns])
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def _stream_report(query, filename):
+    """
+    Rapor sorgusunu sunucu taraflı cursor ile okuyup istenen formatta akıtır.
+    Satırlar bellekte toplanmaz; worker belleği rapor boyutundan bağımsızdır.
+    """
+    fmt = request.args.get('format', 'ndjson').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"Gecersiz format: {fmt}. Gecerli formatlar: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    # Sorgu burada çalışır; hata olursa normal 500 yanıtı döner
+    columns, rows = stream_query(query, batch_size=EXPORT_BATCH_SIZE)
+
+    try:
+        # jsonify ile aynı serileştirme (tarih/Decimal); uygulama context'i gerektirmez
+        dumps = current_app.json.dumps
+        if fmt == 'csv':
+            chunks = _csv_chunks(rows, columns)
+        elif fmt == 'json':
+            chunks = _json_array_chunks(rows, dumps)
+        else:
+            chunks = _ndjson_chunks(rows, dumps)
+
+        response = Response(chunks, mimetype=EXPORT_FORMATS[fmt])
+        # İstemci yarıda keserse bağlantı havuza kapatılarak iade edilir
+        response.call_on_close(rows.close)
+    except Exception:
+        # Yanıt oluşmadan hata: stream_query'nin bağlantısı havuza iade edilir
+        rows.close()
+        raise
+    if fmt == 'csv':
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}.csv'
+    return response
+
+
+def _monthly_report_query():
+    """
+    Aylık kazanç raporu sorgusu: önceden toplanmış monthly_revenue_summary
+    tablosu, tablo henüz oluşturulmadıysa aylik_kazanc_raporu view'ı.
+    """
+    global _summary_table_exists
+    if _summary_table_exists is None:
+        result = execute_query("""
+            SELECT COUNT(*) as cnt FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'monthly_revenue_summary'
+        """, fetch=True)
+        _summary_table_exists = bool(result and result[0]['cnt'])
+        # Tablo yoksa bir sonraki istekte tekrar kontrol et
+        if not _summary_table_exists:
+            _summary_table_exists = None
+            return "SELECT * FROM aylik_kazanc_raporu ORDER BY Donem DESC"
+    return MONTHLY_SUMMARY_QUERY
+
 
 @bp.route('/monthly', methods=['GET'])
 @token_required
 @read_required('reports')
 def monthly_report(current_user):
-    """Aylık kazanç raporu (MySQL view: monthly_report_view)"""
+    """Aylık kazanç raporu (monthly_revenue_summary tablosundan)"""
     try:
-        query = "SELECT * FROM aylik_kazanc_raporu ORDER BY Donem DESC"
-        result = execute_query(query, fetch=True)
+        result = execute_query(_monthly_report_query(), fetch=True)
         return jsonify(result), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -31,3 +147,24 @@ def reservation_report(current_user):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+
+@bp.route('/monthly/export', methods=['GET'])
+@token_required
+@read_required('reports')
+def monthly_report_export(current_user):
+    """Aylık kazanç raporu, akış olarak (format: ndjson | json | csv)"""
+    try:
+        return _stream_report(_monthly_report_query(), 'aylik_kazanc_raporu')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/reservations/export', methods=['GET'])
+@token_required
+@read_required('reports')
+def reservation_report_export(current_user):
+    """Detaylı rezervasyon raporu, akış olarak (format: ndjson | json | csv)"""
+    try:
+        return _stream_report("SELECT * FROM detayli_rezervasyon_raporu ORDER BY giris_tarihi DESC", 'detayli_rezervasyon_raporu')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
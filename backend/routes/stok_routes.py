@@ -1,6 +1,13 @@
+from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify
-from database import execute_query
+from database import execute_query, execute_insert
+from pagination import keyset_page, PaginationError
 from models.depo_stok import DepoStok
+from services.stok_service import StokService, StokError
+from services.stok_hareket_service import (
+    StokHareketService, MAX_TUKETIM_GUN,
+    HAREKET_ILK, HAREKET_GIRIS, HAREKET_DUZELTME, HAREKET_SILME
+)
 from auth.jwt_utils import token_required
 from auth.rbac.decorators import read_required, write_required, permission_required
 
@@ -10,21 +17,88 @@ bp = Blueprint('stok', __name__, url_prefix='/api/stock')
 @token_required
 @read_required('depo_stok')
 def get_stock(current_user):
-    """Tum stoklari listele (Korumali)"""
+    """Tum stoklari listele (Korumali, sayfali: limit/after)"""
     try:
-        query = """
-        SELECT urun_id, hizmet_id, urun_adi, stok_adedi, son_guncelleme 
-        FROM depo_stok 
-        ORDER BY urun_adi
-        """
-        result = execute_query(query, fetch=True)
+        page = keyset_page(
+            "SELECT urun_id, hizmet_id, urun_adi, stok_adedi, son_guncelleme FROM depo_stok",
+            order_column='urun_adi', id_column='urun_id',
+            count_query="SELECT COUNT(*) as cnt FROM depo_stok"
+        )
+
+        stock_items = [DepoStok.row_to_dict(row) for row in page.rows]
+
+        return page.jsonify(stock_items), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _gun(name: str, required: bool = True):
+    """Istek parametresini YYYY-MM-DD tarihine cevirir (ValueError: gecersiz/eksik)"""
+    value = request.args.get(name)
+    if not value:
+        if required:
+            raise ValueError(f'{name} alani zorunludur (YYYY-MM-DD)')
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'{name} formati YYYY-MM-DD olmalidir')
+
+@bp.route('/at-date', methods=['GET'])
+@token_required
+@read_required('depo_stok')
+def get_stock_at_date(current_user):
+    """
+    Verilen gunun sonundaki stok adetleri (Korumali)
 
-        stock_items = []
-        for row in result:
-            stock = DepoStok.from_dict(row)
-            stock_items.append(stock.to_dict())
+    tarih: YYYY-MM-DD (zorunlu), urun_id: Opsiyonel
+    En yakin haftalik anlik goruntu + sonrasindaki hareketlerden hesaplanir.
+    """
+    try:
+        try:
+            tarih = _gun('tarih')
+            urun_id = request.args.get('urun_id', type=int)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        sonuc = StokHareketService.tarihteki_stok(tarih, urun_id)
+        if sonuc is None:
+            return jsonify({'error': 'Bu tarih icin stok gecmisi yok (ilk anlik goruntuden once)'}), 404
 
-        return jsonify(stock_items), 200
+        return jsonify({
+            'tarih': tarih.isoformat(),
+            'anlik_goruntu_tarihi': sonuc['anlik_goruntu_tarihi'],
+            'stoklar': sonuc['stoklar']
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/consumption/weekly', methods=['GET'])
+@token_required
+@read_required('depo_stok')
+def get_weekly_consumption(current_user):
+    """
+    Urun basina haftalik tuketim (Korumali)
+
+    baslangic, bitis: YYYY-MM-DD (bitis varsayilan bugun, baslangic varsayilan bitis - 4 hafta)
+    urun_id: Opsiyonel
+    Kapanmis haftalar anlik goruntulerden, acik hafta hareketlerden okunur.
+    """
+    try:
+        try:
+            bitis = _gun('bitis', required=False) or datetime.now().date()
+            baslangic = _gun('baslangic', required=False) or bitis - timedelta(weeks=4)
+            urun_id = request.args.get('urun_id', type=int)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if bitis < baslangic:
+            return jsonify({'error': 'bitis baslangictan once olamaz'}), 400
+        if (bitis - baslangic).days > MAX_TUKETIM_GUN:
+            return jsonify({'error': f'Aralik en fazla {MAX_TUKETIM_GUN} gun olabilir'}), 400
+
+        rows = StokHareketService.haftalik_tuketim(baslangic, bitis, urun_id)
+        return jsonify(rows), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -82,14 +156,10 @@ def create_stock(current_user):
         INSERT INTO depo_stok (hizmet_id, urun_adi, stok_adedi, son_guncelleme)
         VALUES (%s, %s, %s, NOW())
         """
-        execute_query(insert_query, params=(
+        stock.urun_id = execute_insert(insert_query, params=(
             stock.hizmet_id, stock.urun_adi, stock.stok_adedi
-        ), fetch=False)
-
-        # Eklenen stokun ID'sini al
-        last_id_query = "SELECT LAST_INSERT_ID() as id"
-        id_result = execute_query(last_id_query, fetch=True)
-        stock.urun_id = id_result[0]['id']
+        ))
+        StokHareketService.kaydet([(stock.urun_id, int(stock.stok_adedi), HAREKET_ILK)])
 
         return jsonify(stock.to_dict()), 201
     except Exception as e:
@@ -101,8 +171,8 @@ def create_stock(current_user):
 def update_stock(stock_id, current_user):
     """Stok bilgilerini guncelle (Korumali)"""
     try:
-        # Once stok var mi kontrol et
-        check_query = "SELECT urun_id FROM depo_stok WHERE urun_id = %s"
+        # Once stok var mi kontrol et (satir kilitlenir; stok farki deftere yazilir)
+        check_query = "SELECT urun_id, stok_adedi FROM depo_stok WHERE urun_id = %s FOR UPDATE"
         existing = execute_query(check_query, params=(stock_id,), fetch=True)
         if not existing:
             return jsonify({'error': 'Stok bulunamadi'}), 404
@@ -144,6 +214,10 @@ def update_stock(stock_id, current_user):
         update_values.append(stock_id)
 
         execute_query(update_query, params=tuple(update_values), fetch=False)
+        if 'stok_adedi' in data:
+            StokHareketService.kaydet([
+                (stock_id, int(data['stok_adedi']) - existing[0]['stok_adedi'], HAREKET_DUZELTME)
+            ])
 
         # Guncellenmis stoku getir
         select_query = """
@@ -165,14 +239,15 @@ def delete_stock(stock_id, current_user):
     """Stok sil (Korumali)"""
     try:
         # Once stok var mi kontrol et
-        check_query = "SELECT urun_id FROM depo_stok WHERE urun_id = %s"
+        check_query = "SELECT urun_id, stok_adedi FROM depo_stok WHERE urun_id = %s FOR UPDATE"
         existing = execute_query(check_query, params=(stock_id,), fetch=True)
         if not existing:
             return jsonify({'error': 'Stok bulunamadi'}), 404
 
-        # Silme islemi
+        # Silme islemi (kalan stok deftere cikis olarak yazilir)
         delete_query = "DELETE FROM depo_stok WHERE urun_id = %s"
         execute_query(delete_query, params=(stock_id,), fetch=False)
+        StokHareketService.kaydet([(stock_id, -existing[0]['stok_adedi'], HAREKET_SILME)])
 
         return jsonify({'message': 'Stok silindi'}), 200
     except Exception as e:
@@ -208,6 +283,7 @@ def increase_stock(current_user):
         WHERE urun_id = %s
         """
         execute_query(update_query, params=(miktar, urun_id), fetch=False)
+        StokHareketService.kaydet([(urun_id, miktar, HAREKET_GIRIS)])
 
         # Guncellenmis stoku getir
         select_query = """
@@ -239,53 +315,41 @@ def decrease_stock(current_user):
         if not data.get('miktar') or data.get('miktar', 0) <= 0:
             return jsonify({'error': 'miktar alani zorunludur ve 0\'dan buyuk olmalidir'}), 400
 
-        urun_id = data['urun_id']
         miktar = int(data['miktar'])
+        # Kontrol ve dusum tek kosullu UPDATE ile (WHERE stok_adedi >= miktar)
+        row = StokService.azalt(data['urun_id'], miktar)
 
-        # Stok var mi ve yeterli mi kontrol et
-        check_query = "SELECT urun_id, stok_adedi FROM depo_stok WHERE urun_id = %s"
-        existing = execute_query(check_query, params=(urun_id,), fetch=True)
-        if not existing:
-            return jsonify({'error': 'Stok bulunamadi'}), 404
-
-        mevcut_stok = existing[0]['stok_adedi']
-        if mevcut_stok < miktar:
-            return jsonify({
-                'error': f'Yetersiz stok. Mevcut stok: {mevcut_stok}, Istenen: {miktar}'
-            }), 400
-
-        # Stok azalt
-        update_query = """
-        UPDATE depo_stok 
-        SET stok_adedi = stok_adedi - %s, son_guncelleme = NOW() 
-        WHERE urun_id = %s
-        """
-        execute_query(update_query, params=(miktar, urun_id), fetch=False)
+        return jsonify({
+            'message': f'Stok {miktar} adet azaltildi',
+            'stok': DepoStok.row_to_dict(row)
+        }), 200
+    except StokError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
 
-        # Guncellenmis stoku getir
-        select_query = """
-        SELECT urun_id, hizmet_id, urun_adi, stok_adedi, son_guncelleme 
-        FROM depo_stok 
-        WHERE urun_id = %s
-        """
-        result = execute_query(select_query, params=(urun_id,), fetch=True)
-        stock = DepoStok.from_dict(result[0])
+@bp.route('/decrease/batch', methods=['POST'])
+@token_required
+@permission_required('depo_stok_amount_update')
+def decrease_stock_batch(current_user):
+    """
+    Birden fazla urunun stogunu tek transaction'da azalt (Korumali)
 
-        # Stok 0'in altina dustu mu kontrol et (double check)
-        if stock.stok_adedi < 0:
-            # Geri al
-            rollback_query = """
-            UPDATE depo_stok 
-            SET stok_adedi = stok_adedi + %s, son_guncelleme = NOW() 
-            WHERE urun_id = %s
-            """
-            execute_query(rollback_query, params=(miktar, urun_id), fetch=False)
-            return jsonify({'error': 'Stok 0\'in altina dusemez'}), 400
+    Body: {"kalemler": [{"urun_id": 1, "miktar": 2}, ...]}
+    Hep-ya-hic: herhangi bir urun yoksa veya stogu yetersizse hicbir stok degismez.
+    """
+    try:
+        data = request.get_json() or {}
+        rows = StokService.toplu_azalt(data.get('kalemler'))
 
         return jsonify({
-            'message': f'Stok {miktar} adet azaltildi',
-            'stok': stock.to_dict()
+            'message': f'{len(rows)} urunun stogu azaltildi',
+            'stoklar': [DepoStok.row_to_dict(row) for row in rows]
         }), 200
+    except StokError as e:
+        response = {'error': str(e)}
+        if e.detay:
+            response.update(e.detay)
+        return jsonify(response), e.status_code
     except Exception as e:
         return jsonify({'error': str(e)}), 400
-
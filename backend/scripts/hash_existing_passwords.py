@@ -1,77 +1,177 @@
 """
 Mevcut veritabanındaki şifreleri hashlemek için utility script.
 
-NOT: Bu script sadece bir kez çalıştırılmalıdır.
-Mevcut düz metin şifreleri bcrypt ile hashler.
+Mevcut düz metin şifreleri bcrypt ile hashler. Satırlar personel_id'ye
+göre keyset ile parça (chunk) parça okunur; her parça hashlenmeden önce
+tamamen belleğe alındığı için hashleme sürerken açık cursor kalmaz
+(yavaş makinede net_write_timeout ile bağlantı kopmaz). Parça tüm
+çekirdeklerde paralel hashlenir ve tek bir UPDATE ... CASE ifadesiyle
+yazılır (PyMySQL UPDATE için executemany'yi satır başına ayrı ifadeye böler).
+
+Her parça commit edildikten sonra son personel_id checkpoint dosyasına
+yazılır; script yarıda kesilirse tekrar çalıştırıldığında kaldığı yerden
+devam eder. Zaten hashlenmiş şifreler atlandığı için tekrar çalıştırmak
+güvenlidir.
+
+Kullanım:
+    python scripts/hash_existing_passwords.py [--batch-size 500] [--workers N]
+                                              [--checkpoint DOSYA] [--reset]
 """
 
 import sys
 import os
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 # Proje kök dizinini path'e ekle
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database import execute_query, init_database
+from database import init_database, execute_query, close_connection
 from auth.password_utils import hash_password
 
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  '.hash_existing_passwords.checkpoint')
 
-def hash_all_passwords():
+SELECT_QUERY = """
+    SELECT personel_id, kullanici_adi, sifre
+    FROM personel
+    WHERE personel_id > %s
+    ORDER BY personel_id
+    LIMIT %s
+"""
+
+
+def is_hashed(sifre):
+    """bcrypt hash'leri $2a$, $2b$ veya $2y$ ile başlar"""
+    return sifre.startswith('$2')
+
+
+def read_checkpoint(path):
+    """Son işlenen personel_id (yoksa 0)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path, personel_id):
+    """Checkpoint'i atomik olarak yazar (yarım dosya kalmaz)"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(str(personel_id))
+    os.replace(tmp_path, path)
+
+
+def iter_chunks(start_id, batch_size):
+    """personel_id > start_id satırlarını batch_size'lık, tamamen okunmuş listeler halinde verir"""
+    last_id = start_id
+    while True:
+        chunk = execute_query(SELECT_QUERY, params=(last_id, batch_size), fetch=True)
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]['personel_id']
+
+
+def write_chunk(updates):
+    """
+    Bir parçanın güncellemelerini tek UPDATE ifadesiyle yazar.
+
+    Args:
+        updates: [(yeni_hash, personel_id, eski_sifre), ...]
+
+    Returns:
+        int: Güncellenen satır sayısı
+    """
+    when = ' '.join(['WHEN %s THEN %s'] * len(updates))
+    placeholders = ', '.join(['%s'] * len(updates))
+    yeni_params = [v for hashed, pid, _ in updates for v in (pid, hashed)]
+    eski_params = [v for _, pid, eski in updates for v in (pid, eski)]
+    # Eski şifre koşulu: arada şifresi değiştirilen personelin üzerine yazılmaz
+    return execute_query(
+        f"UPDATE personel SET sifre = CASE personel_id {when} END"
+        f" WHERE personel_id IN ({placeholders}) AND sifre = CASE personel_id {when} END",
+        params=tuple(yeni_params + [pid for _, pid, _ in updates] + eski_params),
+        fetch=False
+    )
+
+
+def hash_all_passwords(batch_size=500, workers=None, checkpoint=DEFAULT_CHECKPOINT):
     """Tüm personel şifrelerini hashler"""
     # Veritabanı bağlantısını başlat
     init_database()
-    # Tüm personeli al
-    query = "SELECT personel_id, kullanici_adi, sifre FROM personel"
-    personel_list = execute_query(query, fetch=True)
-
-    if not personel_list:
-        print("Personel bulunamadı.")
-        return
 
-    print(f"Toplam {len(personel_list)} personel bulundu.")
+    start_id = read_checkpoint(checkpoint)
+    if start_id:
+        print(f"Checkpoint bulundu, personel_id > {start_id} satırlarından devam ediliyor.")
 
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    scanned_count = 0
     updated_count = 0
 
-    for personel in personel_list:
-        # Şifre zaten hashlenmiş mi kontrol et (bcrypt hash'leri $2a$, $2b$ veya $2y$ ile başlar)
-        if not personel['sifre'].startswith('$2'):
-            print(f"Şifre hashleniyor: {personel['kullanici_adi']}")
-            hashed_password = hash_password(personel['sifre'])
-
-            # Şifreyi güncelle
-            update_query = "UPDATE personel SET sifre = %s WHERE personel_id = %s"
-            execute_query(update_query, (hashed_password, personel['personel_id']), fetch=False)
-            updated_count += 1
-        else:
-            print(f"Şifre zaten hashlenmiş: {personel['kullanici_adi']}")
-
-    if updated_count > 0:
-        print(f"\n{updated_count} personelin şifresi başarıyla hashlenmiştir.")
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in iter_chunks(start_id, batch_size):
+                scanned_count += len(chunk)
+                pending = [p for p in chunk if p['sifre'] and not is_hashed(p['sifre'])]
+
+                if pending:
+                    hashes = executor.map(hash_password, [p['sifre'] for p in pending],
+                                          chunksize=max(1, len(pending) // (4 * workers)))
+                    updates = [(hashed, p['personel_id'], p['sifre'])
+                               for p, hashed in zip(pending, hashes)]
+                    updated_count += write_chunk(updates)
+
+                write_checkpoint(checkpoint, chunk[-1]['personel_id'])
+                print(f"  {scanned_count} personel tarandı, {updated_count} şifre hashlendi "
+                      f"(son personel_id={chunk[-1]['personel_id']})")
+    finally:
+        close_connection()
+
+    elapsed = time.perf_counter() - started
+    if scanned_count == 0:
+        print("Personel bulunamadı.")
+    elif updated_count > 0:
+        print(f"\n{updated_count} personelin şifresi başarıyla hashlenmiştir ({elapsed:.1f} sn).")
     else:
         print("\nHashlenecek şifre bulunamadı.")
 
+    # Tüm tablo işlendi; sonraki çalıştırma baştan başlasın
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Düz metin personel şifrelerini bcrypt ile hashler")
+    parser.add_argument('--batch-size', type=int, default=500,
+                        help="Parça başına satır sayısı (varsayılan: 500)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Hashleme process sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT,
+                        help="Checkpoint dosyası yolu")
+    parser.add_argument('--reset', action='store_true',
+                        help="Checkpoint'i yok sayıp baştan başla")
+    return parser.parse_args()
+
 
 if __name__ == '__main__':
+    args = parse_args()
+
     print("=" * 50)
     print("Personel Şifre Hashleme Script'i")
     print("=" * 50)
 
+    if args.reset and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
     try:
-        hash_all_passwords()
+        hash_all_passwords(batch_size=args.batch_size, workers=args.workers,
+                           checkpoint=args.checkpoint)
         print("\nİşlem tamamlandı!")
     except Exception as e:
         print(f"\nHATA: {str(e)}")
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+        print("Script tekrar çalıştırıldığında checkpoint'ten devam edecektir.")
+        sys.exit(1)
@@ -0,0 +1,31 @@
+"""
+Aylık gelir özet tablosunu (monthly_revenue_summary) oluşturur ve tüm
+ödemelerden yeniden hesaplar.
+
+İlk kurulumda (backfill) ve özet ile ödemeler arasında fark şüphesi olduğunda
+çalıştırılır. Tekrar çalıştırmak güvenlidir.
+"""
+
+import sys
+import os
+
+# Proje kök dizinini path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import init_database
+from services.gelir_ozeti_service import GelirOzetiService
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("Aylık Gelir Özeti Yeniden Hesaplama")
+    print("=" * 50)
+
+    try:
+        init_database()
+        satir_sayisi = GelirOzetiService.rebuild()
+        print(f"\n{satir_sayisi} özet satırı (dönem, ödeme türü) yazıldı.")
+        print("\nİşlem tamamlandı!")
+    except Exception as e:
+        print(f"\nHata: {str(e)}")
+        sys.exit(1)
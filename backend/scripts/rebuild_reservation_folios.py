@@ -0,0 +1,32 @@
+"""
+Rezervasyon folyo tablosunu (rezervasyon_folyo) oluşturur ve tüm
+rezervasyonlardan yeniden hesaplar.
+
+İlk kurulumda (backfill), musteri_harcamalari'na uygulama dışından yazıldıktan
+sonra ve folyo ile ödemeler arasında fark şüphesi olduğunda çalıştırılır.
+Tekrar çalıştırmak güvenlidir.
+"""
+
+import sys
+import os
+
+# Proje kök dizinini path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import init_database
+from services.folyo_service import FolyoService
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("Rezervasyon Folyoları Yeniden Hesaplama")
+    print("=" * 50)
+
+    try:
+        init_database()
+        satir_sayisi = FolyoService.rebuild()
+        print(f"\n{satir_sayisi} rezervasyon folyosu yazıldı.")
+        print("\nİşlem tamamlandı!")
+    except Exception as e:
+        print(f"\nHata: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,34 @@
+"""
+Stok hareket defteri tablolarını (stok_hareketleri, stok_anlik_goruntuleri)
+oluşturur ve kapanmış her hafta (pazartesi 00:00 sınırı) için stok anlık
+görüntüsü yazar.
+
+İlk çalıştırmada güncel stoklardan başlangıç görüntüsü alınır; stok geçmişi
+bu andan itibaren sorgulanabilir. Sonrasında haftada bir (ör. pazartesi
+sabahı cron ile) çalıştırılır; kaçırılan haftalar sonraki çalıştırmada
+tamamlanır. Tekrar çalıştırmak güvenlidir.
+"""
+
+import sys
+import os
+
+# Proje kök dizinini path'e ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import init_database
+from services.stok_hareket_service import StokHareketService
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("Stok Anlık Görüntüsü")
+    print("=" * 50)
+
+    try:
+        init_database()
+        satir_sayisi = StokHareketService.anlik_goruntu_al()
+        print(f"\n{satir_sayisi} görüntü satırı (ürün, hafta) yazıldı.")
+        print("\nİşlem tamamlandı!")
+    except Exception as e:
+        print(f"\nHata: {str(e)}")
+        sys.exit(1)
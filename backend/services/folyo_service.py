@@ -0,0 +1,206 @@
+"""
+Folyo servisi - rezervasyon_folyo tablosunu güncel tutar
+
+Her rezervasyonun oda ücreti, ekstra harcama toplamı, ödenen toplam ve
+bakiyesi bu tabloda tek satırda tutulur. Ödeme ve rezervasyon yazan işlemler
+ilgili rezervasyonun satırını aynı transaction içinde yeniden hesaplar
+(yalnızca o rezervasyonun ödeme/harcama satırları toplanır). Böylece kalan
+tutar her istekte ödemeler toplanarak hesaplanmaz ve açık bakiyeli
+rezervasyonlar (check-out, gece denetimi) indeksten okunur. Tam yeniden
+hesaplama için scripts/rebuild_reservation_folios.py kullanılır.
+"""
+
+import logging
+from datetime import date
+from typing import Any, Dict, Optional
+
+import pymysql
+from database import execute_query, get_db_connection
+from models.rezervasyon import Rezervasyon
+from pagination import keyset_page, Page
+
+# MySQL "Table doesn't exist" hata kodu
+ER_NO_SUCH_TABLE = 1146
+
+# Açık bakiye: kalan tutar var ve rezervasyon iptal edilmemiş (ENUM değeriyle birebir)
+_ACIK_BAKIYE_IFADE = (
+    "oda_ucreti + ekstra_toplam - odenen_toplam > 0"
+    f" AND rezervasyon_durumu <> '{Rezervasyon.DURUM_IPTAL}'"
+)
+
+CREATE_TABLE_QUERY = f"""
+CREATE TABLE IF NOT EXISTS rezervasyon_folyo (
+    rezervasyon_id INT NOT NULL,
+    musteri_id INT NOT NULL,
+    cikis_tarihi DATE NOT NULL,
+    rezervasyon_durumu VARCHAR(50) NOT NULL,
+    oda_ucreti DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    ekstra_toplam DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    odenen_toplam DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    odeme_sayisi INT NOT NULL DEFAULT 0,
+    bakiye DECIMAL(12, 2) AS (oda_ucreti + ekstra_toplam - odenen_toplam) STORED,
+    acik_bakiye TINYINT(1) AS ({_ACIK_BAKIYE_IFADE}) STORED,
+    guncelleme_tarihi TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (rezervasyon_id),
+    KEY idx_folyo_acik_cikis (acik_bakiye, cikis_tarihi, rezervasyon_id)
+)
+"""
+
+# Eski ifadeyle ('iptal') oluşturulmuş tabloları düzeltir
+_ACIK_BAKIYE_DUZELT_QUERY = f"""
+ALTER TABLE rezervasyon_folyo
+MODIFY COLUMN acik_bakiye TINYINT(1) AS ({_ACIK_BAKIYE_IFADE}) STORED
+"""
+
+# Rezervasyonun folyo satırını kaynak tablolardan hesaplayan SELECT
+_FOLYO_SELECT = """
+    SELECT r.rezervasyon_id, r.musteri_id, r.cikis_tarihi, r.rezervasyon_durumu,
+           COALESCE(r.toplam_ucret, 0),
+           (SELECT COALESCE(SUM(mh.toplam_fiyat), 0) FROM musteri_harcamalari mh
+            WHERE mh.rezervasyon_id = r.rezervasyon_id),
+           (SELECT COALESCE(SUM(o.odenen_tutar), 0) FROM odemeler o
+            WHERE o.rezervasyon_id = r.rezervasyon_id),
+           (SELECT COUNT(*) FROM odemeler o WHERE o.rezervasyon_id = r.rezervasyon_id)
+    FROM rezervasyonlar r
+"""
+
+_FOLYO_INSERT = """
+    INSERT INTO rezervasyon_folyo
+    (rezervasyon_id, musteri_id, cikis_tarihi, rezervasyon_durumu,
+     oda_ucreti, ekstra_toplam, odenen_toplam, odeme_sayisi)
+"""
+
+SELECT_QUERY = """
+    SELECT rezervasyon_id, musteri_id, cikis_tarihi, rezervasyon_durumu, oda_ucreti,
+           ekstra_toplam, odenen_toplam, odeme_sayisi, bakiye
+    FROM rezervasyon_folyo
+"""
+
+
+class FolyoService:
+    """Rezervasyon folyo tablosu işlemleri"""
+
+    _tablo_yok_uyarildi = False
+
+    @staticmethod
+    def _tablo_yok(e: pymysql.err.ProgrammingError) -> bool:
+        """Hata tablonun olmamasından kaynaklanıyorsa bir kez uyarır ve True döndürür"""
+        if not (e.args and e.args[0] == ER_NO_SUCH_TABLE):
+            return False
+        if not FolyoService._tablo_yok_uyarildi:
+            FolyoService._tablo_yok_uyarildi = True
+            logging.warning("rezervasyon_folyo tablosu yok; "
+                            "scripts/rebuild_reservation_folios.py çalıştırılmalı")
+        return True
+
+    @staticmethod
+    def yenile(rezervasyon_id: int, cursor=None):
+        """
+        Rezervasyonun folyo satırını yeniden hesaplar; rezervasyon yoksa satırı siler.
+
+        Ödeme/rezervasyon INSERT/UPDATE/DELETE sonrası, aynı transaction içinde
+        çağrılır. Rezervasyon servisindeki gibi açık bir transaction'ın
+        cursor'ı verilirse sorgular onun üzerinden çalışır.
+
+        Args:
+            rezervasyon_id: Rezervasyon ID'si
+            cursor: Kullanılacak cursor (verilmezse execute_query)
+        """
+        sorgular = (
+            (_FOLYO_INSERT + _FOLYO_SELECT + """
+                WHERE r.rezervasyon_id = %s
+                ON DUPLICATE KEY UPDATE
+                    musteri_id = VALUES(musteri_id),
+                    cikis_tarihi = VALUES(cikis_tarihi),
+                    rezervasyon_durumu = VALUES(rezervasyon_durumu),
+                    oda_ucreti = VALUES(oda_ucreti),
+                    ekstra_toplam = VALUES(ekstra_toplam),
+                    odenen_toplam = VALUES(odenen_toplam),
+                    odeme_sayisi = VALUES(odeme_sayisi)
+            """, (rezervasyon_id,)),
+            ("""
+                DELETE f FROM rezervasyon_folyo f
+                LEFT JOIN rezervasyonlar r ON r.rezervasyon_id = f.rezervasyon_id
+                WHERE f.rezervasyon_id = %s AND r.rezervasyon_id IS NULL
+            """, (rezervasyon_id,)),
+        )
+        try:
+            for query, params in sorgular:
+                if cursor is not None:
+                    cursor.execute(query, params)
+                else:
+                    execute_query(query, params=params, fetch=False)
+        except pymysql.err.ProgrammingError as e:
+            # Tablo henüz oluşturulmadıysa ödeme/rezervasyon işlemini engelleme
+            if not FolyoService._tablo_yok(e):
+                raise
+
+    @staticmethod
+    def get(rezervasyon_id: int) -> Optional[Dict[str, Any]]:
+        """Rezervasyonun folyo satırı; satır veya tablo yoksa None"""
+        try:
+            rows = execute_query(SELECT_QUERY + " WHERE rezervasyon_id = %s",
+                                 params=(rezervasyon_id,), fetch=True)
+        except pymysql.err.ProgrammingError as e:
+            if FolyoService._tablo_yok(e):
+                return None
+            raise
+        return FolyoService.row_to_dict(rows[0]) if rows else None
+
+    @staticmethod
+    def acik_bakiyeler(cikis_tarihi: Optional[date] = None) -> Page:
+        """
+        Bakiyesi kapanmamış (iptal edilmemiş) rezervasyonların bir sayfası,
+        çıkış tarihine göre sıralı (limit/after/include_total parametreleri
+        pagination.keyset_page tarafından okunur).
+
+        Args:
+            cikis_tarihi: Verilirse yalnızca bu tarihte veya öncesinde çıkışı olanlar
+
+        Raises:
+            PaginationError: Geçersiz limit/after
+        """
+        where = "acik_bakiye = 1"
+        params = ()
+        if cikis_tarihi:
+            where += " AND cikis_tarihi <= %s"
+            params = (cikis_tarihi,)
+        return keyset_page(
+            SELECT_QUERY,
+            order_column='cikis_tarihi', id_column='rezervasyon_id',
+            where=where, params=params,
+            count_query="SELECT COUNT(*) as cnt FROM rezervasyon_folyo WHERE " + where
+        )
+
+    @staticmethod
+    def row_to_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Folyo satırını JSON'a uygun sözlüğe çevirir"""
+        return {
+            'rezervasyon_id': row['rezervasyon_id'],
+            'musteri_id': row['musteri_id'],
+            'cikis_tarihi': row['cikis_tarihi'].isoformat() if row.get('cikis_tarihi') else None,
+            'rezervasyon_durumu': row['rezervasyon_durumu'],
+            'oda_ucreti': float(row['oda_ucreti']),
+            'ekstra_toplam': float(row['ekstra_toplam']),
+            'odenen_toplam': float(row['odenen_toplam']),
+            'odeme_sayisi': row['odeme_sayisi'],
+            'bakiye': float(row['bakiye']),
+        }
+
+    @staticmethod
+    def rebuild() -> int:
+        """
+        Folyo tablosunu oluşturur (yoksa) ve tüm rezervasyonlardan yeniden hesaplar.
+
+        Silme ve doldurma tek transaction'da yapılır; okuyanlar yarım tablo görmez.
+
+        Returns:
+            int: Folyo satır sayısı
+        """
+        execute_query(CREATE_TABLE_QUERY, fetch=False)
+        execute_query(_ACIK_BAKIYE_DUZELT_QUERY, fetch=False)
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM rezervasyon_folyo")
+                cursor.execute(_FOLYO_INSERT + _FOLYO_SELECT)
+                return cursor.rowcount
@@ -0,0 +1,99 @@
+"""
+Gelir özeti servisi - monthly_revenue_summary tablosunu güncel tutar
+
+Aylık kazanç raporu her istekte tüm ödemeler üzerinden hesaplanmak yerine
+(dönem, ödeme türü) bazında önceden toplanmış bu tablodan okunur. Ödeme
+create/update/delete işlemleri aynı transaction içinde tabloya fark (delta)
+uygular; tam yeniden hesaplama için scripts/rebuild_monthly_revenue_summary.py
+kullanılır.
+"""
+
+import logging
+import pymysql
+from database import execute_query, get_db_connection
+
+# MySQL "Table doesn't exist" hata kodu
+ER_NO_SUCH_TABLE = 1146
+
+CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS monthly_revenue_summary (
+    donem CHAR(7) NOT NULL,
+    odeme_turu VARCHAR(50) NOT NULL,
+    toplam_kazanc DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    islem_sayisi INT NOT NULL DEFAULT 0,
+    guncelleme_tarihi TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (donem, odeme_turu)
+)
+"""
+
+
+class GelirOzetiService:
+    """Aylık gelir özeti tablosu işlemleri"""
+
+    _tablo_yok_uyarildi = False
+
+    @staticmethod
+    def _delta_uygula(odeme_id: int, isaret: int):
+        """Ödemenin tutarını/adedini özet satırına ekler (+1) veya çıkarır (-1)"""
+        try:
+            execute_query("""
+                INSERT INTO monthly_revenue_summary (donem, odeme_turu, toplam_kazanc, islem_sayisi)
+                SELECT DATE_FORMAT(odeme_tarihi, '%%Y-%%m'), odeme_turu, %s * odenen_tutar, %s
+                FROM odemeler
+                WHERE odeme_id = %s AND odeme_tarihi IS NOT NULL
+                ON DUPLICATE KEY UPDATE
+                    toplam_kazanc = toplam_kazanc + VALUES(toplam_kazanc),
+                    islem_sayisi = islem_sayisi + VALUES(islem_sayisi)
+            """, params=(isaret, isaret, odeme_id), fetch=False)
+            if isaret < 0:
+                # Yalnızca bu ödemenin (dönem, tür) satırı; tüm tabloyu taramak
+                # eşzamanlı ödeme yazımlarını next-key kilitleriyle sıraya sokar
+                execute_query("""
+                    DELETE s FROM monthly_revenue_summary s
+                    JOIN odemeler o
+                      ON s.donem = DATE_FORMAT(o.odeme_tarihi, '%%Y-%%m') AND s.odeme_turu = o.odeme_turu
+                    WHERE o.odeme_id = %s AND s.islem_sayisi <= 0
+                """, params=(odeme_id,), fetch=False)
+        except pymysql.err.ProgrammingError as e:
+            # Tablo henüz oluşturulmadıysa ödeme işlemini engelleme
+            if e.args and e.args[0] == ER_NO_SUCH_TABLE:
+                if not GelirOzetiService._tablo_yok_uyarildi:
+                    GelirOzetiService._tablo_yok_uyarildi = True
+                    logging.warning("monthly_revenue_summary tablosu yok; "
+                                    "scripts/rebuild_monthly_revenue_summary.py çalıştırılmalı")
+                return
+            raise
+
+    @staticmethod
+    def odeme_eklendi(odeme_id: int):
+        """Yeni (veya güncellenmiş) ödemeyi özete ekler. INSERT/UPDATE sonrası çağrılır."""
+        GelirOzetiService._delta_uygula(odeme_id, 1)
+
+    @staticmethod
+    def odeme_cikarilacak(odeme_id: int):
+        """Ödemeyi özetten çıkarır. UPDATE/DELETE öncesi çağrılır."""
+        GelirOzetiService._delta_uygula(odeme_id, -1)
+
+    @staticmethod
+    def rebuild() -> int:
+        """
+        Özet tablosunu oluşturur (yoksa) ve tüm ödemelerden yeniden hesaplar.
+
+        Silme ve doldurma tek transaction'da yapılır; rapor okuyanlar yarım
+        tablo görmez.
+
+        Returns:
+            int: Özet satır sayısı
+        """
+        execute_query(CREATE_TABLE_QUERY, fetch=False)
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM monthly_revenue_summary")
+                cursor.execute("""
+                    INSERT INTO monthly_revenue_summary (donem, odeme_turu, toplam_kazanc, islem_sayisi)
+                    SELECT DATE_FORMAT(odeme_tarihi, '%Y-%m'), odeme_turu, SUM(odenen_tutar), COUNT(*)
+                    FROM odemeler
+                    WHERE odeme_tarihi IS NOT NULL
+                    GROUP BY DATE_FORMAT(odeme_tarihi, '%Y-%m'), odeme_turu
+                """)
+                return cursor.rowcount
@@ -0,0 +1,289 @@
+"""
+Müsaitlik servisi - bellek içi oda müsaitlik indeksi
+
+Aktif/bekleyen rezervasyonlar oda bazında giriş tarihine göre sıralı
+dizilerde tutulur. Her oda için çıkış tarihlerinin önek maksimumu da
+saklandığından "oda X [a, b) aralığında boş mu?" sorusu tek bir bisect ile
+O(log n) sürede, MySQL'e gitmeden cevaplanır. Artımlı ekleme/çıkarmada
+önek maksimumu yalnızca değişen konumdan, değeri değişmeyen ilk konuma kadar
+onarılır.
+
+İndeks ilk kullanımda (veya uygulama açılışında) veritabanından kurulur,
+rezervasyon create/update/delete işlemlerinde commit sonrası artımlı olarak
+güncellenir ve başka süreçlerin yaptığı değişiklikleri yakalamak için
+MUSAITLIK_INDEX_MAX_AGE saniyede bir yeniden kurulur.
+"""
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from database import execute_query, on_commit
+
+# İndeksin en fazla kaç saniyede bir veritabanından yeniden kurulacağı (0: kapalı)
+MUSAITLIK_INDEX_MAX_AGE = float(os.getenv('MUSAITLIK_INDEX_MAX_AGE', '300'))
+
+# Odayı meşgul sayan rezervasyon durumları (küçük harf)
+AKTIF_DURUMLAR = ('aktif', 'bekliyor')
+
+
+class _OdaAraliklari:
+    """Bir odanın rezervasyon aralıkları (giriş tarihine göre sıralı)"""
+
+    __slots__ = ('araliklar', 'girisler', 'max_cikis')
+
+    def __init__(self):
+        self.araliklar: List[Tuple[date, date, int]] = []
+        self.girisler: List[date] = []
+        self.max_cikis: List[date] = []
+
+    def _yeniden_hesapla(self):
+        self.girisler = [a[0] for a in self.araliklar]
+        self.max_cikis = []
+        en_buyuk = None
+        for _, cikis, _ in self.araliklar:
+            if en_buyuk is None or cikis > en_buyuk:
+                en_buyuk = cikis
+            self.max_cikis.append(en_buyuk)
+
+    def _onek_onar(self, i: int):
+        # i'den itibaren önek maksimumunu, değeri değişmeyen ilk konuma kadar düzeltir
+        en_buyuk = self.max_cikis[i - 1] if i > 0 else None
+        for j in range(i, len(self.araliklar)):
+            cikis = self.araliklar[j][1]
+            if en_buyuk is None or cikis > en_buyuk:
+                en_buyuk = cikis
+            if self.max_cikis[j] == en_buyuk:
+                break
+            self.max_cikis[j] = en_buyuk
+
+    def ekle(self, giris: date, cikis: date, rezervasyon_id: int):
+        aralik = (giris, cikis, rezervasyon_id)
+        i = bisect_left(self.araliklar, aralik)
+        self.araliklar.insert(i, aralik)
+        self.girisler.insert(i, giris)
+        # Yer tutucu; _onek_onar gerçek değeri yazar
+        self.max_cikis.insert(i, None)
+        self._onek_onar(i)
+
+    def cikar(self, giris: date, cikis: date, rezervasyon_id: int):
+        i = bisect_left(self.araliklar, (giris, cikis, rezervasyon_id))
+        if i < len(self.araliklar) and self.araliklar[i][2] == rezervasyon_id:
+            del self.araliklar[i]
+            del self.girisler[i]
+            del self.max_cikis[i]
+            self._onek_onar(i)
+
+    def bos_mu(self, giris: date, cikis: date,
+               haric: Optional[Tuple[date, date, int]] = None) -> bool:
+        # Girişi 'cikis'ten önce olan aralıklar [0, i) — bunlardan çıkışı
+        # 'giris'ten sonra olan varsa çakışma vardır
+        i = bisect_left(self.girisler, cikis)
+        if i == 0 or self.max_cikis[i - 1] <= giris:
+            return True
+        if haric is None:
+            return False
+        k = bisect_left(self.araliklar, haric)
+        if k >= i or self.araliklar[k] != haric:
+            return False
+        # Hariç tutulan aralıktan öncekiler önek maksimumuyla O(1); yalnızca
+        # onunla sorgu sonu arasında başlayan aralıklar taranır
+        if k > 0 and self.max_cikis[k - 1] > giris:
+            return False
+        return not any(self.araliklar[j][1] > giris for j in range(k + 1, i))
+
+
+class MusaitlikIndeksi:
+    """Oda müsaitlik indeksi (thread-safe)"""
+
+    def __init__(self, max_age: float = MUSAITLIK_INDEX_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._kurulum_lock = threading.Lock()
+        self._odalar: Dict[int, _OdaAraliklari] = {}
+        self._rezervasyonlar: Dict[int, Tuple[int, date, date]] = {}
+        self._oda_idleri: Set[int] = set()
+        self._kuruldu = 0.0
+        self._gecersiz = True
+        # Kurulum sürerken gelen değişiklikler (snapshot üzerine tekrar uygulanır)
+        self._bekleyen: Optional[List[Callable[[], None]]] = None
+
+    # --- Kurulum -------------------------------------------------------
+
+    def _kurulum_gerekli(self) -> bool:
+        with self._lock:
+            eski = self.max_age > 0 and time.monotonic() - self._kuruldu > self.max_age
+            return self._gecersiz or eski
+
+    def _kur(self):
+        with self._lock:
+            self._bekleyen = []
+        try:
+            odalar = execute_query("SELECT oda_id FROM odalar", fetch=True) or []
+            rezervasyonlar = execute_query("""
+                SELECT rezervasyon_id, oda_id, giris_tarihi, cikis_tarihi
+                FROM rezervasyonlar
+                WHERE rezervasyon_durumu IN ('aktif', 'bekliyor')
+            """, fetch=True) or []
+        except Exception:
+            with self._lock:
+                self._bekleyen = None
+            raise
+
+        with self._lock:
+            self._odalar = {}
+            self._rezervasyonlar = {}
+            self._oda_idleri = {row['oda_id'] for row in odalar}
+            for row in rezervasyonlar:
+                self._rezervasyonlar[row['rezervasyon_id']] = (row['oda_id'], row['giris_tarihi'], row['cikis_tarihi'])
+                oda = self._odalar.setdefault(row['oda_id'], _OdaAraliklari())
+                oda.araliklar.append((row['giris_tarihi'], row['cikis_tarihi'], row['rezervasyon_id']))
+            for oda in self._odalar.values():
+                oda.araliklar.sort()
+                oda._yeniden_hesapla()
+            # Sorgu sürerken commit edilen değişiklikler idempotent olduğundan tekrar uygulanır
+            for islem in self._bekleyen:
+                islem()
+            self._bekleyen = None
+            self._kuruldu = time.monotonic()
+            self._gecersiz = False
+        logging.info(f"Müsaitlik indeksi kuruldu: {len(self._rezervasyonlar)} rezervasyon")
+
+    def rebuild(self):
+        """İndeksi veritabanından yeniden kurar"""
+        with self._kurulum_lock:
+            self._kur()
+
+    def invalidate(self):
+        """İndeksi bir sonraki sorguda yeniden kurulmak üzere işaretler"""
+        with self._lock:
+            self._gecersiz = True
+
+    def _hazirla(self):
+        if not self._kurulum_gerekli():
+            return
+        with self._kurulum_lock:
+            # Başka bir thread bizi beklerken kurmuş olabilir
+            if self._kurulum_gerekli():
+                self._kur()
+
+    # --- Sorgular ------------------------------------------------------
+
+    def oda_bos_mu(self, oda_id: int, giris: date, cikis: date,
+                   exclude_id: Optional[int] = None) -> bool:
+        """Oda [giris, cikis) aralığında aktif/bekleyen rezervasyonsuz mu?"""
+        self._hazirla()
+        with self._lock:
+            oda = self._odalar.get(oda_id)
+            if oda is None:
+                return True
+            kayit = self._rezervasyonlar.get(exclude_id) if exclude_id is not None else None
+            haric = (kayit[1], kayit[2], exclude_id) if kayit and kayit[0] == oda_id else None
+            return oda.bos_mu(giris, cikis, haric)
+
+    def bos_odalar(self, giris: date, cikis: date,
+                   oda_idleri: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        [giris, cikis) aralığında boş olan odaların ID'lerini döndürür.
+
+        Args:
+            giris: Giriş tarihi
+            cikis: Çıkış tarihi
+            oda_idleri: Yalnızca bu odalar arasında ara (varsayılan: tüm odalar)
+        """
+        self._hazirla()
+        with self._lock:
+            adaylar = self._oda_idleri if oda_idleri is None else oda_idleri
+            sonuc = []
+            for oda_id in adaylar:
+                oda = self._odalar.get(oda_id)
+                if oda is None or oda.bos_mu(giris, cikis):
+                    sonuc.append(oda_id)
+            return sorted(sonuc)
+
+    # --- Artımlı güncelleme ---------------------------------------------
+
+    def _ekle(self, rezervasyon_id: int, oda_id: int, giris: date, cikis: date):
+        self._rezervasyonlar[rezervasyon_id] = (oda_id, giris, cikis)
+        self._odalar.setdefault(oda_id, _OdaAraliklari()).ekle(giris, cikis, rezervasyon_id)
+
+    def _cikar(self, rezervasyon_id: int):
+        kayit = self._rezervasyonlar.pop(rezervasyon_id, None)
+        if kayit is None:
+            return
+        oda_id, giris, cikis = kayit
+        oda = self._odalar.get(oda_id)
+        if oda is not None:
+            oda.cikar(giris, cikis, rezervasyon_id)
+            if not oda.araliklar:
+                del self._odalar[oda_id]
+
+    def _degistir(self, islem: Callable[[], None]):
+        with self._lock:
+            islem()
+            if self._bekleyen is not None:
+                self._bekleyen.append(islem)
+
+    def rezervasyon_kaydet(self, rezervasyon_id: int, oda_id: int, giris: date,
+                           cikis: date, durum: str):
+        """Rezervasyonu indekse yazar; aktif/bekleyen değilse indeksten çıkarır"""
+        def islem():
+            self._cikar(rezervasyon_id)
+            if durum and durum.lower() in AKTIF_DURUMLAR:
+                self._ekle(rezervasyon_id, oda_id, giris, cikis)
+        self._degistir(islem)
+
+    def rezervasyon_sil(self, rezervasyon_id: int):
+        """Rezervasyonu indeksten çıkarır"""
+        self._degistir(lambda: self._cikar(rezervasyon_id))
+
+    def oda_ekle(self, oda_id: int):
+        """Yeni odayı indekse ekler"""
+        self._degistir(lambda: self._oda_idleri.add(oda_id))
+
+    def oda_sil(self, oda_id: int):
+        """Odayı ve rezervasyonlarını indeksten çıkarır"""
+        def islem():
+            self._oda_idleri.discard(oda_id)
+            oda = self._odalar.pop(oda_id, None)
+            if oda is not None:
+                for _, _, rezervasyon_id in oda.araliklar:
+                    self._rezervasyonlar.pop(rezervasyon_id, None)
+        self._degistir(islem)
+
+    # --- Transaction'a bağlı güncellemeler ------------------------------
+
+    def commit_sonrasi_kaydet(self, rezervasyon_id: int, oda_id: int, giris: date,
+                              cikis: date, durum: str):
+        """rezervasyon_kaydet'i mevcut transaction commit edilince uygular"""
+        on_commit(lambda: self.rezervasyon_kaydet(rezervasyon_id, oda_id, giris, cikis, durum))
+
+    def commit_sonrasi_sil(self, rezervasyon_id: int):
+        """rezervasyon_sil'i mevcut transaction commit edilince uygular"""
+        on_commit(lambda: self.rezervasyon_sil(rezervasyon_id))
+
+    def commit_sonrasi_oda_ekle(self, oda_id: int):
+        """oda_ekle'yi mevcut transaction commit edilince uygular"""
+        on_commit(lambda: self.oda_ekle(oda_id))
+
+    def commit_sonrasi_oda_sil(self, oda_id: int):
+        """oda_sil'i mevcut transaction commit edilince uygular"""
+        on_commit(lambda: self.oda_sil(oda_id))
+
+    def stats(self) -> Dict[str, float]:
+        """İndeks durumu (izleme için)"""
+        with self._lock:
+            return {
+                'oda_sayisi': len(self._oda_idleri),
+                'rezervasyon_sayisi': len(self._rezervasyonlar),
+                'yas_saniye': round(time.monotonic() - self._kuruldu, 1) if self._kuruldu else None,
+                'gecersiz': self._gecersiz,
+            }
+
+
+# Uygulama genelinde tek indeks
+musaitlik_indeksi = MusaitlikIndeksi()
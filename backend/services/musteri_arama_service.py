@@ -0,0 +1,396 @@
+"""
+Müşteri arama servisi - bellek içi n-gram indeksi
+
+Resepsiyon araması ad, soyad, telefon, email ve TC kimlik no üzerinde
+büyük/küçük harf ve Türkçe karakter duyarsız çalışır ('isik' araması
+'IŞIK', 'Işık' ve 'ışık' kayıtlarını bulur; 'İ/ı/I', 'Ş/ş', 'Ğ/ğ', 'Ü/ü',
+'Ö/ö', 'Ç/ç' katlanır). Telefon ve TC'de yalnızca rakamlar dikkate alınır.
+
+Her müşterinin katlanmış alanları tek bir belge metninde tutulur; belgenin
+her kelimesi başına iki boşluk eklenerek trigramlara bölünür ve gram ->
+müşteri ID dizisi (array) indeksi oluşturulur. Rakam dizileri (telefon, TC)
+yalnızca 10 farklı karakterden oluştuğu için trigramları çok kalabalıktır;
+bunlar ayrıca 4-gramlarla indekslenir. Aramadaki her kelime:
+
+    1-2 karakter: bir kelimenin başı (ön ek) olarak aranır ('  a', ' al')
+    3+ karakter : herhangi bir yerde (içerir) aranır
+
+Yalnızca rakam ve telefon ayraçlarından oluşan sorgu ('0532 123 45 67')
+tek bir rakam terimi olarak aranır.
+
+Sorgu, her terimin en seyrek gramının ID dizisini alır; en kısa diziyi
+sondan başa (en yeni müşteriden) bloklar halinde tarayıp diğer dizilerle
+kesiştirir, adayları belge metniyle doğrular ve limit kadar sonuç bulunca
+durur. Büyük tabloda (500 bin müşteri) tipik sorgu birkaç ms sürer;
+bkz. benchmark_musteri_arama.py.
+
+İndeks uygulama açılışında arka planda kurulur; hazır olana kadar arama
+SQL LIKE sorgusuna düşer. Müşteri create/update/delete işlemleri commit
+sonrası indekse artımlı yansıtılır; başka süreçlerin değişikliklerini
+yakalamak için MUSTERI_ARAMA_MAX_AGE saniyede bir arka planda yeniden
+kurulur (kurulum sürerken eski indeks kullanılmaya devam eder).
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from database import execute_query, on_commit, stream_query
+
+# İndeksin en fazla kaç saniyede bir yeniden kurulacağı (0: kapalı)
+MUSTERI_ARAMA_MAX_AGE = float(os.getenv('MUSTERI_ARAMA_MAX_AGE', '900'))
+
+# Arama sonucu sayısı
+MUSTERI_ARAMA_DEFAULT_LIMIT = 20
+MUSTERI_ARAMA_MAX_LIMIT = 100
+
+# Aday kesişiminde sondan başa bir seferde işlenen ID sayısı
+_KESISIM_BLOGU = 4096
+
+MUSTERI_ALANLARI = """
+    musteri_id, ad, soyad, tc_kimlik_no, telefon, email,
+    cinsiyet, adres, ozel_notlar, kayit_tarihi
+"""
+
+# Türkçe (ve şapkalı) harflerin katlanmış karşılıkları. 'İ'.lower() 'i̇'
+# (birleşik noktalı) ürettiği için lower()'dan önce uygulanır.
+TR_KATLAMA = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i', 'Î': 'i', 'î': 'i',
+    'Ş': 's', 'ş': 's', 'Ğ': 'g', 'ğ': 'g',
+    'Ü': 'u', 'ü': 'u', 'Û': 'u', 'û': 'u',
+    'Ö': 'o', 'ö': 'o', 'Ç': 'c', 'ç': 'c',
+    'Â': 'a', 'â': 'a',
+})
+
+# Telefon yazımında rakam dışında görülen karakterler
+_TELEFON_AYRACLARI = str.maketrans('', '', '+-(). ')
+
+# 4-gramla indekslenen rakam dizileri
+_RAKAM_DIZISI = re.compile(r'\d{4,}')
+
+
+def katla(metin: Any) -> str:
+    """Türkçe karakter ve büyük/küçük harf duyarsız karşılaştırma anahtarı"""
+    if not metin:
+        return ''
+    metin = str(metin).translate(TR_KATLAMA)
+    ayrik = unicodedata.normalize('NFKD', metin)
+    return ''.join(c for c in ayrik if not unicodedata.combining(c)).lower()
+
+
+def _rakamlar(metin: Any) -> str:
+    return ''.join(c for c in str(metin or '') if c.isdigit())
+
+
+def belge(row: Dict[str, Any]) -> str:
+    """Müşterinin aranabilir alanlarını tek metinde birleştirir"""
+    parcalar = [katla(row.get('ad')), katla(row.get('soyad')), katla(row.get('email')),
+                _rakamlar(row.get('telefon')), _rakamlar(row.get('tc_kimlik_no'))]
+    return ' '.join(p for p in parcalar if p)
+
+
+def gramlar(metin: str) -> Set[str]:
+    """Kelime başları iki boşlukla doldurulmuş trigramlar ve rakam dizilerinin 4-gramları"""
+    result = set()
+    for kelime in metin.split():
+        dolgulu = '  ' + kelime
+        result.update(dolgulu[i:i + 3] for i in range(len(dolgulu) - 2))
+    for dizi in _RAKAM_DIZISI.findall(metin):
+        result.update(dizi[i:i + 4] for i in range(len(dizi) - 3))
+    return result
+
+
+def terimler(sorgu: str) -> List[str]:
+    """Arama metnini katlanmış terimlere ayırır (telefon yazımları rakama indirgenir)"""
+    katlanmis = katla(sorgu)
+    rakamlar = katlanmis.translate(_TELEFON_AYRACLARI)
+    if rakamlar.isdigit():
+        return [rakamlar]
+    result = []
+    for terim in katlanmis.split():
+        rakamlar = terim.translate(_TELEFON_AYRACLARI)
+        if rakamlar.isdigit():
+            terim = rakamlar
+        if terim:
+            result.append(terim)
+    return result
+
+
+def _terim_gramlari(terim: str) -> Set[str]:
+    if len(terim) == 1:
+        return {'  ' + terim}
+    if len(terim) == 2:
+        return {' ' + terim}
+    if len(terim) >= 4 and terim.isdigit():
+        return {terim[i:i + 4] for i in range(len(terim) - 3)}
+    return {terim[i:i + 3] for i in range(len(terim) - 2)}
+
+
+def _eslesir(metin: str, terim: str) -> bool:
+    if len(terim) <= 2:
+        # Kelime başı
+        return metin.startswith(terim) or (' ' + terim) in metin
+    return terim in metin
+
+
+class MusteriAramaIndeksi:
+    """Müşteri arama indeksi (thread-safe)"""
+
+    def __init__(self, max_age: float = MUSTERI_ARAMA_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._kurulum_lock = threading.Lock()
+        self._belgeler: Dict[int, str] = {}
+        # ID dizileri artan sıralı ve tekrarsızdır (arama sondan, en yeni
+        # müşteriden tarar). Güncellenen müşterinin eski girdileri kurulumda
+        # temizlenir; belge doğrulaması eski girdileri eler
+        self._gramlar: Dict[str, array] = {}
+        self._hazir = False
+        self._kuruldu = 0.0
+        self._kuruluyor = False
+        # Kurulum sürerken gelen değişiklikler (yeni indekse tekrar uygulanır)
+        self._bekleyen: Optional[List[Callable[[], None]]] = None
+
+    # --- Kurulum -------------------------------------------------------
+
+    @staticmethod
+    def _ekle(belgeler: Dict[int, str], indeks: Dict[str, array], musteri_id: int, metin: str):
+        belgeler[musteri_id] = metin
+        for gram in gramlar(metin):
+            ids = indeks.get(gram)
+            if ids is None:
+                ids = indeks[gram] = array('i')
+            if not ids or ids[-1] < musteri_id:
+                ids.append(musteri_id)
+                continue
+            # Güncellenen (eski ID'li) müşteri: sıralı konuma, yoksa eklenir
+            i = bisect_left(ids, musteri_id)
+            if i == len(ids) or ids[i] != musteri_id:
+                ids.insert(i, musteri_id)
+
+    def yukle(self, rows: Iterable[Dict[str, Any]]):
+        """
+        İndeksi verilen müşteri satırlarından (musteri_id, ad, soyad, telefon,
+        email, tc_kimlik_no) kurar ve mevcut indeksin yerine koyar.
+        """
+        with self._lock:
+            self._bekleyen = []
+        belgeler: Dict[int, str] = {}
+        indeks: Dict[str, array] = {}
+        try:
+            for row in rows:
+                self._ekle(belgeler, indeks, row['musteri_id'], belge(row))
+        except Exception:
+            with self._lock:
+                self._bekleyen = None
+            raise
+
+        with self._lock:
+            self._belgeler = belgeler
+            self._gramlar = indeks
+            # Tarama sürerken commit edilen değişiklikler idempotent olduğundan tekrar uygulanır
+            for islem in self._bekleyen:
+                islem()
+            self._bekleyen = None
+            self._kuruldu = time.monotonic()
+            self._hazir = True
+        logging.info(f"Müşteri arama indeksi kuruldu: {len(belgeler)} müşteri, {len(indeks)} gram")
+
+    def _kur(self):
+        _, rows = stream_query(
+            "SELECT musteri_id, ad, soyad, telefon, email, tc_kimlik_no FROM musteriler ORDER BY musteri_id"
+        )
+        try:
+            self.yukle(rows)
+        finally:
+            rows.close()
+
+    def rebuild(self):
+        """İndeksi veritabanından yeniden kurar"""
+        with self._kurulum_lock:
+            self._kur()
+
+    def arka_planda_kur(self):
+        """İndeksi ayrı bir thread'de kurar (zaten kuruluyorsa bir şey yapmaz)"""
+        with self._lock:
+            if self._kuruluyor:
+                return
+            self._kuruluyor = True
+
+        def calistir():
+            try:
+                self.rebuild()
+            except Exception as e:
+                logging.error(f"Müşteri arama indeksi kurulamadı: {str(e)}")
+            finally:
+                with self._lock:
+                    self._kuruluyor = False
+
+        threading.Thread(target=calistir, name='musteri-arama-indeksi', daemon=True).start()
+
+    # --- Arama ---------------------------------------------------------
+
+    def ara(self, sorgu: str, limit: int = MUSTERI_ARAMA_DEFAULT_LIMIT) -> Optional[List[int]]:
+        """
+        Sorgudaki tüm terimleri içeren müşterilerin ID'lerini (en yeni önce) döndürür.
+
+        Returns:
+            Optional[List[int]]: En fazla limit ID; indeks henüz hazır değilse None
+        """
+        with self._lock:
+            hazir = self._hazir
+            eski = self.max_age > 0 and time.monotonic() - self._kuruldu > self.max_age
+        if not hazir or eski:
+            # Açılıştaki kurulum başarısız olduysa da burada tekrar denenir
+            self.arka_planda_kur()
+        if not hazir:
+            return None
+
+        aranan = terimler(sorgu)
+        if not aranan:
+            return []
+
+        with self._lock:
+            # Her terimin en seyrek gramının ID dizisi; aday kümesi bunların kesişimidir
+            listeler = []
+            for terim in aranan:
+                en_seyrek = None
+                for gram in _terim_gramlari(terim):
+                    ids = self._gramlar.get(gram)
+                    if ids is None:
+                        return []
+                    if en_seyrek is None or len(ids) < len(en_seyrek):
+                        en_seyrek = ids
+                listeler.append(en_seyrek)
+            listeler.sort(key=len)
+            surucu, digerleri = listeler[0], listeler[1:]
+
+            sonuc: List[int] = []
+            belgeler = self._belgeler
+            # En kısa dizi sondan başa bloklar halinde taranır; diğer diziler
+            # bloğun ID aralığına bisect ile daraltılıp kesiştirilir (C hızında).
+            # Sonuçsuz sorgu da böylece ID başına Python döngüsü çalıştırmaz.
+            son = len(surucu)
+            while son > 0 and len(sonuc) < limit:
+                bas = max(0, son - _KESISIM_BLOGU)
+                blok = surucu[bas:son]
+                son = bas
+                if digerleri:
+                    adaylar = set(blok)
+                    for ids in digerleri:
+                        adaylar.intersection_update(
+                            ids[bisect_left(ids, blok[0]):bisect_right(ids, blok[-1])])
+                        if not adaylar:
+                            break
+                    sirali = sorted(adaylar, reverse=True)
+                else:
+                    sirali = reversed(blok)
+                for musteri_id in sirali:
+                    metin = belgeler.get(musteri_id)
+                    if metin is not None and all(_eslesir(metin, terim) for terim in aranan):
+                        sonuc.append(musteri_id)
+                        if len(sonuc) >= limit:
+                            break
+            return sonuc
+
+    # --- Artımlı güncelleme ---------------------------------------------
+
+    def _degistir(self, islem: Callable[[], None]):
+        with self._lock:
+            islem()
+            if self._bekleyen is not None:
+                self._bekleyen.append(islem)
+
+    def kaydet(self, row: Dict[str, Any]):
+        """Müşteriyi (yeni veya güncellenmiş) indekse yazar"""
+        musteri_id, metin = row['musteri_id'], belge(row)
+
+        def islem():
+            if self._belgeler.get(musteri_id) == metin:
+                return
+            self._ekle(self._belgeler, self._gramlar, musteri_id, metin)
+        self._degistir(islem)
+
+    def sil(self, musteri_id: int):
+        """Müşteriyi indeksten çıkarır"""
+        self._degistir(lambda: self._belgeler.pop(musteri_id, None))
+
+    def commit_sonrasi_kaydet(self, row: Dict[str, Any]):
+        """kaydet'i mevcut transaction commit edilince uygular"""
+        row = dict(row)
+        on_commit(lambda: self.kaydet(row))
+
+    def commit_sonrasi_sil(self, musteri_id: int):
+        """sil'i mevcut transaction commit edilince uygular"""
+        on_commit(lambda: self.sil(musteri_id))
+
+    def stats(self) -> Dict[str, Any]:
+        """İndeks durumu (izleme için)"""
+        with self._lock:
+            return {
+                'hazir': self._hazir,
+                'musteri_sayisi': len(self._belgeler),
+                'gram_sayisi': len(self._gramlar),
+                'yas_saniye': round(time.monotonic() - self._kuruldu, 1) if self._kuruldu else None,
+                'kuruluyor': self._kuruluyor,
+            }
+
+
+# Uygulama genelinde tek indeks
+musteri_arama_indeksi = MusteriAramaIndeksi()
+
+
+class MusteriAramaService:
+    """Resepsiyon müşteri araması"""
+
+    @staticmethod
+    def _sql_ara(aranan: List[str], limit: int) -> List[Dict[str, Any]]:
+        """İndeks hazır değilken LIKE ile arama (Türkçe katlama collation'a bağlıdır)"""
+        kosullar = []
+        params: List[Any] = []
+        for terim in aranan:
+            kosullar.append("(ad LIKE %s OR soyad LIKE %s OR email LIKE %s OR telefon LIKE %s OR tc_kimlik_no LIKE %s)")
+            params.extend([f"%{terim}%"] * 5)
+        params.append(limit)
+        return execute_query(f"""
+            SELECT {MUSTERI_ALANLARI}
+            FROM musteriler
+            WHERE {' AND '.join(kosullar)}
+            ORDER BY musteri_id DESC
+            LIMIT %s
+        """, params=tuple(params), fetch=True) or []
+
+    @staticmethod
+    def ara(sorgu: str, limit: int = MUSTERI_ARAMA_DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Müşteri arar.
+
+        Args:
+            sorgu: Boşlukla ayrılmış terimler; her terim ad, soyad, email,
+                telefon veya TC'den birinde geçmelidir
+            limit: En fazla sonuç sayısı
+
+        Returns:
+            List[Dict[str, Any]]: musteriler satırları (en yeni müşteri önce)
+        """
+        ids = musteri_arama_indeksi.ara(sorgu, limit)
+        if ids is None:
+            aranan = terimler(sorgu)
+            return MusteriAramaService._sql_ara(aranan, limit) if aranan else []
+        if not ids:
+            return []
+
+        placeholders = ', '.join(['%s'] * len(ids))
+        rows = execute_query(f"""
+            SELECT {MUSTERI_ALANLARI}
+            FROM musteriler
+            WHERE musteri_id IN ({placeholders})
+        """, params=tuple(ids), fetch=True) or []
+        by_id = {row['musteri_id']: row for row in rows}
+        return [by_id[musteri_id] for musteri_id in ids if musteri_id in by_id]
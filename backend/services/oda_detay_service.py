@@ -0,0 +1,80 @@
+"""
+Oda detay servisi - birden fazla odayı özellik ve resimleriyle birlikte getirir
+
+Oda başına ayrı istek/sorgu (oda + /ozellikler + /resimler) yerine istenen
+tüm odalar için üç küme sorgusu (WHERE oda_id IN (...)) çalıştırılır ve
+sonuçlar Python'da odalara dağıtılır.
+"""
+
+import os
+from typing import Any, Dict, List, Sequence
+
+from database import execute_query
+from models.oda import Oda
+
+# Tek istekte istenebilecek en fazla oda sayısı
+ODA_DETAY_MAX_IDS = int(os.getenv('ODA_DETAY_MAX_IDS', '200'))
+
+
+class OdaDetayService:
+    """Toplu oda detay sorguları"""
+
+    @staticmethod
+    def get_detaylar(oda_ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Odaları özellikleri ve resimleriyle birlikte getirir.
+
+        Args:
+            oda_ids: Oda ID'leri (tekrarlar yok sayılır)
+
+        Returns:
+            List[Dict[str, Any]]: İstenen sırada oda sözlükleri; her birinde
+                'ozellikler' (ad listesi) ve 'resimler' (sıralı) alanları
+                bulunur. Bulunamayan ID'ler sonuçta yer almaz.
+        """
+        oda_ids = list(dict.fromkeys(oda_ids))
+        if not oda_ids:
+            return []
+
+        placeholders = ', '.join(['%s'] * len(oda_ids))
+        params = tuple(oda_ids)
+
+        oda_rows = execute_query(f"""
+            SELECT oda_id, oda_numarasi, oda_tipi, manzara, metrekare, ucret_gecelik, durum
+            FROM odalar
+            WHERE oda_id IN ({placeholders})
+        """, params=params, fetch=True) or []
+        if not oda_rows:
+            return []
+
+        odalar = {}
+        for row in oda_rows:
+            oda = Oda.row_to_dict(row)
+            oda['ozellikler'] = []
+            oda['resimler'] = []
+            odalar[row['oda_id']] = oda
+
+        # Sadece var olan odalar için alt tabloları sorgula
+        placeholders = ', '.join(['%s'] * len(odalar))
+        params = tuple(odalar)
+
+        ozellik_rows = execute_query(f"""
+            SELECT ob.oda_id, o.ozellik_adi
+            FROM oda_ozellik_baglanti ob
+            JOIN oda_ozellikleri o ON o.ozellik_id = ob.ozellik_id
+            WHERE ob.oda_id IN ({placeholders})
+            ORDER BY o.ozellik_adi
+        """, params=params, fetch=True) or []
+        for row in ozellik_rows:
+            odalar[row['oda_id']]['ozellikler'].append(row['ozellik_adi'])
+
+        resim_rows = execute_query(f"""
+            SELECT resim_id, oda_id, resim_url, resim_adi, sira, yuklenme_tarihi
+            FROM oda_resimleri
+            WHERE oda_id IN ({placeholders})
+            ORDER BY oda_id, sira ASC, yuklenme_tarihi DESC
+        """, params=params, fetch=True) or []
+        for row in resim_rows:
+            odalar[row['oda_id']]['resimler'].append(row)
+
+        return [odalar[oda_id] for oda_id in oda_ids if oda_id in odalar]
@@ -0,0 +1,236 @@
+"""
+Oda filtre motoru - oda listesi üzerinde bellek içi fasetli filtreleme
+
+OdaService.get_filtered_odalar'ın SQL yolu (ORM sorgusu + CAST'li
+LIKE '%arama%') ile aynı sonucu veritabanına gitmeden üretir:
+
+  - Fiyat, oda tipi ve durum sütun dizileri halinde tutulur; tip/durum
+    değerleri tamsayı kodlarına çevrilir.
+  - Tip, durum ve manzara için değer -> oda sıraları listeleri, fiyat için
+    sıralı dizi (bisect ile aralık) bulunur.
+  - 'arama' için oda numarası, tipi ve manzaranın trigram indeksi kullanılır;
+    aday odalar trigram listelerinin kesişiminden alınır ve alt metin
+    eşleşmesiyle doğrulanır.
+  - Tip ve durum faset sayıları (filtresiz toplamlar) kurulumda hesaplanır.
+
+Motor değişmezdir (immutable); veri değiştiğinde yenisi kurulur, bu yüzden
+sorgular kilitsiz çalışabilir. Metin karşılaştırmaları MySQL'in büyük/küçük
+harf ve aksan duyarsız collation'ını taklit eder; Türkçe karakterler müşteri
+aramasıyla aynı tabloyla katlanır ('ı' -> 'i'). 'arama' içindeki '%' ve '_'
+her iki yolda da düz karakterdir (SQL yolu LIKE'ta kaçışlar).
+"""
+
+import unicodedata
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from services.musteri_arama_service import TR_KATLAMA
+
+# arama metninin indekslendiği alanlar (SQL yolundaki LIKE sütunları)
+ARAMA_ALANLARI = ('oda_numarasi', 'oda_tipi', 'manzara')
+
+
+def katla(metin: Any) -> str:
+    """Büyük/küçük harf, aksan ve Türkçe i/ı farklarını yok sayan karşılaştırma anahtarı"""
+    if metin is None:
+        return ''
+    ayrik = unicodedata.normalize('NFKD', str(metin).translate(TR_KATLAMA))
+    return ''.join(c for c in ayrik if not unicodedata.combining(c)).casefold()
+
+
+def trigramlar(metin: str) -> Set[str]:
+    """Metnin 3 karakterlik alt dizileri"""
+    return {metin[i:i + 3] for i in range(len(metin) - 2)}
+
+
+def oda_sozlugu(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Veritabanı satırını OdaService.get_filtered_odalar çıktı biçimine çevirir"""
+    fiyat = float(row['ucret_gecelik'])
+    return {
+        'oda_id': row['oda_id'],
+        'oda_numarasi': row['oda_numarasi'],
+        'oda_tipi': row['oda_tipi'],
+        'manzara': row['manzara'],
+        'metrekare': row['metrekare'],
+        'ucret_gecelik': fiyat,
+        'durum': row['durum'],
+        # Frontend uyumluluğu için alias'lar
+        'oda_no': row['oda_numarasi'],
+        'tip': row['oda_tipi'],
+        'fiyat': fiyat,
+    }
+
+
+class _KodluSutun:
+    """Metin sütununun tamsayı kodlu hali ve değer -> oda sıraları indeksi"""
+
+    __slots__ = ('kodlar', 'adlar', 'kod', 'siralar')
+
+    def __init__(self, degerler: Iterable[Any]):
+        self.kodlar: List[int] = []
+        # Koda karşılık gelen (ilk görülen yazılışıyla) değer
+        self.adlar: List[Any] = []
+        self.kod: Dict[str, int] = {}
+        self.siralar: List[List[int]] = []
+        for sira, deger in enumerate(degerler):
+            anahtar = katla(deger)
+            kod = self.kod.get(anahtar)
+            if kod is None:
+                kod = self.kod[anahtar] = len(self.adlar)
+                self.adlar.append(deger)
+                self.siralar.append([])
+            self.kodlar.append(kod)
+            self.siralar[kod].append(sira)
+
+    def eslesenler(self, deger: str) -> List[int]:
+        kod = self.kod.get(katla(deger))
+        return [] if kod is None else self.siralar[kod]
+
+    def say(self, siralar: Optional[Iterable[int]] = None) -> Dict[Any, int]:
+        """Değer başına oda sayısı (siralar verilmezse tüm odalar)"""
+        if siralar is None:
+            sayilar = [len(s) for s in self.siralar]
+        else:
+            sayilar = [0] * len(self.adlar)
+            kodlar = self.kodlar
+            for sira in siralar:
+                sayilar[kodlar[sira]] += 1
+        return {ad: sayi for ad, sayi in zip(self.adlar, sayilar) if sayi}
+
+
+class OdaFiltreMotoru:
+    """Değişmez oda filtre/faset indeksi"""
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            rows: odalar satırları (oda_id, oda_numarasi, oda_tipi, manzara,
+                metrekare, ucret_gecelik, durum), oda numarasına göre sıralı
+        """
+        self.odalar: List[Dict[str, Any]] = [oda_sozlugu(row) for row in rows]
+
+        # Sütun dizileri
+        self.fiyatlar: List[float] = [oda['ucret_gecelik'] for oda in self.odalar]
+        self.tipler = _KodluSutun(oda['oda_tipi'] for oda in self.odalar)
+        self.durumlar = _KodluSutun(oda['durum'] for oda in self.odalar)
+        self.manzaralar = _KodluSutun(oda['manzara'] for oda in self.odalar)
+
+        self._fiyat_siralari = sorted(range(len(self.odalar)), key=self.fiyatlar.__getitem__)
+        self._sirali_fiyatlar = [self.fiyatlar[sira] for sira in self._fiyat_siralari]
+
+        # arama: alan bazında katlanmış metinler ve trigram -> oda sıraları
+        self._alanlar: List[Tuple[str, ...]] = [
+            tuple(katla(oda[alan]) for alan in ARAMA_ALANLARI) for oda in self.odalar
+        ]
+        trigram_indeksi: Dict[str, List[int]] = {}
+        for sira, alanlar in enumerate(self._alanlar):
+            for trigram in set().union(*(trigramlar(alan) for alan in alanlar)):
+                trigram_indeksi.setdefault(trigram, []).append(sira)
+        self._trigramlar = trigram_indeksi
+
+        # Filtresiz faset sayıları
+        self.tip_sayilari = self.tipler.say()
+        self.durum_sayilari = self.durumlar.say()
+
+    def __len__(self) -> int:
+        return len(self.odalar)
+
+    # --- Filtre kümeleri -------------------------------------------------
+
+    def _fiyat_araligi(self, min_fiyat: Optional[float], max_fiyat: Optional[float]) -> List[int]:
+        bas = 0 if min_fiyat is None else bisect_left(self._sirali_fiyatlar, min_fiyat)
+        son = len(self._sirali_fiyatlar) if max_fiyat is None else bisect_right(self._sirali_fiyatlar, max_fiyat)
+        return self._fiyat_siralari[bas:son]
+
+    def _arama(self, arama: str) -> List[int]:
+        aranan = katla(arama)
+        if len(aranan) >= 3:
+            listeler = [self._trigramlar.get(t) for t in trigramlar(aranan)]
+            if not all(listeler):
+                return []
+            listeler.sort(key=len)
+            adaylar = set(listeler[0]).intersection(*listeler[1:])
+        else:
+            adaylar = range(len(self.odalar))
+        # Trigramlar farklı alanlarda veya farklı konumlarda olabilir; doğrula
+        return [sira for sira in adaylar if any(aranan in alan for alan in self._alanlar[sira])]
+
+    def _kumeler(self, durum, oda_tipi, min_fiyat, max_fiyat, arama, manzara) -> Dict[str, Iterable[int]]:
+        """Verilen her filtrenin eşleştiği oda sıraları (filtre adı -> sıralar)"""
+        kumeler: Dict[str, Iterable[int]] = {}
+        if durum:
+            kumeler['durum'] = self.durumlar.eslesenler(durum)
+        if oda_tipi:
+            kumeler['oda_tipi'] = self.tipler.eslesenler(oda_tipi)
+        if manzara:
+            kumeler['manzara'] = self.manzaralar.eslesenler(manzara)
+        if min_fiyat is not None or max_fiyat is not None:
+            kumeler['fiyat'] = self._fiyat_araligi(min_fiyat, max_fiyat)
+        if arama:
+            kumeler['arama'] = self._arama(arama)
+        return kumeler
+
+    @staticmethod
+    def _kesisim(kumeler: List[Iterable[int]]) -> Optional[Set[int]]:
+        """Kümelerin kesişimi; küme yoksa None (tüm odalar)"""
+        if not kumeler:
+            return None
+        kumeler = sorted(kumeler, key=len)
+        return set(kumeler[0]).intersection(*kumeler[1:])
+
+    # --- Sorgular ------------------------------------------------------
+
+    def filtrele(
+        self,
+        durum: Optional[str] = None,
+        oda_tipi: Optional[str] = None,
+        min_fiyat: Optional[float] = None,
+        max_fiyat: Optional[float] = None,
+        arama: Optional[str] = None,
+        manzara: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        OdaService.get_filtered_odalar ile aynı filtreleri uygular.
+
+        Returns:
+            List[Dict[str, Any]]: Oda numarasına göre sıralı oda listesi
+                (kopyalar; değiştirmek motoru etkilemez)
+        """
+        kumeler = self._kumeler(durum, oda_tipi, min_fiyat, max_fiyat, arama, manzara)
+        eslesen = self._kesisim(list(kumeler.values()))
+        siralar = range(len(self.odalar)) if eslesen is None else sorted(eslesen)
+        return [dict(self.odalar[sira]) for sira in siralar]
+
+    def fasetler(
+        self,
+        durum: Optional[str] = None,
+        oda_tipi: Optional[str] = None,
+        min_fiyat: Optional[float] = None,
+        max_fiyat: Optional[float] = None,
+        arama: Optional[str] = None,
+        manzara: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Filtre sonucu için oda tipi ve durum faset sayıları.
+
+        Her faset kendi filtresi hariç diğer tüm filtreler uygulanarak
+        sayılır; böylece ör. 'Çift' seçiliyken diğer tiplerin de kaç oda
+        getireceği görülür.
+
+        Returns:
+            Dict[str, Any]: {'toplam': filtreye uyan oda sayısı,
+                'oda_tipi': {tip: sayı}, 'durum': {durum: sayı}}
+        """
+        kumeler = self._kumeler(durum, oda_tipi, min_fiyat, max_fiyat, arama, manzara)
+
+        def haric(filtre: str) -> Optional[Set[int]]:
+            return self._kesisim([k for ad, k in kumeler.items() if ad != filtre])
+
+        eslesen = self._kesisim(list(kumeler.values()))
+        tip_haric = haric('oda_tipi')
+        durum_haric = haric('durum')
+        return {
+            'toplam': len(self.odalar) if eslesen is None else len(eslesen),
+            'oda_tipi': dict(self.tip_sayilari) if tip_haric is None else self.tipler.say(tip_haric),
+            'durum': dict(self.durum_sayilari) if durum_haric is None else self.durumlar.say(durum_haric),
+        }
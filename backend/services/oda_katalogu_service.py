@@ -0,0 +1,130 @@
+"""
+Oda kataloğu servisi - odalar tablosunun bellek içi kopyası
+
+odalar neredeyse her ekranda okunur ama yalnızca yönetici bir odayı
+düzenlediğinde veya rezervasyonla oda durumu değiştiğinde yazılır. Katalog
+tüm odaları bir OdaFiltreMotoru (services/oda_filtre_motoru.py) içinde tutar;
+filtreli oda listeleri ve faset sayıları MySQL'e gitmeden üretilir.
+
+odalar tablosuna yazan kod zaten invalidate_tables('odalar') çağırdığından
+katalog bu bildirime abone olur ve commit sonrası bir sonraki okumada
+yeniden yüklenir. Başka süreçlerin yaptığı değişiklikleri yakalamak için
+ODA_KATALOGU_MAX_AGE saniyede bir de yeniden yüklenir.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+from cache import on_tables_changed
+from database import execute_query
+from services.oda_filtre_motoru import OdaFiltreMotoru
+
+# Kataloğun en fazla kaç saniyede bir veritabanından yeniden yükleneceği (0: kapalı)
+ODA_KATALOGU_MAX_AGE = float(os.getenv('ODA_KATALOGU_MAX_AGE', '300'))
+
+
+class OdaKatalogu:
+    """Bellek içi oda kataloğu (thread-safe)"""
+
+    def __init__(self, max_age: float = ODA_KATALOGU_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._kurulum_lock = threading.Lock()
+        # Değişmez; her yüklemede yenisiyle değiştirilir
+        self._motor = OdaFiltreMotoru(())
+        self._kuruldu = 0.0
+        self._gecersiz = True
+        # Her invalidate'te artar; yükleme sürerken gelen değişiklik kaybolmaz
+        self._nesil = 0
+        self.hits = 0
+        self.loads = 0
+
+    # --- Kurulum -------------------------------------------------------
+
+    def _kurulum_gerekli(self) -> bool:
+        with self._lock:
+            eski = self.max_age > 0 and time.monotonic() - self._kuruldu > self.max_age
+            return self._gecersiz or eski
+
+    def _kur(self):
+        with self._lock:
+            nesil = self._nesil
+        rows = execute_query("""
+            SELECT oda_id, oda_numarasi, oda_tipi, manzara, metrekare, ucret_gecelik, durum
+            FROM odalar
+            ORDER BY oda_numarasi, oda_id
+        """, fetch=True) or []
+
+        motor = OdaFiltreMotoru(rows)
+
+        with self._lock:
+            self._motor = motor
+            self._kuruldu = time.monotonic()
+            # Yükleme sırasında invalidate geldiyse bir sonraki okumada tekrar yüklenir
+            self._gecersiz = self._nesil != nesil
+            self.loads += 1
+        logging.info(f"Oda kataloğu yüklendi: {len(motor)} oda")
+
+    def rebuild(self):
+        """Kataloğu veritabanından yeniden yükler"""
+        with self._kurulum_lock:
+            self._kur()
+
+    def invalidate(self):
+        """Kataloğu bir sonraki okumada yeniden yüklenmek üzere işaretler"""
+        with self._lock:
+            self._gecersiz = True
+            self._nesil += 1
+
+    def _hazirla(self) -> OdaFiltreMotoru:
+        """Güncel motoru döndürür (gerekirse önce yükler)"""
+        if self._kurulum_gerekli():
+            with self._kurulum_lock:
+                # Başka bir thread bizi beklerken yüklemiş olabilir
+                if self._kurulum_gerekli():
+                    self._kur()
+                    with self._lock:
+                        return self._motor
+        with self._lock:
+            self.hits += 1
+            return self._motor
+
+    # --- Sorgular ------------------------------------------------------
+
+    def filtrele(self, **filtreler: Any) -> List[Dict[str, Any]]:
+        """
+        OdaService.get_filtered_odalar ile aynı filtreleri bellekten uygular.
+
+        Args:
+            filtreler: durum, oda_tipi, min_fiyat, max_fiyat, arama, manzara
+                (bkz. OdaFiltreMotoru.filtrele)
+
+        Returns:
+            List[Dict[str, Any]]: Oda numarasına göre sıralı oda listesi
+        """
+        return self._hazirla().filtrele(**filtreler)
+
+    def fasetler(self, **filtreler: Any) -> Dict[str, Any]:
+        """Filtre sonucu için oda tipi ve durum faset sayıları (bkz. OdaFiltreMotoru.fasetler)"""
+        return self._hazirla().fasetler(**filtreler)
+
+    def stats(self) -> Dict[str, Any]:
+        """Katalog durumu (izleme için)"""
+        with self._lock:
+            return {
+                'oda_sayisi': len(self._motor),
+                'hits': self.hits,
+                'loads': self.loads,
+                'yas_saniye': round(time.monotonic() - self._kuruldu, 1) if self._kuruldu else None,
+                'gecersiz': self._gecersiz,
+            }
+
+
+# Uygulama genelinde tek katalog
+oda_katalogu = OdaKatalogu()
+
+# odalar'a yazan her commit (oda route'ları, rezervasyon durum değişiklikleri) kataloğu geçersiz kılar
+on_tables_changed('odalar', oda_katalogu.invalidate)
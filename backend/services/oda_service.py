@@ -19,7 +19,8 @@ class OdaService:
         oda_tipi: Optional[str] = None,
         min_fiyat: Optional[float] = None,
         max_fiyat: Optional[float] = None,
-        arama: Optional[str] = None
+        arama: Optional[str] = None,
+        manzara: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Filtre parametrelerine göre odaları getirir
@@ -30,6 +31,8 @@ class OdaService:
             oda_tipi: Oda tipi filtresi ('Tek', 'Çift', vb.)
             min_fiyat: Minimum fiyat filtresi
             max_fiyat: Maximum fiyat filtresi
+            arama: Oda numarası, tipi veya manzarada geçen metin
+            manzara: Manzara filtresi ('Deniz', 'Bahçe', vb.)
 
         Returns:
             List[Dict[str, Any]]: Filtrelenmiş oda listesi
@@ -55,16 +58,24 @@ class OdaService:
         if max_fiyat is not None:
             filters.append(Oda.ucret_gecelik <= max_fiyat)
 
+        # Manzara filtresi
+        if manzara:
+            filters.append(Oda.manzara == manzara)
+
         # Tüm filtreleri uygula
         if filters:
             query = query.filter(and_(*filters))
 
         # Arama filtresi (oda numarası, tipi veya manzara)
         if arama:
+            # '%' ve '_' joker değil düz karakter olarak aranır (autoescape).
+            # Noktasız ı bazı collation'larda i'den farklı harftir; bellek içi
+            # filtre motoruyla aynı sonuç için 'i'ye çevrilir
+            arama = arama.replace('ı', 'i')
             search_filter = or_(
-                Oda.oda_numarasi.cast(String).like(f"%{arama}%"),
-                Oda.oda_tipi.like(f"%{arama}%"),
-                Oda.manzara.like(f"%{arama}%")
+                Oda.oda_numarasi.cast(String).contains(arama, autoescape=True),
+                Oda.oda_tipi.contains(arama, autoescape=True),
+                Oda.manzara.contains(arama, autoescape=True)
             )
             query = query.filter(search_filter)
 
@@ -1,48 +1,295 @@
-from models import Rezervasyon
-from database import db
+"""
+Rezervasyon servisi - PyMySQL ile atomik rezervasyon işlemlerini yönetir
+
+Müsaitlik kontrolü, kayıt ve oda durumu güncellemesi tek transaction içinde,
+oda satırı SELECT ... FOR UPDATE ile kilitlenerek yapılır. Aynı odaya gelen
+eşzamanlı istekler bu kilit üzerinde sıraya girer; çift rezervasyon oluşmaz.
+Tüm işlemler kilitleri oda -> rezervasyon sırasıyla alır.
+"""
+
+from datetime import date
+from typing import Optional, Dict, Any
+from database import get_db_connection
+from cache import invalidate_tables
+from models.oda import Oda
+from models.rezervasyon import Rezervasyon
+from services.folyo_service import FolyoService
+from services.musaitlik_service import musaitlik_indeksi
+
+
+class RezervasyonError(Exception):
+    """Rezervasyon işlemi reddedildiğinde fırlatılır (HTTP durum kodu ile)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _oda_id(value: Any) -> int:
+    """İstekten gelen oda_id'yi (form select'lerinden string gelebilir) int'e çevirir"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RezervasyonError('oda_id bir tam sayi olmalidir')
+
 
 class RezervasyonService:
+    """Rezervasyon servis sınıfı - kilit tabanlı atomik rezervasyon işlemleri"""
+
+    # Odayı meşgul sayan rezervasyon durumları
+    AKTIF_DURUMLAR = ('aktif', 'bekliyor')
+
+    @staticmethod
+    def _oda_kilitle(cursor, oda_id: int) -> Optional[Dict[str, Any]]:
+        """Oda satırını transaction sonuna kadar kilitler ve fiyat/durum bilgisini döndürür"""
+        cursor.execute(
+            "SELECT oda_id, ucret_gecelik, durum FROM odalar WHERE oda_id = %s FOR UPDATE",
+            (oda_id,)
+        )
+        return cursor.fetchone()
+
     @staticmethod
-    def get_all():
-        return Rezervasyon.query.all()
-    
+    def _rezervasyon_odasi(cursor, rezervasyon_id: int) -> int:
+        """Rezervasyonun odasını kilitsiz okur (kilit sırasını belirlemek için)"""
+        cursor.execute("SELECT oda_id FROM rezervasyonlar WHERE rezervasyon_id = %s", (rezervasyon_id,))
+        row = cursor.fetchone()
+        if not row:
+            raise RezervasyonError('Rezervasyon bulunamadi', 404)
+        return row['oda_id']
+
     @staticmethod
-    def get_by_id(rezervasyon_id):
-        return Rezervasyon.query.get(rezervasyon_id)
-    
+    def _rezervasyon_kilitle(cursor, rezervasyon_id: int, beklenen_oda_id: int) -> Dict[str, Any]:
+        """
+        Rezervasyon satırını kilitler. Oda kilidi alınırken rezervasyon başka
+        odaya taşındıysa işlem tekrar denenmek üzere reddedilir.
+        """
+        cursor.execute("""
+            SELECT rezervasyon_id, musteri_id, oda_id, giris_tarihi, cikis_tarihi,
+                   yetiskin_sayisi, cocuk_sayisi, toplam_ucret, rezervasyon_durumu,
+                   olusturulma_tarihi
+            FROM rezervasyonlar
+            WHERE rezervasyon_id = %s
+            FOR UPDATE
+        """, (rezervasyon_id,))
+        current = cursor.fetchone()
+        if not current:
+            raise RezervasyonError('Rezervasyon bulunamadi', 404)
+        if current['oda_id'] != beklenen_oda_id:
+            raise RezervasyonError('Rezervasyon ayni anda degistirildi, lutfen tekrar deneyin', 409)
+        return current
+
     @staticmethod
-    def create(data):
-        rezervasyon = Rezervasyon(**data)
-        db.session.add(rezervasyon)
-        db.session.commit()
-        return rezervasyon
-    
+    def _cakisma_var_mi(cursor, oda_id: int, giris: date, cikis: date,
+                        exclude_id: Optional[int] = None) -> bool:
+        """
+        Odada [giris, cikis) aralığıyla çakışan aktif/bekleyen rezervasyon var mı?
+
+        Oda kilidi alındıktan sonra çağrılmalıdır. Locking read kullanıldığı için
+        kilidi bizden önce bırakan transaction'ın kaydı da görülür.
+        """
+        query = """
+            SELECT rezervasyon_id
+            FROM rezervasyonlar
+            WHERE oda_id = %s
+              AND rezervasyon_durumu IN ('aktif', 'bekliyor')
+              AND cikis_tarihi > %s
+              AND giris_tarihi < %s
+        """
+        params = [oda_id, giris, cikis]
+        if exclude_id:
+            query += " AND rezervasyon_id != %s"
+            params.append(exclude_id)
+        query += " LIMIT 1 LOCK IN SHARE MODE"
+        cursor.execute(query, tuple(params))
+        return cursor.fetchone() is not None
+
     @staticmethod
-    def update(rezervasyon_id, data):
-        rezervasyon = Rezervasyon.query.get_or_404(rezervasyon_id)
-        for key, value in data.items():
-            setattr(rezervasyon, key, value)
-        db.session.commit()
-        return rezervasyon
-    
+    def create(musteri_id: int, oda_id: int, giris: date, cikis: date,
+               yetiskin_sayisi: int = 1, cocuk_sayisi: int = 0,
+               rezervasyon_tipi: str = 'Online') -> Rezervasyon:
+        """
+        Yeni rezervasyonu tek transaction içinde oluşturur ve odayı 'Dolu' yapar.
+
+        Args:
+            musteri_id: Müşteri ID'si
+            oda_id: Oda ID'si
+            giris: Giriş tarihi
+            cikis: Çıkış tarihi (giriş tarihinden büyük olmalı)
+            yetiskin_sayisi: Yetişkin sayısı
+            cocuk_sayisi: Çocuk sayısı
+            rezervasyon_tipi: Rezervasyon tipi ('Online', 'Kapıdan', ...)
+
+        Returns:
+            Rezervasyon: Oluşturulan rezervasyon
+
+        Raises:
+            RezervasyonError: Oda yoksa (404), boş değilse veya tarihler çakışıyorsa (400)
+        """
+        if cikis <= giris:
+            raise RezervasyonError('Cikis tarihi giris tarihinden buyuk olmalidir')
+        oda_id = _oda_id(oda_id)
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                oda = RezervasyonService._oda_kilitle(cursor, oda_id)
+                if not oda:
+                    raise RezervasyonError('Oda bulunamadi', 404)
+                if oda['durum'] != Oda.DURUM_BOS:
+                    raise RezervasyonError('Oda su anda bos degil')
+
+                if RezervasyonService._cakisma_var_mi(cursor, oda_id, giris, cikis):
+                    raise RezervasyonError('Bu tarih araliginda odada rezervasyon var')
+
+                toplam_ucret = float(oda['ucret_gecelik']) * (cikis - giris).days
+
+                cursor.execute("""
+                    INSERT INTO rezervasyonlar
+                    (musteri_id, oda_id, giris_tarihi, cikis_tarihi, yetiskin_sayisi, cocuk_sayisi, toplam_ucret, rezervasyon_tipi, rezervasyon_durumu, olusturulma_tarihi)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                """, (musteri_id, oda_id, giris, cikis, yetiskin_sayisi, cocuk_sayisi,
+                      toplam_ucret, rezervasyon_tipi, Rezervasyon.DURUM_AKTIF))
+                rez_id = cursor.lastrowid
+
+                cursor.execute(
+                    "UPDATE odalar SET durum = %s WHERE oda_id = %s",
+                    (Oda.DURUM_DOLU, oda_id)
+                )
+                FolyoService.yenile(rez_id, cursor)
+
+                musaitlik_indeksi.commit_sonrasi_kaydet(rez_id, oda_id, giris, cikis, Rezervasyon.DURUM_AKTIF)
+                invalidate_tables('rezervasyonlar', 'odalar')
+
+        return Rezervasyon(
+            rezervasyon_id=rez_id,
+            musteri_id=musteri_id,
+            oda_id=oda_id,
+            giris_tarihi=giris,
+            cikis_tarihi=cikis,
+            yetiskin_sayisi=yetiskin_sayisi,
+            cocuk_sayisi=cocuk_sayisi,
+            toplam_ucret=toplam_ucret,
+            rezervasyon_durumu=Rezervasyon.DURUM_AKTIF
+        )
+
     @staticmethod
-    def delete(rezervasyon_id):
-        rezervasyon = Rezervasyon.query.get_or_404(rezervasyon_id)
-        db.session.delete(rezervasyon)
-        db.session.commit()
-        return True
+    def update(rezervasyon_id: int, data: Dict[str, Any]) -> Rezervasyon:
+        """
+        Rezervasyonu tek transaction içinde günceller.
+
+        Rezervasyon satırı ve ilgili oda(lar) kilitlenir, çakışma kontrolü kilit
+        altında yapılır, toplam ücret yeniden hesaplanır ve oda durumları ayarlanır.
+
+        Args:
+            rezervasyon_id: Rezervasyon ID'si
+            data: Güncellenecek alanlar (giris_tarihi/cikis_tarihi date olarak)
+
+        Returns:
+            Rezervasyon: Güncellenmiş rezervasyon
 
+        Raises:
+            RezervasyonError: Rezervasyon/oda yoksa (404), veri geçersizse veya
+                tarihler çakışıyorsa (400)
+        """
+        # Kilit kümesi kurulmadan önce doğrulanır (string oda_id sıralamayı bozar)
+        istenen_oda_id = _oda_id(data['oda_id']) if data.get('oda_id') is not None else None
 
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                eski_oda_id = RezervasyonService._rezervasyon_odasi(cursor, rezervasyon_id)
+                yeni_oda_id = istenen_oda_id if istenen_oda_id is not None else eski_oda_id
 
+                # Kilitleri her zaman oda -> rezervasyon sırasıyla ve oda_id'ye göre
+                # sıralı al (create/delete ile aynı sıra, deadlock önleme)
+                odalar = {}
+                for oda_id in sorted({eski_oda_id, yeni_oda_id}):
+                    odalar[oda_id] = RezervasyonService._oda_kilitle(cursor, oda_id)
+                oda = odalar[yeni_oda_id]
+                if not oda:
+                    raise RezervasyonError('Oda bulunamadi', 404)
 
+                current = RezervasyonService._rezervasyon_kilitle(cursor, rezervasyon_id, eski_oda_id)
+                giris = data.get('giris_tarihi') or current['giris_tarihi']
+                cikis = data.get('cikis_tarihi') or current['cikis_tarihi']
+                if cikis <= giris:
+                    raise RezervasyonError('Cikis tarihi giris tarihinden buyuk olmalidir')
 
+                rezervasyon_durumu = data.get('rezervasyon_durumu', current['rezervasyon_durumu'])
+                if not Rezervasyon().validate_status(rezervasyon_durumu):
+                    raise RezervasyonError(f'Gecersiz durum: {rezervasyon_durumu}')
 
+                aktif = rezervasyon_durumu.lower() in RezervasyonService.AKTIF_DURUMLAR
+                if aktif and RezervasyonService._cakisma_var_mi(
+                        cursor, yeni_oda_id, giris, cikis, exclude_id=rezervasyon_id):
+                    raise RezervasyonError('Bu tarih araliginda odada rezervasyon var')
 
+                toplam_ucret = float(oda['ucret_gecelik']) * (cikis - giris).days
 
+                field_map = {
+                    'musteri_id': data.get('musteri_id', current['musteri_id']),
+                    'oda_id': yeni_oda_id,
+                    'giris_tarihi': giris,
+                    'cikis_tarihi': cikis,
+                    'yetiskin_sayisi': data.get('yetiskin_sayisi', current['yetiskin_sayisi']),
+                    'cocuk_sayisi': data.get('cocuk_sayisi', current['cocuk_sayisi']),
+                    'toplam_ucret': toplam_ucret,
+                    'rezervasyon_durumu': rezervasyon_durumu
+                }
+                update_fields = [f"{key} = %s" for key in field_map]
+                update_values = list(field_map.values()) + [rezervasyon_id]
+                cursor.execute(
+                    f"UPDATE rezervasyonlar SET {', '.join(update_fields)} WHERE rezervasyon_id = %s",
+                    tuple(update_values)
+                )
 
+                # Oda durumlarını güncelle
+                if rezervasyon_durumu in [Rezervasyon.DURUM_IPTAL, Rezervasyon.DURUM_TAMAMLANDI]:
+                    yeni_durum = Oda.DURUM_BOS
+                else:
+                    yeni_durum = Oda.DURUM_DOLU
+                cursor.execute("UPDATE odalar SET durum = %s WHERE oda_id = %s", (yeni_durum, yeni_oda_id))
+                if eski_oda_id != yeni_oda_id and odalar[eski_oda_id]:
+                    cursor.execute("UPDATE odalar SET durum = %s WHERE oda_id = %s", (Oda.DURUM_BOS, eski_oda_id))
+                FolyoService.yenile(rezervasyon_id, cursor)
+
+                musaitlik_indeksi.commit_sonrasi_kaydet(rezervasyon_id, yeni_oda_id, giris, cikis, rezervasyon_durumu)
+                invalidate_tables('rezervasyonlar', 'odalar')
+
+        return Rezervasyon.from_dict({
+            **field_map,
+            'rezervasyon_id': rezervasyon_id,
+            'olusturulma_tarihi': current.get('olusturulma_tarihi')
+        })
+
+    @staticmethod
+    def delete(rezervasyon_id: int, sebep: str = 'Kullanici tarafindan silindi') -> Dict[str, Any]:
+        """
+        Rezervasyonu siler, silme logunu yazar ve odayı boşaltır (tek transaction).
 
+        Args:
+            rezervasyon_id: Rezervasyon ID'si
+            sebep: Silinme sebebi (silinen_rezervasyon_log)
 
+        Returns:
+            dict: Silinen rezervasyonun bilgileri
 
+        Raises:
+            RezervasyonError: Rezervasyon yoksa (404)
+        """
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                oda_id = RezervasyonService._rezervasyon_odasi(cursor, rezervasyon_id)
+                RezervasyonService._oda_kilitle(cursor, oda_id)
+                current = RezervasyonService._rezervasyon_kilitle(cursor, rezervasyon_id, oda_id)
 
+                cursor.execute("""
+                    INSERT INTO silinen_rezervasyon_log (rezervasyon_id, musteri_id, silinme_tarihi, sebep)
+                    VALUES (%s, %s, NOW(), %s)
+                """, (rezervasyon_id, current['musteri_id'], sebep))
+                cursor.execute("DELETE FROM rezervasyonlar WHERE rezervasyon_id = %s", (rezervasyon_id,))
+                cursor.execute("UPDATE odalar SET durum = %s WHERE oda_id = %s", (Oda.DURUM_BOS, oda_id))
+                FolyoService.yenile(rezervasyon_id, cursor)
 
+                musaitlik_indeksi.commit_sonrasi_sil(rezervasyon_id)
+                invalidate_tables('rezervasyonlar', 'odalar')
 
+        return current
@@ -0,0 +1,145 @@
+"""
+Rezervasyon sorgu servisi - filtreli ve sıralı rezervasyon listeleri
+
+GET /api/reservations ve GET /api/customers/<id>/reservations için
+filtreleri WHERE koşuluna çevirir ve sonucu keyset sayfalama ile getirir.
+Filtreler create_rezervasyon_indexes.py'deki indekslerle karşılanır:
+
+    musteri_id          -> idx_rez_musteri_olusturulma
+    oda_id, durum       -> idx_rez_oda_durum_tarih
+    tarih penceresi     -> idx_rez_giris_tarihi
+
+İstek parametreleri (hepsi opsiyonel):
+    giris_tarihi, cikis_tarihi: YYYY-MM-DD; [giris_tarihi, cikis_tarihi)
+        penceresiyle çakışan rezervasyonlar (tek başına verilirse açık uçlu)
+    oda_id, musteri_id: Tam sayı
+    rezervasyon_durumu: Durum veya virgülle ayrılmış durumlar ('aktif,bekliyor')
+    sort: olusturulma_tarihi (varsayılan), giris_tarihi, cikis_tarihi, toplam_ucret
+    order: desc (varsayılan) veya asc
+"""
+
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+from werkzeug.datastructures import MultiDict
+
+from pagination import keyset_page, Page
+
+SELECT_QUERY = """
+    SELECT rezervasyon_id, musteri_id, oda_id, giris_tarihi, cikis_tarihi,
+           yetiskin_sayisi, cocuk_sayisi, toplam_ucret, rezervasyon_durumu,
+           olusturulma_tarihi
+    FROM rezervasyonlar
+"""
+
+# sort parametresinin alabileceği değerler (sütun adlarıyla aynı)
+SIRALAMA_SUTUNLARI = ('olusturulma_tarihi', 'giris_tarihi', 'cikis_tarihi', 'toplam_ucret')
+
+
+class RezervasyonFiltreError(ValueError):
+    """Geçersiz filtre veya sıralama parametresi"""
+
+
+def _tarih(args: MultiDict, name: str) -> Optional[date]:
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise RezervasyonFiltreError(f'{name} formati YYYY-MM-DD olmalidir')
+
+
+def _tam_sayi(args: MultiDict, name: str) -> Optional[int]:
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise RezervasyonFiltreError(f'{name} bir tam sayi olmalidir')
+
+
+class RezervasyonSorguService:
+    """Filtreli rezervasyon listeleme"""
+
+    @staticmethod
+    def filtre(args: MultiDict, musteri_id: Optional[int] = None) -> Tuple[Optional[str], Tuple[Any, ...]]:
+        """
+        İstek parametrelerinden WHERE koşulu ve parametrelerini üretir.
+
+        Args:
+            args: İstek parametreleri (request.args)
+            musteri_id: Verilirse args'taki musteri_id yerine kullanılır
+
+        Returns:
+            Tuple[Optional[str], Tuple]: (WHERE koşulu veya None, parametreler)
+
+        Raises:
+            RezervasyonFiltreError: Geçersiz parametre
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+
+        if musteri_id is None:
+            musteri_id = _tam_sayi(args, 'musteri_id')
+        if musteri_id is not None:
+            conditions.append("musteri_id = %s")
+            params.append(musteri_id)
+
+        oda_id = _tam_sayi(args, 'oda_id')
+        if oda_id is not None:
+            conditions.append("oda_id = %s")
+            params.append(oda_id)
+
+        durumlar = [d.strip() for value in args.getlist('rezervasyon_durumu')
+                    for d in value.split(',') if d.strip()]
+        if durumlar:
+            conditions.append(f"rezervasyon_durumu IN ({', '.join(['%s'] * len(durumlar))})")
+            params.extend(durumlar)
+
+        baslangic = _tarih(args, 'giris_tarihi')
+        bitis = _tarih(args, 'cikis_tarihi')
+        if baslangic and bitis and bitis <= baslangic:
+            raise RezervasyonFiltreError('Cikis tarihi giris tarihinden buyuk olmalidir')
+        # [baslangic, bitis) penceresiyle çakışma
+        if bitis:
+            conditions.append("giris_tarihi < %s")
+            params.append(bitis)
+        if baslangic:
+            conditions.append("cikis_tarihi > %s")
+            params.append(baslangic)
+
+        return (" AND ".join(conditions) or None), tuple(params)
+
+    @staticmethod
+    def siralama(args: MultiDict) -> Tuple[str, bool]:
+        """sort/order parametrelerinden (sütun, azalan_mi) döndürür"""
+        sort = args.get('sort') or 'olusturulma_tarihi'
+        if sort not in SIRALAMA_SUTUNLARI:
+            raise RezervasyonFiltreError(f"sort su degerlerden biri olmalidir: {', '.join(SIRALAMA_SUTUNLARI)}")
+        order = (args.get('order') or 'desc').lower()
+        if order not in ('asc', 'desc'):
+            raise RezervasyonFiltreError("order 'asc' veya 'desc' olmalidir")
+        return sort, order == 'desc'
+
+    @staticmethod
+    def sayfa(args: MultiDict, musteri_id: Optional[int] = None) -> Page:
+        """
+        Filtreli rezervasyon listesinin bir sayfasını getirir (limit/after/include_total
+        parametreleri pagination.keyset_page tarafından okunur).
+
+        Raises:
+            RezervasyonFiltreError: Geçersiz filtre/sıralama
+            PaginationError: Geçersiz limit/after
+        """
+        where, params = RezervasyonSorguService.filtre(args, musteri_id)
+        order_column, descending = RezervasyonSorguService.siralama(args)
+        count_query = "SELECT COUNT(*) as cnt FROM rezervasyonlar"
+        if where:
+            count_query += " WHERE " + where
+        return keyset_page(
+            SELECT_QUERY,
+            order_column=order_column, id_column='rezervasyon_id', descending=descending,
+            where=where, params=params, count_query=count_query
+        )
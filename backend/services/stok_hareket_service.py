@@ -0,0 +1,267 @@
+"""
+Stok hareket servisi - stok hareket defteri ve haftalık anlık görüntüler
+
+depo_stok yalnızca güncel stok_adedi'ni tutar. Stoğu değiştiren her işlem
+(oluşturma, artırma, azaltma, düzeltme, silme) stok_hareketleri tablosuna
+aynı transaction içinde işaretli miktarla bir satır ekler; tablo yalnızca
+eklemeyle büyür. Bir istekteki hareketler tek execute_many ile (çok satırlı
+INSERT) yazılır.
+
+scripts/snapshot_stock.py her pazartesi 00:00 sınırı için her ürünün o
+andaki stoğunu ve biten haftanın tüketimini stok_anlik_goruntuleri tablosuna
+yazar. Böylece:
+
+    X tarihindeki stok = X'ten önceki en yakın görüntü + aradaki hareketler
+                         (en fazla bir haftalık hareket taranır)
+    haftalık tüketim   = kapanmış haftalar görüntü satırlarından, açık hafta
+                         son görüntüden bu yana olan hareketlerden
+
+Tüm geçmiş hiçbir sorguda baştan taranmaz.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pymysql
+from database import execute_query, execute_many, get_db_connection
+
+# MySQL "Table doesn't exist" hata kodu
+ER_NO_SUCH_TABLE = 1146
+
+# Hareket türleri
+HAREKET_ILK = 'ilk'            # Ürün oluşturulurken verilen stok
+HAREKET_GIRIS = 'giris'        # Stok artırma
+HAREKET_CIKIS = 'cikis'        # Stok azaltma (tüketim)
+HAREKET_DUZELTME = 'duzeltme'  # Stok adedinin elle değiştirilmesi
+HAREKET_SILME = 'silme'        # Ürün silinirken kalan stok
+
+# Görüntü sınırının kapanmış sayılması için geçmesi gereken süre
+# (sınırdan önce başlamış transaction'ların commit edilmesi için)
+KAPANIS_PAYI = timedelta(minutes=5)
+
+# Haftalık tüketim sorgusunda izin verilen en uzun aralık
+MAX_TUKETIM_GUN = 366
+
+CREATE_TABLE_QUERIES = (
+    """
+    CREATE TABLE IF NOT EXISTS stok_hareketleri (
+        hareket_id BIGINT NOT NULL AUTO_INCREMENT,
+        urun_id INT NOT NULL,
+        miktar INT NOT NULL,
+        hareket_turu VARCHAR(20) NOT NULL,
+        tarih DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+        PRIMARY KEY (hareket_id),
+        KEY idx_hareket_tarih (tarih),
+        KEY idx_hareket_urun_tarih (urun_id, tarih)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS stok_anlik_goruntuleri (
+        tarih DATETIME(6) NOT NULL,
+        urun_id INT NOT NULL,
+        stok_adedi INT NOT NULL,
+        tuketim INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (tarih, urun_id),
+        KEY idx_goruntu_urun_tarih (urun_id, tarih)
+    )
+    """,
+)
+
+
+def hafta_basi(value: date) -> datetime:
+    """Tarihin (date veya datetime) içinde bulunduğu haftanın pazartesi 00:00'ı"""
+    gun = value.date() if isinstance(value, datetime) else value
+    return datetime.combine(gun - timedelta(days=gun.weekday()), datetime.min.time())
+
+
+class StokHareketService:
+    """Stok hareket defteri işlemleri"""
+
+    _tablo_yok_uyarildi = False
+
+    @staticmethod
+    def kaydet(hareketler: List[Tuple[int, int, str]]):
+        """
+        Hareketleri deftere ekler. Stok yazan sorgulardan sonra, aynı
+        transaction içinde çağrılır; miktarı 0 olan hareketler atlanır.
+
+        Args:
+            hareketler: [(urun_id, işaretli miktar, hareket_turu), ...]
+        """
+        satirlar = [(urun_id, miktar, tur) for urun_id, miktar, tur in hareketler if miktar]
+        if not satirlar:
+            return
+        try:
+            # VALUES yalnızca yer tutucu içerdiği için PyMySQL tek çok satırlı INSERT gönderir
+            # (tarih sütun varsayılanından gelir)
+            execute_many(
+                "INSERT INTO stok_hareketleri (urun_id, miktar, hareket_turu) VALUES (%s, %s, %s)",
+                satirlar
+            )
+        except pymysql.err.ProgrammingError as e:
+            # Tablo henüz oluşturulmadıysa stok işlemini engelleme
+            if e.args and e.args[0] == ER_NO_SUCH_TABLE:
+                if not StokHareketService._tablo_yok_uyarildi:
+                    StokHareketService._tablo_yok_uyarildi = True
+                    logging.warning("stok_hareketleri tablosu yok; "
+                                    "scripts/snapshot_stock.py çalıştırılmalı")
+                return
+            raise
+
+    @staticmethod
+    def tarihteki_stok(gun: date, urun_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Gün sonundaki stok adetleri.
+
+        Args:
+            gun: Stoğun istendiği gün (o günün sonu)
+            urun_id: Verilirse yalnızca bu ürün
+
+        Returns:
+            dict veya None: {'anlik_goruntu_tarihi', 'stoklar': [{urun_id, urun_adi, stok_adedi}]};
+                gün defter başlangıcından önceyse None
+        """
+        bitis = datetime.combine(gun + timedelta(days=1), datetime.min.time())
+        rows = execute_query(
+            "SELECT MAX(tarih) as tarih FROM stok_anlik_goruntuleri WHERE tarih <= %s",
+            params=(bitis,), fetch=True
+        )
+        goruntu = rows[0]['tarih'] if rows else None
+        if goruntu is None:
+            return None
+
+        urun_kosulu = " AND urun_id = %s" if urun_id is not None else ""
+        urun_params = (urun_id,) if urun_id is not None else ()
+        stoklar = execute_query(f"""
+            SELECT x.urun_id, d.urun_adi, CAST(SUM(x.miktar) AS SIGNED) as stok_adedi
+            FROM (
+                SELECT urun_id, stok_adedi as miktar
+                FROM stok_anlik_goruntuleri
+                WHERE tarih = %s{urun_kosulu}
+                UNION ALL
+                SELECT urun_id, miktar
+                FROM stok_hareketleri
+                WHERE tarih >= %s AND tarih < %s{urun_kosulu}
+            ) x
+            LEFT JOIN depo_stok d ON d.urun_id = x.urun_id
+            GROUP BY x.urun_id, d.urun_adi
+            ORDER BY x.urun_id
+        """, params=(goruntu, *urun_params, goruntu, bitis, *urun_params), fetch=True) or []
+
+        return {'anlik_goruntu_tarihi': goruntu, 'stoklar': stoklar}
+
+    @staticmethod
+    def haftalik_tuketim(baslangic: date, bitis: date,
+                         urun_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Ürün başına haftalık tüketim (stok azaltma hareketlerinin toplamı).
+
+        Args:
+            baslangic: Aralığın ilk günü (haftasının pazartesisine yuvarlanır)
+            bitis: Aralığın son günü (dahil)
+            urun_id: Verilirse yalnızca bu ürün
+
+        Returns:
+            List[dict]: [{hafta (pazartesi), urun_id, urun_adi, tuketim}], hafta ve
+                ürüne göre sıralı; tüketimi olmayan haftalar dönmez
+        """
+        ilk_hafta = hafta_basi(baslangic)
+        son = hafta_basi(bitis) + timedelta(days=7)
+        urun_kosulu = " AND g.urun_id = %s" if urun_id is not None else ""
+        urun_params = (urun_id,) if urun_id is not None else ()
+
+        rows = execute_query(
+            "SELECT MAX(tarih) as tarih FROM stok_anlik_goruntuleri WHERE tarih <= %s",
+            params=(son,), fetch=True
+        )
+        son_goruntu = rows[0]['tarih'] if rows else None
+
+        sonuc = []
+        acik_baslangic = ilk_hafta
+        if son_goruntu is not None and son_goruntu > ilk_hafta:
+            # Kapanmış haftalar: her pazartesi görüntüsü biten haftanın tüketimini taşır
+            sonuc += execute_query(f"""
+                SELECT DATE(DATE_SUB(g.tarih, INTERVAL 7 DAY)) as hafta, g.urun_id, d.urun_adi,
+                       g.tuketim
+                FROM stok_anlik_goruntuleri g
+                LEFT JOIN depo_stok d ON d.urun_id = g.urun_id
+                WHERE g.tarih > %s AND g.tarih <= %s AND g.tuketim > 0{urun_kosulu}
+            """, params=(ilk_hafta, son_goruntu, *urun_params), fetch=True) or []
+            acik_baslangic = son_goruntu
+
+        if acik_baslangic < son:
+            # Son görüntüden sonraki (açık) hareketler
+            sonuc += execute_query(f"""
+                SELECT DATE(DATE_SUB(g.tarih, INTERVAL WEEKDAY(g.tarih) DAY)) as hafta,
+                       g.urun_id, d.urun_adi, CAST(SUM(-g.miktar) AS SIGNED) as tuketim
+                FROM stok_hareketleri g
+                LEFT JOIN depo_stok d ON d.urun_id = g.urun_id
+                WHERE g.tarih >= %s AND g.tarih < %s AND g.hareket_turu = %s{urun_kosulu}
+                GROUP BY hafta, g.urun_id, d.urun_adi
+            """, params=(acik_baslangic, son, HAREKET_CIKIS, *urun_params), fetch=True) or []
+
+        for row in sonuc:
+            row['tuketim'] = int(row['tuketim'])
+        return sorted(sonuc, key=lambda row: (row['hafta'], row['urun_id']))
+
+    @staticmethod
+    def anlik_goruntu_al() -> int:
+        """
+        Tabloları oluşturur (yoksa) ve kapanmış her pazartesi sınırı için
+        görüntü yazar. Hiç görüntü yoksa önce güncel stoklardan başlangıç
+        görüntüsü alınır. Tekrar çalıştırmak güvenlidir.
+
+        Returns:
+            int: Yazılan görüntü satırı sayısı
+        """
+        for query in CREATE_TABLE_QUERIES:
+            execute_query(query, fetch=False)
+
+        yazilan = 0
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT MAX(tarih) as tarih FROM stok_anlik_goruntuleri")
+                son = cursor.fetchone()['tarih']
+
+                if son is None:
+                    # Başlangıç: stok satırları kilitlenir (yazan transaction'lar
+                    # biter), hareketleri bu andan sonra başlayan görüntü alınır
+                    cursor.execute("SELECT urun_id FROM depo_stok LOCK IN SHARE MODE")
+                    cursor.execute("SELECT NOW(6) as simdi")
+                    son = cursor.fetchone()['simdi']
+                    cursor.execute("""
+                        INSERT INTO stok_anlik_goruntuleri (tarih, urun_id, stok_adedi, tuketim)
+                        SELECT %s, urun_id, stok_adedi, 0 FROM depo_stok
+                    """, (son,))
+                    yazilan += cursor.rowcount
+
+                cursor.execute("SELECT NOW(6) as simdi")
+                kapanis = cursor.fetchone()['simdi'] - KAPANIS_PAYI
+
+                sinir = hafta_basi(son) + timedelta(days=7)
+                while sinir <= kapanis:
+                    # Önceki görüntü + [son, sinir) hareketleri; silinmiş ve stoğu
+                    # sıfırlanmış ürünler taşınmaz
+                    cursor.execute("""
+                        INSERT INTO stok_anlik_goruntuleri (tarih, urun_id, stok_adedi, tuketim)
+                        SELECT %s, x.urun_id, SUM(x.stok), SUM(x.tuketim)
+                        FROM (
+                            SELECT urun_id, stok_adedi as stok, 0 as tuketim
+                            FROM stok_anlik_goruntuleri
+                            WHERE tarih = %s
+                            UNION ALL
+                            SELECT urun_id, miktar,
+                                   CASE WHEN hareket_turu = %s THEN -miktar ELSE 0 END
+                            FROM stok_hareketleri
+                            WHERE tarih >= %s AND tarih < %s
+                        ) x
+                        LEFT JOIN depo_stok d ON d.urun_id = x.urun_id
+                        GROUP BY x.urun_id, d.urun_id
+                        HAVING SUM(x.stok) <> 0 OR SUM(x.tuketim) <> 0 OR d.urun_id IS NOT NULL
+                    """, (sinir, son, HAREKET_CIKIS, son, sinir))
+                    yazilan += cursor.rowcount
+                    son = sinir
+                    sinir += timedelta(days=7)
+
+        return yazilan
@@ -0,0 +1,147 @@
+"""
+Stok servisi - depo_stok miktar düşümleri
+
+Stok düşümü tek bir koşullu UPDATE ile yapılır (WHERE stok_adedi >= miktar);
+kontrol ve düşüm aynı satır kilidi altında gerçekleştiği için eşzamanlı
+mutfak/minibar kullanımında stok eksiye düşmez. Etkilenen satır sayısı 0 ise
+ürün yoktur veya stok yetersizdir.
+
+Toplu düşümde ürün satırları urun_id sırasıyla SELECT ... FOR UPDATE ile
+kilitlenir (deadlock önleme), yeterlilik kontrol edilir ve tüm düşümler tek
+execute_many ile uygulanır. İşlem istek transaction'ı (unit of work) içinde
+çalışır; StokError ile dönen 4xx yanıtta tüm düşümler geri alınır. Düşümler
+stok hareket defterine aynı transaction'da yazılır.
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from database import execute_query, execute_many
+from services.stok_hareket_service import StokHareketService, HAREKET_CIKIS
+
+# Toplu düşümde tek istekteki en fazla kalem sayısı
+MAX_TOPLU_KALEM = 500
+
+SELECT_QUERY = """
+    SELECT urun_id, hizmet_id, urun_adi, stok_adedi, son_guncelleme
+    FROM depo_stok
+"""
+
+_AZALT_QUERY = """
+    UPDATE depo_stok
+    SET stok_adedi = stok_adedi - %s, son_guncelleme = NOW()
+    WHERE urun_id = %s AND stok_adedi >= %s
+"""
+
+
+class StokError(Exception):
+    """Stok işlemi reddedildiğinde fırlatılır (HTTP durum kodu ile)"""
+
+    def __init__(self, message: str, status_code: int = 400, detay: Any = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.detay = detay
+
+
+def _miktar(value: Any) -> int:
+    try:
+        miktar = int(value)
+    except (TypeError, ValueError):
+        raise StokError('miktar bir tam sayi olmalidir')
+    if miktar <= 0:
+        raise StokError('miktar 0\'dan buyuk olmalidir')
+    return miktar
+
+
+class StokService:
+    """Stok düşüm işlemleri"""
+
+    @staticmethod
+    def azalt(urun_id: int, miktar: int) -> Dict[str, Any]:
+        """
+        Ürünün stoğunu tek koşullu UPDATE ile düşürür.
+
+        Returns:
+            dict: Güncellenmiş stok satırı
+
+        Raises:
+            StokError: Ürün yoksa (404), stok yetersizse (400)
+        """
+        miktar = _miktar(miktar)
+        rowcount = execute_query(_AZALT_QUERY, params=(miktar, urun_id, miktar), fetch=False)
+
+        rows = execute_query(SELECT_QUERY + " WHERE urun_id = %s", params=(urun_id,), fetch=True)
+        if not rows:
+            raise StokError('Stok bulunamadi', 404)
+        if not rowcount:
+            raise StokError(f"Yetersiz stok. Mevcut stok: {rows[0]['stok_adedi']}, Istenen: {miktar}")
+        StokHareketService.kaydet([(urun_id, -miktar, HAREKET_CIKIS)])
+        return rows[0]
+
+    @staticmethod
+    def _kalemleri_birlestir(kalemler: Iterable[Dict[str, Any]]) -> List[Tuple[int, int]]:
+        """Kalemleri doğrular; aynı ürünün kalemlerini toplar, urun_id'ye göre sıralar"""
+        toplamlar: Dict[int, int] = {}
+        for kalem in kalemler:
+            if not isinstance(kalem, dict) or not kalem.get('urun_id'):
+                raise StokError('Her kalemde urun_id alani zorunludur')
+            try:
+                urun_id = int(kalem['urun_id'])
+            except (TypeError, ValueError):
+                raise StokError('urun_id bir tam sayi olmalidir')
+            toplamlar[urun_id] = toplamlar.get(urun_id, 0) + _miktar(kalem.get('miktar'))
+        return sorted(toplamlar.items())
+
+    @staticmethod
+    def toplu_azalt(kalemler: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Birden fazla ürünün stoğunu hep-ya-hiç düşürür.
+
+        Args:
+            kalemler: [{'urun_id': int, 'miktar': int}, ...] (aynı ürün birden
+                fazla kez geçebilir, miktarlar toplanır)
+
+        Returns:
+            List[dict]: Güncellenmiş stok satırları (urun_id sırasıyla)
+
+        Raises:
+            StokError: Kalemler geçersizse (400), ürün yoksa (404), herhangi
+                bir üründe stok yetersizse (400; detay: yetersiz kalemler)
+        """
+        if not isinstance(kalemler, list) or not kalemler:
+            raise StokError('kalemler alani zorunludur ve bos olmayan bir liste olmalidir')
+        if len(kalemler) > MAX_TOPLU_KALEM:
+            raise StokError(f'Tek istekte en fazla {MAX_TOPLU_KALEM} kalem gonderilebilir')
+
+        dusumler = StokService._kalemleri_birlestir(kalemler)
+        urun_idler = [urun_id for urun_id, _ in dusumler]
+        yer_tutucular = ', '.join(['%s'] * len(urun_idler))
+
+        # Satırları sıralı kilitle; kilit transaction sonuna kadar tutulur
+        rows = execute_query(
+            "SELECT urun_id, stok_adedi FROM depo_stok"
+            f" WHERE urun_id IN ({yer_tutucular}) ORDER BY urun_id FOR UPDATE",
+            params=tuple(urun_idler), fetch=True
+        )
+        mevcut = {row['urun_id']: row['stok_adedi'] for row in rows}
+
+        eksik = [urun_id for urun_id in urun_idler if urun_id not in mevcut]
+        if eksik:
+            raise StokError('Stok bulunamadi', 404, detay={'urun_idler': eksik})
+
+        yetersiz = [
+            {'urun_id': urun_id, 'mevcut': mevcut[urun_id], 'istenen': miktar}
+            for urun_id, miktar in dusumler if mevcut[urun_id] < miktar
+        ]
+        if yetersiz:
+            raise StokError('Yetersiz stok', 400, detay={'yetersiz': yetersiz})
+
+        # Koşul kilit altında zaten sağlanıyor; rowcount yine de doğrulanır
+        rowcount = execute_many(_AZALT_QUERY, [(miktar, urun_id, miktar) for urun_id, miktar in dusumler])
+        if rowcount != len(dusumler):
+            raise StokError('Stok ayni anda degistirildi, lutfen tekrar deneyin', 409)
+        StokHareketService.kaydet([(urun_id, -miktar, HAREKET_CIKIS) for urun_id, miktar in dusumler])
+
+        return execute_query(
+            SELECT_QUERY + f" WHERE urun_id IN ({yer_tutucular}) ORDER BY urun_id",
+            params=tuple(urun_idler), fetch=True
+        )
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rezervasyon eşzamanlılık testi
+
+Aynı odaya aynı tarihler için yüzlerce paralel rezervasyon isteği gönderir.
+Kilit tabanlı RezervasyonService ile yalnızca bir tanesinin başarılı olması,
+diğerlerinin 'çakışma' / 'oda boş değil' hatası alması beklenir.
+
+NOT: Çalışan bir MySQL veritabanı gerektirir. Test odası, rezervasyonu ve
+folyo satırı test sonunda silinir.
+"""
+
+import sys
+import os
+import random
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Paralel istekler için havuzu büyüt (database import edilmeden önce)
+os.environ.setdefault('DB_POOL_MAX_SIZE', '50')
+os.environ.setdefault('DB_POOL_TIMEOUT', '60')
+
+from database import init_database, execute_query, execute_insert, close_connection
+from services.rezervasyon_service import RezervasyonService, RezervasyonError
+from services.folyo_service import FolyoService
+
+ISTEK_SAYISI = 300
+ISCI_SAYISI = 50
+
+
+def test_parallel_bookings():
+    """Aynı odaya paralel rezervasyonlarda yalnızca bir kayıt oluşmalı"""
+    print("=== Paralel Rezervasyon Testi ===")
+
+    musteri = execute_query("SELECT musteri_id FROM musteriler LIMIT 1", fetch=True)
+    if not musteri:
+        print("❌ Test için en az bir müşteri gerekli")
+        return False
+    musteri_id = musteri[0]['musteri_id']
+
+    oda_no = random.randint(90000, 99999)
+    oda_id = execute_insert(
+        "INSERT INTO odalar (oda_numarasi, oda_tipi, manzara, ucret_gecelik, durum) VALUES (%s, %s, %s, %s, %s)",
+        params=(oda_no, 'Standart', 'Yok', 100.00, 'Boş')
+    )
+    print(f"Test odası oluşturuldu: {oda_no} (oda_id={oda_id})")
+
+    giris = date.today() + timedelta(days=30)
+    cikis = giris + timedelta(days=3)
+
+    def book(_):
+        try:
+            rez = RezervasyonService.create(musteri_id, oda_id, giris, cikis)
+            return ('ok', rez.rezervasyon_id)
+        except RezervasyonError as e:
+            return ('reddedildi', str(e))
+        except Exception as e:
+            return ('hata', str(e))
+
+    try:
+        with ThreadPoolExecutor(max_workers=ISCI_SAYISI) as executor:
+            results = list(executor.map(book, range(ISTEK_SAYISI)))
+
+        basarili = [r for r in results if r[0] == 'ok']
+        reddedilen = [r for r in results if r[0] == 'reddedildi']
+        hatali = [r for r in results if r[0] == 'hata']
+
+        kayit = execute_query(
+            "SELECT COUNT(*) as cnt FROM rezervasyonlar WHERE oda_id = %s",
+            params=(oda_id,), fetch=True
+        )[0]['cnt']
+        durum = execute_query("SELECT durum FROM odalar WHERE oda_id = %s", params=(oda_id,), fetch=True)[0]['durum']
+
+        print(f"İstek: {ISTEK_SAYISI}, başarılı: {len(basarili)}, reddedilen: {len(reddedilen)}, hata: {len(hatali)}")
+        if hatali:
+            print(f"  Örnek hata: {hatali[0][1]}")
+
+        checks = [
+            (len(basarili) == 1, "Yalnızca bir rezervasyon başarılı"),
+            (kayit == 1, f"Veritabanında tek kayıt var ({kayit})"),
+            (len(reddedilen) == ISTEK_SAYISI - 1, "Diğer istekler reddedildi"),
+            (durum == 'Dolu', f"Oda durumu 'Dolu' ({durum})"),
+            (bool(basarili) and basarili[0][1] > 0, "ID cursor.lastrowid ile döndü"),
+        ]
+        for ok, message in checks:
+            print(f"{'✅' if ok else '❌'} {message}")
+        return all(ok for ok, _ in checks)
+    finally:
+        rezervasyonlar = execute_query(
+            "SELECT rezervasyon_id FROM rezervasyonlar WHERE oda_id = %s",
+            params=(oda_id,), fetch=True
+        )
+        execute_query("DELETE FROM rezervasyonlar WHERE oda_id = %s", params=(oda_id,), fetch=False)
+        # create folyo satırı da yazar; rezervasyonu silinmiş satırı yenile kaldırır
+        for row in rezervasyonlar:
+            FolyoService.yenile(row['rezervasyon_id'])
+        execute_query("DELETE FROM odalar WHERE oda_id = %s", params=(oda_id,), fetch=False)
+        print("Test verileri temizlendi")
+
+
+def main():
+    """Testi çalıştır"""
+    init_database()
+    try:
+        success = test_parallel_bookings()
+    finally:
+        close_connection()
+
+    print()
+    print("🎉 TEST BAŞARILI" if success else "❌ TEST BAŞARISIZ")
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,5 @@
-import React, { useState, useEffect } from 'react'
+import React from 'react'
 import { Bed, Eye, DollarSign, Home, Wifi, Coffee, Car } from 'lucide-react'
-import { odaService } from '../services/odaService'
 
 // Manzara bilgisine göre görsel URL'leri (Pixabay'den ücretsiz görseller)
 const getManzaraImage = (manzara) => {
@@ -44,31 +43,15 @@ const getStatusColor = (durum) => {
 }
 
 const RoomCard = ({ room, onClick }) => {
-  const [ozellikler, setOzellikler] = useState([])
-  const [ozelliklerLoading, setOzelliklerLoading] = useState(false)
+  // Özellikler oda listesiyle birlikte tek toplu detay isteğinden gelir (Rooms.jsx);
+  // alan henüz yoksa liste detayları yükleniyordur
+  const ozellikler = room.ozellikler || []
+  const ozelliklerLoading = room.ozellikler === undefined
 
   const statusColor = getStatusColor(room.durum)
   const manzaraStyle = getManzaraStyle(room.manzara)
   const manzaraImage = getManzaraImage(room.manzara)
 
-  useEffect(() => {
-    const loadOzellikler = async () => {
-      if (room.oda_id) {
-        setOzelliklerLoading(true)
-        try {
-          const res = await odaService.getOzellikler(room.oda_id)
-          setOzellikler(res.data.ozellikler || [])
-        } catch (err) {
-          console.error('Oda özellikleri yüklenemedi:', err)
-        } finally {
-          setOzelliklerLoading(false)
-        }
-      }
-    }
-
-    loadOzellikler()
-  }, [room.oda_id])
-
   return (
     <div
       className={`bg-white rounded-lg shadow-md overflow-hidden cursor-pointer transition-all duration-200 hover:shadow-lg hover:scale-105 border-l-4 ${statusColor}`}
@@ -115,14 +115,13 @@ const RoomDetail = ({ roomId, isOpen, onClose, onRoomUpdate, isNewRoom = false }
       setError('')
       setSuccess('')
 
-      const [roomResponse, imagesResponse] = await Promise.all([
-        odaService.getById(roomId).catch(() => ({ data: null })),
-        odaService.getResimler(roomId).catch(() => ({ data: [] }))
-      ])
+      // Oda, özellikler ve resimler tek istekte
+      const detailResponse = await odaService.getDetaylar([roomId]).catch(() => ({ data: [] }))
+      const roomDetail = detailResponse?.data?.[0] || null
 
       // Veri normalizasyonu
-      const normalizedRoom = normalizeRoomData(roomResponse?.data)
-      const normalizedImages = normalizeRoomImages(imagesResponse?.data, normalizedRoom?.manzara)
+      const normalizedRoom = normalizeRoomData(roomDetail)
+      const normalizedImages = normalizeRoomImages(roomDetail?.resimler, normalizedRoom?.manzara)
 
       if (normalizedRoom) {
         setRoom(normalizedRoom)
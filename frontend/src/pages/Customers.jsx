@@ -4,8 +4,13 @@ import { rezervasyonService } from '../services/rezervasyonService'
 import { odaService } from '../services/odaService'
 import CustomerReviews from '../components/CustomerReviews'
 
+// Filtresiz listede sayfa başına gösterilen müşteri sayısı
+const MUSTERI_SAYFA_BOYUTU = 100
+
 function Customers() {
   const [customers, setCustomers] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [filteredCustomers, setFilteredCustomers] = useState([])
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
@@ -51,10 +56,12 @@ function Customers() {
     setLoading(true)
     setError('')
     try {
-      const res = await musteriService.getAll()
+      // Filtresiz görünüm yalnızca ilk sayfayı yükler; gerisi arama veya "Daha fazla" ile
+      const res = await musteriService.getPage({ limit: MUSTERI_SAYFA_BOYUTU })
       const customerList = res.data || []
       setCustomers(customerList)
       setFilteredCustomers(customerList)
+      setNextCursor(res.headers['x-next-cursor'] || null)
     } catch (err) {
       setError(err.response?.data?.error || 'Müşteriler yüklenemedi')
     } finally {
@@ -62,6 +69,22 @@ function Customers() {
     }
   }
 
+  const fetchMoreCustomers = async () => {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    try {
+      const res = await musteriService.getPage({ limit: MUSTERI_SAYFA_BOYUTU, after: nextCursor })
+      setCustomers(prev => [...prev, ...(res.data || [])])
+      setNextCursor(res.headers['x-next-cursor'] || null)
+    } catch (err) {
+      setError(err.response?.data?.error || 'Müşteriler yüklenemedi')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  const aramaVar = Object.values(searchFilters).some(v => v.trim())
+
   const fetchRoomData = async () => {
     try {
       const [roomsRes, optionsRes] = await Promise.all([
@@ -80,21 +103,26 @@ function Customers() {
     fetchRoomData()
   }, [])
 
-  // Arama filtreleme
+  // Arama filtreleme (sunucu tarafında, yazım bitene kadar bekleyerek)
   useEffect(() => {
-    const filtered = customers.filter(customer => {
-      const tcMatch = !searchFilters.tc_kimlik_no ||
-        customer.tc_kimlik_no?.toLowerCase().includes(searchFilters.tc_kimlik_no.toLowerCase())
-
-      const nameMatch = !searchFilters.ad_soyad ||
-        `${customer.ad} ${customer.soyad}`.toLowerCase().includes(searchFilters.ad_soyad.toLowerCase())
-
-      const phoneMatch = !searchFilters.telefon ||
-        customer.telefon?.includes(searchFilters.telefon)
-
-      return tcMatch && nameMatch && phoneMatch
-    })
-    setFilteredCustomers(filtered)
+    const q = Object.values(searchFilters).map(v => v.trim()).filter(Boolean).join(' ')
+    if (!q) {
+      setFilteredCustomers(customers)
+      return
+    }
+    let cancelled = false
+    const timer = setTimeout(async () => {
+      try {
+        const res = await musteriService.search(q)
+        if (!cancelled) setFilteredCustomers(res.data || [])
+      } catch (err) {
+        if (!cancelled) setError(err.response?.data?.error || 'Müşteri araması başarısız')
+      }
+    }, 250)
+    return () => {
+      cancelled = true
+      clearTimeout(timer)
+    }
   }, [customers, searchFilters])
 
   const handleSubmit = async (e) => {
@@ -154,10 +182,9 @@ function Customers() {
 
     // Müşterinin rezervasyon geçmişini yükle
     try {
-      // Tüm rezervasyonları al ve bu müşteriye ait olanları filtrele
-      const res = await rezervasyonService.getAll()
-      const customerReservations = res.data.filter(r => r.musteri_id === customer.musteri_id) || []
-      setCustomerReservations(customerReservations)
+      // Sadece bu müşterinin rezervasyonları (sunucu tarafında filtrelenir)
+      const res = await musteriService.getReservations(customer.musteri_id)
+      setCustomerReservations(res.data || [])
     } catch (err) {
       console.error('Rezervasyon geçmişi yüklenemedi:', err)
       setCustomerReservations([])
@@ -464,6 +491,18 @@ function Customers() {
             ))}
           </div>
 
+          {!aramaVar && nextCursor && (
+            <div className="flex justify-center mt-6">
+              <button
+                onClick={fetchMoreCustomers}
+                disabled={loadingMore}
+                className="px-4 py-2 bg-gray-500 text-white rounded hover:bg-gray-600 disabled:opacity-50"
+              >
+                {loadingMore ? 'Yükleniyor...' : 'Daha fazla müşteri yükle'}
+              </button>
+            </div>
+          )}
+
           {filteredCustomers.length === 0 && (
             <div className="text-center py-12">
               <div className="text-gray-400 mb-2">
@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react'
-import api from '../services/api'
+import { getAllPages } from '../services/api'
 
 function Payments() {
   const [payments, setPayments] = useState([])
@@ -11,7 +11,7 @@ function Payments() {
     setLoading(true)
     setError('')
     try {
-      const res = await api.get('/payments')
+      const res = await getAllPages('/payments')
       setPayments(res.data || [])
     } catch (err) {
       setError(err.response?.data?.error || 'Ödemeler alınamadı')
@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react'
-import api from '../services/api'
+import api, { getAllPages } from '../services/api'
 
 function ReservationCreate() {
   const [rooms, setRooms] = useState([])
@@ -21,7 +21,7 @@ function ReservationCreate() {
     try {
       const [roomsRes, customersRes] = await Promise.all([
         api.get('/rooms/available'),
-        api.get('/customers'),
+        getAllPages('/customers'),
       ])
       setRooms(roomsRes.data || [])
       setCustomers(customersRes.data || [])
@@ -21,6 +21,34 @@ const getRoomImage = (manzara) => {
   return viewImages[manzara] || viewImages['Yok']
 }
 
+// Toplu detay endpoint'inin tek istekte kabul ettiği en fazla oda sayısı (ODA_DETAY_MAX_IDS)
+const DETAY_PARCA_BOYUTU = 200
+
+// Grid odalarına özelliklerini ekler: özelliği bilinmeyen odalar için
+// kart başına istek yerine toplu detay endpoint'i çağrılır
+const ozellikleriEkle = async (roomList, bilinenOdalar = []) => {
+  const ozellikMap = {}
+  bilinenOdalar.forEach(room => {
+    if (Array.isArray(room.ozellikler)) ozellikMap[room.oda_id] = room.ozellikler
+  })
+
+  const eksikIdler = roomList.map(room => room.oda_id).filter(id => !(id in ozellikMap))
+  const parcalar = []
+  for (let i = 0; i < eksikIdler.length; i += DETAY_PARCA_BOYUTU) {
+    parcalar.push(eksikIdler.slice(i, i + DETAY_PARCA_BOYUTU))
+  }
+  try {
+    const yanitlar = await Promise.all(parcalar.map(ids => odaService.getDetaylar(ids)))
+    yanitlar.forEach(res => {
+      (res.data || []).forEach(detay => { ozellikMap[detay.oda_id] = detay.ozellikler || [] })
+    })
+  } catch (err) {
+    console.error('Oda özellikleri yüklenemedi:', err)
+  }
+
+  return roomList.map(room => ({ ...room, ozellikler: ozellikMap[room.oda_id] || [] }))
+}
+
 function Rooms() {
   const [rooms, setRooms] = useState([])
   const [filteredRooms, setFilteredRooms] = useState([])
@@ -72,7 +100,7 @@ function Rooms() {
     try {
       // Tüm odaları backend'den getir (filtre için fiyat aralığı hesaplamak için)
       const res = await odaService.getAll()
-      const roomList = res.data || []
+      const roomList = await ozellikleriEkle(res.data || [])
       setRooms(roomList)
 
       // Fiyat aralığını hesapla
@@ -106,7 +134,8 @@ function Rooms() {
       }
 
       const res = await odaService.getFiltered(filters)
-      const filteredRoomList = res.data || []
+      // Tüm oda listesiyle yüklenmiş özellikler yeniden istenmez
+      const filteredRoomList = await ozellikleriEkle(res.data || [], rooms)
       setFilteredRooms(filteredRoomList)
     } catch (err) {
       setError(err.response?.data?.error || 'Filtreleme sırasında hata oluştu')
@@ -170,12 +199,10 @@ function Rooms() {
 
     // Oda özelliklerini ve resimlerini yükle
     try {
-      const [ozellikRes, resimRes] = await Promise.all([
-        odaService.getOzellikler(room.oda_id),
-        odaService.getResimler(room.oda_id)
-      ])
-      setRoomFeatures(ozellikRes.data.ozellikler || [])
-      setRoomImages(resimRes.data || [])
+      const res = await odaService.getDetaylar([room.oda_id])
+      const detay = res.data?.[0]
+      setRoomFeatures(detay?.ozellikler || [])
+      setRoomImages(detay?.resimler || [])
     } catch (err) {
       console.error('Oda detayları yüklenemedi:', err)
       setRoomFeatures([])
@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react'
 import { useAuth } from '../contexts/AuthContext'
-import api from '../services/api'
+import api, { getAllPages } from '../services/api'
 
 function Services() {
   const { hasRole } = useAuth()
@@ -18,7 +18,7 @@ function Services() {
     setLoading(true)
     setError('')
     try {
-      const res = await api.get('/services')
+      const res = await getAllPages('/services')
       setServices(res.data || [])
     } catch (err) {
       setError(err.response?.data?.error || 'Hizmetler alınamadı')
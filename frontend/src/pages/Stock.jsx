@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react'
 import { useAuth } from '../contexts/AuthContext'
-import api from '../services/api'
+import api, { getAllPages } from '../services/api'
 
 function Stock() {
   const { role, hasRole } = useAuth()
@@ -18,7 +18,7 @@ function Stock() {
     setLoading(true)
     setError('')
     try {
-      const res = await api.get('/stock')
+      const res = await getAllPages('/stock')
       setItems(res.data || [])
     } catch (err) {
       setError(err.response?.data?.error || 'Stok verisi alınamadı')
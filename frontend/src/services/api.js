@@ -40,6 +40,22 @@ api.interceptors.response.use(
   }
 )
 
+// Sayfalı liste endpoint'lerinin tüm sayfalarını X-Next-Cursor ile toplar
+export const getAllPages = async (url, config = {}) => {
+  const items = []
+  let after = null
+  let response
+  do {
+    response = await api.get(url, {
+      ...config,
+      params: { ...(config.params || {}), limit: 500, ...(after ? { after } : {}) },
+    })
+    items.push(...response.data)
+    after = response.headers['x-next-cursor']
+  } while (after)
+  return { ...response, data: items }
+}
+
 // Dashboard API servisleri
 export const dashboardService = {
   // Dashboard istatistiklerini getir
@@ -81,7 +97,7 @@ export const roomService = {
   // Tüm odaları getir
   getRooms: async () => {
     try {
-      const response = await api.get('/rooms')
+      const response = await getAllPages('/rooms')
       return response.data
     } catch (error) {
       console.error('Odalar alınırken hata:', error)
@@ -117,7 +133,7 @@ export const customerService = {
   // Tüm müşterileri getir
   getCustomers: async () => {
     try {
-      const response = await api.get('/customers')
+      const response = await getAllPages('/customers')
       return response.data
     } catch (error) {
       console.error('Müşteriler alınırken hata:', error)
@@ -142,7 +158,7 @@ export const reservationService = {
   // Tüm rezervasyonları getir
   getReservations: async () => {
     try {
-      const response = await api.get('/reservations')
+      const response = await getAllPages('/reservations')
       return response.data
     } catch (error) {
       console.error('Rezervasyonlar alınırken hata:', error)
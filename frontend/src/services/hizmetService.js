@@ -1,7 +1,7 @@
-import api from './api'
+import api, { getAllPages } from './api'
 
 export const hizmetService = {
-  getAll: () => api.get('/hizmet/'),
+  getAll: () => getAllPages('/hizmet/'),
   getById: (id) => api.get(`/hizmet/${id}`),
   create: (data) => api.post('/hizmet/', data),
   update: (id, data) => api.put(`/hizmet/${id}`, data),
@@ -1,12 +1,18 @@
-import api from './api'
+import api, { getAllPages } from './api'
 
 export const musteriService = {
-  getAll: () => api.get('/customers/'),
+  getAll: () => getAllPages('/customers/'),
+  // Tek sayfa (limit/after); sonraki sayfanın imleci X-Next-Cursor başlığında
+  getPage: (params = {}) => api.get('/customers/', { params }),
   getById: (id) => api.get(`/customers/${id}/`),
+  // Sunucu tarafında indeksli arama (ad, soyad, telefon, email, TC)
+  search: (q, limit = 100) => api.get('/customers/search', { params: { q, limit } }),
   create: (data) => api.post('/customers/', data),
   update: (id, data) => api.put(`/customers/${id}/`, data),
   delete: (id) => api.delete(`/customers/${id}/`),
   getExpenses: (id) => api.get(`/customers/${id}/harcamalar/`),
+  // Müşterinin rezervasyonları (sunucu tarafında filtreli, sayfalı)
+  getReservations: (id, params = {}) => getAllPages(`/customers/${id}/reservations/`, { params }),
   getReviews: (id) => api.get(`/customers/${id}/degerlendirme/`),
   createReview: (reservationId, data) => api.post(`/reservations/${reservationId}/degerlendirme/`, data),
 }
@@ -139,6 +139,17 @@ export const odaService = {
       console.error('Oda resimleri alınırken hata:', error)
       throw error
     }
+  },
+
+  // Birden fazla odayı özellik ve resimleriyle tek istekte getir
+  getDetaylar: async (odaIds) => {
+    try {
+      const response = await api.get('/odalar/detaylar', { params: { ids: odaIds.join(',') } })
+      return response
+    } catch (error) {
+      console.error('Oda detayları alınırken hata:', error)
+      throw error
+    }
   }
 }
 
@@ -1,7 +1,7 @@
-import api from './api'
+import api, { getAllPages } from './api'
 
 export const odemeService = {
-  getAll: () => api.get('/odeme/'),
+  getAll: () => getAllPages('/odeme/'),
   getById: (id) => api.get(`/odeme/${id}`),
   getByReservation: (reservationId) => api.get(`/payments/reservation/${reservationId}`),
   create: (data) => api.post('/odeme/', data),
@@ -1,7 +1,7 @@
-import api from './api'
+import api, { getAllPages } from './api'
 
 export const personelService = {
-  getAll: () => api.get('/personel/'),
+  getAll: () => getAllPages('/personel/'),
   getById: (id) => api.get(`/personel/${id}/`),
   create: (data) => api.post('/personel/', data),
   update: (id, data) => api.put(`/personel/${id}/`, data),
@@ -1,7 +1,8 @@
-import api from './api'
+import api, { getAllPages } from './api'
 
 export const rezervasyonService = {
-  getAll: () => api.get('/reservations/'),
+  // params: giris_tarihi, cikis_tarihi, oda_id, musteri_id, rezervasyon_durumu, sort, order
+  getAll: (params = {}) => getAllPages('/reservations/', { params }),
   getOptions: () => api.get('/reservations/options'),
   getById: (id) => api.get(`/reservations/${id}/`),
   create: (data) => api.post('/reservations/', data),
@@ -12,6 +13,11 @@ export const rezervasyonService = {
     api.get('/reservations/check-availability', {
       params: { oda_id: odaId, giris_tarihi: girisTarihi, cikis_tarihi: cikisTarihi, exclude_id: excludeId }
     }),
+  // Tarih aralığında boş odalar (oda_tipi, minFiyat, maxFiyat, manzara filtreleri)
+  getAvailableRooms: (girisTarihi, cikisTarihi, filters = {}) =>
+    api.get('/reservations/available-rooms', {
+      params: { giris_tarihi: girisTarihi, cikis_tarihi: cikisTarihi, ...filters }
+    }),
   // Değerlendirme işlemleri
   getDegerlendirme: (id) => api.get(`/reservations/${id}/degerlendirme`),
   createDegerlendirme: (id, data) => api.post(`/reservations/${id}/degerlendirme`, data),
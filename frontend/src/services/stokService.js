@@ -1,7 +1,7 @@
-import api from './api'
+import api, { getAllPages } from './api'
 
 export const stokService = {
-  getAll: () => api.get('/stock/'),
+  getAll: () => getAllPages('/stock/'),
   getById: (id) => api.get(`/stock/${id}/`),
   create: (data) => api.post('/stock/', data),
   update: (id, data) => api.put(`/stock/${id}/`, data),